@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
-import requests
-from bs4 import BeautifulSoup
-from flask import Flask, render_template_string
+import os
 import threading
 import webbrowser
 import random
+from manierism.search import SearchClient, CACHE_NAME
+from manierism.preview import PagePreview, create_preview_app, run_preview_app
 
 # ---------------- MB Tracking ----------------
 MB_TOTAL = 400_000_000.0
@@ -13,33 +13,16 @@ MB_USED_TOTAL = 0.0
 def bytes_to_mb(byte_count):
     return byte_count / (1024 * 1024)
 
-# ---------------- Flask Web Display ----------------
-app = Flask(__name__)
-current_url = None
-
-@app.route('/')
-def render_page():
-    global current_url
-    if current_url:
-        try:
-            r = requests.get(current_url)
-            content = r.text
-        except Exception as e:
-            content = f"<p>Could not fetch URL: {e}</p>"
-    else:
-        content = "<p>No URL selected. Enter a URL in the terminal search.</p>"
+# Pooled session + on-disk result page cache next to this script
+SEARCH = SearchClient(os.path.join(os.path.dirname(os.path.abspath(__file__)), CACHE_NAME))
 
-    template = """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head><meta charset="UTF-8"><title>Local Page Preview</title></head>
-    <body>{{ content|safe }}</body>
-    </html>
-    """
-    return render_template_string(template, content=content)
+# ---------------- Flask Web Display ----------------
+# Caching, streaming preview of the URL last entered (threaded, several viewers at once)
+PREVIEW = PagePreview(SEARCH)
+app = create_preview_app(PREVIEW)
 
 def start_flask():
-    app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False)
+    run_preview_app(app)
 
 # ---------------- Bing & Mayan Weather ----------------
 def extract_location(query):
@@ -52,21 +35,9 @@ def extract_location(query):
 
 def fetch_bing_results(query, max_results=5):
     global MB_USED_TOTAL
-    url = f"https://www.bing.com/search?q={query.replace(' ', '+')}"
-    response = requests.get(url)
-    MB_USED_TOTAL += bytes_to_mb(len(response.content))
-
-    soup = BeautifulSoup(response.text, 'html.parser')
-    results = []
-    for li in soup.find_all('li', {'class': 'b_algo'})[:max_results]:
-        title_tag = li.find('h2')
-        snippet_tag = li.find('p')
-        link_tag = title_tag.find('a') if title_tag else None
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-            snippet = snippet_tag.get_text(strip=True) if snippet_tag else "No snippet available."
-            link = link_tag['href'] if link_tag else "No link"
-            results.append({'title': title, 'snippet': snippet, 'link': link})
+    results, page = SEARCH.search(query, max_results)
+    # Only what this request downloaded; cached pages cost no MB
+    MB_USED_TOTAL += bytes_to_mb(page.bytes_downloaded)
     return results
 
 def mayan_weather_interpretation(location):
@@ -76,7 +47,7 @@ def mayan_weather_interpretation(location):
 
 # ---------------- Terminal ----------------
 def run_internet_terminal():
-    global current_url, MB_USED_TOTAL
+    global MB_USED_TOTAL
     flask_thread_started = False
 
     print("🍫 Willy Wonka Internet Terminal 🍫")
@@ -89,7 +60,7 @@ def run_internet_terminal():
 
         # URL case
         if query.startswith("http://") or query.startswith("https://"):
-            current_url = query
+            PREVIEW.current_url = query
             if not flask_thread_started:
                 threading.Thread(target=start_flask, daemon=True).start()
                 flask_thread_started = True
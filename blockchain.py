@@ -12,6 +12,7 @@ import time
 import uuid
 import random
 import math
+from manierism.formatting import make_large_number_formatter
 from decimal import Decimal, getcontext
 
 # High precision for MB, π, overlay math, and hashpower
@@ -132,26 +133,9 @@ def select_wallet():
         print("❌ Invalid selection.")
         return None
 
-def format_large_number(n):
-    n_float = float(n)
-    if n_float < 1e12:
-        return f"{n:,.6f}"
-    powers = {
-        1e12: "Trillion", 1e15: "Quadrillion", 1e18: "Quintillion",
-        1e21: "Sextillion", 1e24: "Septillion", 1e27: "Octillion",
-        1e30: "Nonillion", 1e33: "Decillion", 1e36: "Undecillion",
-        1e39: "Duodecillion", 1e42: "Tredecillion"
-    }
-    scale = 1
-    unit = ""
-    for p, u in sorted(powers.items()):
-        if n_float >= p:
-            scale = p
-            unit = u
-        else:
-            break
-    scaled_n = n / Decimal(scale)
-    return f"{scaled_n:,.3f} {unit}"
+# Named scales up to Tredecillion (10^42), scientific notation beyond
+format_large_number = make_large_number_formatter(42)
+
 
 def patch_fallback_keys(wallet):
     keys = wallet.get_fallback_keys()
@@ -0,0 +1,5 @@
+"""
+Manierism Megabytes shared rig modules
+- Imported by the rig scripts that sit next to this folder (run.py, vodka.py, uv.py, ...)
+- Standard library only unless a module says otherwise
+"""
@@ -0,0 +1,179 @@
+"""
+Incremental device cache scanner
+- Keeps an index of every directory under the root: [mtime_ns, file bytes, file count, subdirs]
+- A refresh stats each directory once and only re-lists the ones whose mtime changed
+  (a file added, removed or renamed); unchanged directories reuse their cached byte count
+- Directory listings use os.scandir and sizes are summed as ints
+- A file growing in place does not touch its directory's mtime, so every
+  `full_rescan_interval` seconds the refresh re-lists everything
+- The index is saved as JSON, so a restarted rig shows the last known size straight away
+- A background thread refreshes when asked to (request_refresh); on its own, every
+  `refresh_interval` seconds, only while `idle()` says the rig has nothing else to do, so a
+  mining session does not keep stat-ing the SD card
+
+Usage: python -m manierism.device_cache /storage/emulated/0/ [index.json]
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from decimal import Decimal
+
+MB = 1024 * 1024
+
+
+class DeviceCacheScanner:
+    def __init__(self, root, index_path=None, refresh_interval=60.0, full_rescan_interval=3600.0, idle=None):
+        """idle: () -> bool gating the periodic refreshes (None: always refresh)."""
+        self.root = root
+        self.idle = idle
+        self.index_path = index_path
+        self.refresh_interval = refresh_interval
+        self.full_rescan_interval = full_rescan_interval
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._index = {}
+        self._last_full = float("-inf")
+        self.total_bytes = 0
+        self.total_files = 0
+        self.ready = False
+        self.last_rescanned = []
+        self.last_refresh_seconds = None
+        self._load_index()
+
+    # --- Index ---
+
+    def _load_index(self):
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("root") != self.root:
+            return
+        self._index = data.get("dirs", {})
+        self._last_full = time.monotonic() - (time.time() - data.get("last_full", 0))
+        self.total_bytes = sum(entry[1] for entry in self._index.values())
+        self.total_files = sum(entry[2] for entry in self._index.values())
+        self.ready = True
+
+    def _save_index(self):
+        if not self.index_path:
+            return
+        data = {
+            "root": self.root,
+            "last_full": time.time() - (time.monotonic() - self._last_full),
+            "dirs": self._index
+        }
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠️ Could not save device cache index: {e}")
+
+    # --- Scanning ---
+
+    @staticmethod
+    def _scan_dir(path, mtime_ns):
+        size, files, subdirs = 0, 0, []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file():
+                            size += entry.stat().st_size
+                            files += 1
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return [mtime_ns, size, files, subdirs]
+
+    def refresh(self, full=None):
+        """One incremental pass over the tree; returns the total size in bytes."""
+        start = time.perf_counter()
+        if full is None:
+            full = time.monotonic() - self._last_full >= self.full_rescan_interval
+        old = self._index
+        index, rescanned = {}, []
+        stack = [self.root]
+        while stack:
+            path = stack.pop()
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            entry = old.get(path)
+            if full or entry is None or entry[0] != mtime_ns:
+                entry = self._scan_dir(path, mtime_ns)
+                rescanned.append(path)
+            index[path] = entry
+            stack.extend(os.path.join(path, name) for name in entry[3])
+
+        total_bytes = sum(entry[1] for entry in index.values())
+        total_files = sum(entry[2] for entry in index.values())
+        with self._lock:
+            changed = rescanned or len(index) != len(old)
+            self._index = index
+            self.total_bytes, self.total_files = total_bytes, total_files
+            self.last_rescanned = rescanned
+            self.ready = True
+            if full:
+                self._last_full = time.monotonic()
+        if changed or full:
+            self._save_index()
+        self.last_refresh_seconds = time.perf_counter() - start
+        return total_bytes
+
+    def total_mb(self):
+        """Last known size in MB, quantized like the original Decimal scan."""
+        return (Decimal(self.total_bytes) / Decimal(MB)).quantize(Decimal("0.000001"))
+
+    # --- Background refresh ---
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="device-cache-scanner", daemon=True)
+            self._thread.start()
+        return self
+
+    def request_refresh(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        requested = True  # start() counts as a request
+        while not self._stop.is_set():
+            if requested or self.idle is None or self.idle():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"⚠️ Device cache scan failed: {e}")
+            requested = self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m manierism.device_cache /path/to/scan [index.json]")
+        sys.exit(1)
+    scanner = DeviceCacheScanner(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    for label, full in [("Full scan", True), ("Incremental", False)]:
+        scanner.refresh(full)
+        print(f"📥 {label}: {scanner.total_files:,} files, {scanner.total_mb()} MB, "
+              f"{len(scanner.last_rescanned):,}/{len(scanner._index):,} directories listed in {scanner.last_refresh_seconds:.3f} seconds")
@@ -0,0 +1,278 @@
+"""
+Background emission log writer
+- log_real_emission only puts the entry on a bounded queue; one writer thread per log file
+  appends the JSON lines, so rigs mining in parallel threads never interleave half-lines
+- Lines are written in batches: a batch goes out once it holds `batch_size` entries or is
+  `flush_interval` seconds old, as one write() on a file that stays open
+- When the queue is full the caller waits for the writer (no emission is dropped)
+- Rotation: capsule_emission_log.json is renamed to capsule_emission_log.YYYY-MM-DD[.N].json
+  once it passes `max_bytes` or the day changes
+- Several rig processes can share one log: each batch is written under capsule_emission_log.lock
+  (flock, or msvcrt.locking on Windows), and a writer whose open file was rotated away by another
+  process reopens the log (inode check) before appending, so nothing lands in a rotated file
+- The file layout (one JSON object per line) is unchanged
+- Sinks (e.g. the SQLite emission store) receive each written batch on the writer thread
+- Self-check (two writers sharing one rotating log): python -m manierism.emission_log --check
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import tempfile
+import threading
+from datetime import date
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows rigs
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+EMISSION_LOG_NAME = "capsule_emission_log.json"
+
+_STOP = object()
+
+
+class EmissionLogWriter:
+    def __init__(self, path, batch_size=256, flush_interval=1.0, max_queue=10000,
+                 max_bytes=16 * 1024 * 1024, rotate_daily=True):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._day = None
+        self._lock_path = os.path.splitext(path)[0] + ".lock"
+        self._lock_file = None
+        self._sinks = []
+        self.written = 0
+        self.batches = 0
+        self.reopened = 0  # times another process had rotated the file this writer had open
+        self._thread = threading.Thread(target=self._run, name="emission-log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, entry):
+        if not self._thread.is_alive():
+            raise RuntimeError("Emission log writer is closed")
+        self._queue.put(entry)
+
+    def add_sink(self, sink):
+        """sink(entries) is called with every batch after it reaches the log file."""
+        self._sinks.append(sink)
+
+    def flush(self, timeout=None):
+        """Blocks until everything queued before this call is on disk; False on timeout or a dead writer."""
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    # --- Writer thread ---
+
+    def _run(self):
+        pending, waiters = [], []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._write_batch(pending)
+                self._release(waiters)
+                if self._file:
+                    self._file.close()
+                if self._lock_file:
+                    self._lock_file.close()
+                return
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None:
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if waiters or len(pending) >= self.batch_size or \
+                    (deadline is not None and time.monotonic() >= deadline):
+                self._write_batch(pending)
+                pending = []
+                deadline = None
+                self._release(waiters)
+
+    def _release(self, waiters):
+        for event in waiters:
+            event.set()
+        waiters.clear()
+
+    def _write_batch(self, entries):
+        if not entries:
+            return
+        try:
+            with self._shared_lock():
+                self._reopen_if_rotated()
+                self._rotate_if_needed()
+                self._file.write("".join(json.dumps(entry) + "\n" for entry in entries))
+                self._file.flush()
+            self.written += len(entries)
+            self.batches += 1
+        except OSError as e:
+            print(f"⚠️ Emission log write failed ({len(entries)} entries lost): {e}")
+            self._file = None
+            return
+        for sink in self._sinks:
+            try:
+                sink(entries)
+            except Exception as e:
+                print(f"⚠️ Emission sink {getattr(sink, '__qualname__', sink)} failed: {e}")
+
+    # --- Shared log ---
+
+    @contextmanager
+    def _shared_lock(self):
+        # Blocking, unlike the wallet store's writer lock: other processes only hold it for one batch
+        if self._lock_file is None:
+            self._lock_file = open(self._lock_path, "a+")
+        if fcntl is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            self._lock_file.seek(0)
+            msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                self._lock_file.seek(0)
+                msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _reopen_if_rotated(self):
+        if self._file is None:
+            return
+        try:
+            rotated = os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            rotated = True
+        if rotated:
+            self._file.close()
+            self._file = None
+            self.reopened += 1
+
+    # --- Rotation ---
+
+    def _open(self):
+        self._file = open(self.path, "a")
+        if self._file.tell():
+            self._day = date.fromtimestamp(os.path.getmtime(self.path))
+        else:
+            self._day = date.today()
+
+    def _rotate_if_needed(self):
+        if self._file is None:
+            self._open()
+        today = date.today()
+        # The size on disk, not tell(): other processes append to the same file
+        size = os.fstat(self._file.fileno()).st_size
+        too_big = self.max_bytes and size >= self.max_bytes
+        new_day = self.rotate_daily and today != self._day and size
+        if not (too_big or new_day):
+            return
+        self._file.close()
+        try:
+            os.replace(self.path, self._rotated_path(self._day))
+        except PermissionError:
+            # Windows won't rename a file another process has open; keep appending, retry next batch
+            self._open()
+            return
+        self._file = open(self.path, "a")
+        self._day = today
+
+    def _rotated_path(self, day):
+        stem, suffix = os.path.splitext(self.path)
+        candidate = f"{stem}.{day.isoformat()}{suffix}"
+        n = 1
+        while os.path.exists(candidate):
+            candidate = f"{stem}.{day.isoformat()}.{n}{suffix}"
+            n += 1
+        return candidate
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_emission_log(directory, **options):
+    """Shared writer for directory/capsule_emission_log.json, closed (and flushed) at exit."""
+    path = os.path.abspath(os.path.join(directory, EMISSION_LOG_NAME))
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            os.makedirs(directory, exist_ok=True)
+            writer = _writers[path] = EmissionLogWriter(path, **options)
+            atexit.register(writer.close)
+        return writer
+
+
+# --- Self-check ---
+
+def self_check():
+    ok = True
+
+    def check(label, passed):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Two writers with their own file handles stand in for two rig processes
+        path = os.path.join(directory, EMISSION_LOG_NAME)
+        writers = [EmissionLogWriter(path, batch_size=1, max_bytes=2048) for _ in range(2)]
+        total = 400
+        for i in range(total):
+            writer = writers[i % 2]
+            writer.write({"n": i, "writer": i % 2, "pad": "x" * 40})
+            writer.flush()
+        for writer in writers:
+            writer.close()
+
+        runs = []
+        for name in os.listdir(directory):
+            if name.endswith(".json"):
+                with open(os.path.join(directory, name), "r") as f:
+                    runs.append([json.loads(line)["n"] for line in f])
+        numbers = sorted(n for run in runs for n in run)
+        check(f"No entry lost across {len(runs)} log files ({len(numbers)} of {total})", numbers == list(range(total)))
+        # Every batch went to the current log, so each file holds one unbroken run of entries
+        check("Nothing appended to a rotated file",
+              all(run == list(range(run[0], run[0] + len(run))) for run in runs if run))
+        check(f"A writer reopened the log after the other one rotated it ({sum(w.reopened for w in writers)} times)",
+              sum(w.reopened for w in writers) > 0)
+        with open(path, "r") as f:
+            last = [json.loads(line)["n"] for line in f][-1:]
+        check("The current log ends with the last entry written", last == [total - 1])
+    return ok
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        sys.exit(0 if self_check() else 1)
+    print("Usage: python -m manierism.emission_log --check")
@@ -0,0 +1,318 @@
+"""
+SQLite emission store
+- Every log_real_emission entry lands in emissions.db next to capsule_emission_log.json,
+  indexed on (wallet_id, timestamp) and on overlay
+- Hourly and daily rollups per wallet (UTC buckets) and lifetime totals are updated in the
+  same transaction as each batch of raw rows, so they never need a rescan
+- Lifetime totals are also cached in memory: the dashboard and rig export read them in O(1); every
+  batch adds its own counts to the table (several rig sessions can share a rigs folder) and
+  reloads the rows it touched, and a read first checks SQLite's data_version, so a commit by
+  another rig process drops the cache and the totals are read back from the table
+- Fed by the emission log writer thread (one transaction per batch)
+- A new store imports the existing capsule_emission_log*.json files once
+- Query tool: python -m manierism.emission_store /path/to/rigs [wallet_id] [days]
+- Self-check (two sessions on one store): python -m manierism.emission_store --check
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import threading
+
+from manierism.emission_log import EMISSION_LOG_NAME
+
+STORE_NAME = "emissions.db"
+
+PERIODS = {"hour": 3600, "day": 86400}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS emissions (
+    id INTEGER PRIMARY KEY,
+    wallet_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    capsule_mb REAL,
+    capsule_kwh REAL,
+    overlay TEXT,
+    simulated INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_emissions_wallet_time ON emissions (wallet_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_emissions_overlay ON emissions (overlay);
+CREATE TABLE IF NOT EXISTS emission_rollups (
+    wallet_id TEXT NOT NULL,
+    period TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    entries INTEGER NOT NULL,
+    capsule_mb REAL NOT NULL,
+    capsule_kwh REAL NOT NULL,
+    PRIMARY KEY (wallet_id, period, bucket)
+);
+CREATE TABLE IF NOT EXISTS emission_totals (
+    wallet_id TEXT PRIMARY KEY,
+    entries INTEGER NOT NULL,
+    capsule_mb REAL NOT NULL,
+    capsule_kwh REAL NOT NULL,
+    first_timestamp REAL,
+    last_timestamp REAL
+);
+"""
+
+ROLLUP_UPSERT = """
+INSERT INTO emission_rollups (wallet_id, period, bucket, entries, capsule_mb, capsule_kwh) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (wallet_id, period, bucket) DO UPDATE SET
+    entries = entries + excluded.entries,
+    capsule_mb = capsule_mb + excluded.capsule_mb,
+    capsule_kwh = capsule_kwh + excluded.capsule_kwh
+"""
+
+TOTALS_UPSERT = """
+INSERT INTO emission_totals (wallet_id, entries, capsule_mb, capsule_kwh, first_timestamp, last_timestamp)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (wallet_id) DO UPDATE SET
+    entries = entries + excluded.entries,
+    capsule_mb = capsule_mb + excluded.capsule_mb,
+    capsule_kwh = capsule_kwh + excluded.capsule_kwh,
+    first_timestamp = MIN(COALESCE(first_timestamp, excluded.first_timestamp), excluded.first_timestamp),
+    last_timestamp = MAX(COALESCE(last_timestamp, excluded.last_timestamp), excluded.last_timestamp)
+"""
+
+TOTALS_COLUMNS = "wallet_id, entries, capsule_mb, capsule_kwh, first_timestamp, last_timestamp"
+
+EMPTY_TOTALS = {"entries": 0, "capsule_MB": 0.0, "capsule_kWh": 0.0, "first_timestamp": None, "last_timestamp": None}
+
+
+class EmissionStore:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._totals = {}  # wallet_id -> totals row, filled on read
+        self._data_version = None
+
+    # --- Writes ---
+
+    def append_batch(self, entries):
+        """Inserts raw rows and folds them into the rollups and totals in one transaction."""
+        rows, rollups, added = [], {}, {}
+        for entry in entries:
+            wallet_id, ts = entry["wallet_id"], float(entry["timestamp"])
+            mb, kwh = float(entry.get("capsule_MB", 0.0)), float(entry.get("capsule_kWh", 0.0))
+            rows.append((wallet_id, ts, mb, kwh, entry.get("overlay"), int(bool(entry.get("simulated")))))
+            for period, seconds in PERIODS.items():
+                key = (wallet_id, period, int(ts // seconds) * seconds)
+                count, total_mb, total_kwh = rollups.get(key, (0, 0.0, 0.0))
+                rollups[key] = (count + 1, total_mb + mb, total_kwh + kwh)
+            totals = added.setdefault(wallet_id, dict(EMPTY_TOTALS))
+            totals["entries"] += 1
+            totals["capsule_MB"] += mb
+            totals["capsule_kWh"] += kwh
+            if totals["first_timestamp"] is None or ts < totals["first_timestamp"]:
+                totals["first_timestamp"] = ts
+            if totals["last_timestamp"] is None or ts > totals["last_timestamp"]:
+                totals["last_timestamp"] = ts
+        if not rows:
+            return 0
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO emissions (wallet_id, timestamp, capsule_mb, capsule_kwh, overlay, simulated) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+                self._conn.executemany(ROLLUP_UPSERT, [key + value for key, value in rollups.items()])
+                # Adds this batch to what is stored, so another session's counts are never overwritten
+                self._conn.executemany(TOTALS_UPSERT, [(wallet_id, *totals.values()) for wallet_id, totals in added.items()])
+                wallet_ids = list(added)
+                for start in range(0, len(wallet_ids), 500):
+                    chunk = wallet_ids[start:start + 500]
+                    for row in self._conn.execute(
+                            f"SELECT {TOTALS_COLUMNS} FROM emission_totals WHERE wallet_id IN ({','.join('?' * len(chunk))})", chunk):
+                        self._totals[row[0]] = dict(zip(EMPTY_TOTALS, row[1:]))
+        return len(rows)
+
+    def import_log_file(self, path, batch_size=5000):
+        """Loads a capsule_emission_log JSON-lines file; unreadable lines are skipped."""
+        imported, batch = 0, []
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    entry["wallet_id"], entry["timestamp"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                batch.append(entry)
+                if len(batch) >= batch_size:
+                    imported += self.append_batch(batch)
+                    batch = []
+        return imported + self.append_batch(batch)
+
+    def prune(self, before_timestamp):
+        """Drops raw rows older than the cutoff; rollups and totals are kept."""
+        with self._lock:
+            with self._conn:
+                deleted = self._conn.execute("DELETE FROM emissions WHERE timestamp < ?", (before_timestamp,)).rowcount
+        return deleted
+
+    # --- Queries ---
+
+    def _drop_cache_if_changed(self):
+        # data_version only moves when another connection (another rig process) commits
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            self._totals.clear()
+
+    def totals(self, wallet_id):
+        """Lifetime entries / capsule_MB / capsule_kWh for a wallet, from memory unless another process wrote since."""
+        with self._lock:
+            self._drop_cache_if_changed()
+            totals = self._totals.get(wallet_id)
+            if totals is None:
+                row = self._conn.execute(f"SELECT {TOTALS_COLUMNS} FROM emission_totals WHERE wallet_id = ?", (wallet_id,)).fetchone()
+                totals = self._totals[wallet_id] = dict(zip(EMPTY_TOTALS, row[1:])) if row else dict(EMPTY_TOTALS)
+            return dict(totals)
+
+    def wallet_ids(self):
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT wallet_id FROM emission_totals ORDER BY wallet_id")]
+
+    def window_totals(self, wallet_id, since, until=None, period="hour"):
+        """Sums the rollup buckets overlapping [since, until) — e.g. kWh over the last week."""
+        until = time.time() if until is None else until
+        seconds = PERIODS[period]
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(entries), 0), COALESCE(SUM(capsule_mb), 0), COALESCE(SUM(capsule_kwh), 0) "
+                "FROM emission_rollups WHERE wallet_id = ? AND period = ? AND bucket >= ? AND bucket < ?",
+                (wallet_id, period, int(since // seconds) * seconds, until)
+            ).fetchone()
+        return {"entries": row[0], "capsule_MB": row[1], "capsule_kWh": row[2]}
+
+    def rollups(self, wallet_id, period="day", since=0, until=None):
+        """[(bucket_start, entries, capsule_MB, capsule_kWh), ...] in time order."""
+        until = time.time() if until is None else until
+        with self._lock:
+            return self._conn.execute(
+                "SELECT bucket, entries, capsule_mb, capsule_kwh FROM emission_rollups "
+                "WHERE wallet_id = ? AND period = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+                (wallet_id, period, since, until)
+            ).fetchall()
+
+    def overlay_totals(self, wallet_id, since=0, until=None):
+        """{overlay: (entries, capsule_MB, capsule_kWh)} from the raw rows still on disk."""
+        until = time.time() if until is None else until
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT overlay, COUNT(*), SUM(capsule_mb), SUM(capsule_kwh) FROM emissions "
+                "WHERE wallet_id = ? AND timestamp >= ? AND timestamp < ? GROUP BY overlay",
+                (wallet_id, since, until)
+            ).fetchall()
+        return {overlay: (count, mb, kwh) for overlay, count, mb, kwh in rows}
+
+    def entries(self, wallet_id, since=0, until=None, overlay=None, limit=None):
+        until = time.time() if until is None else until
+        sql = "SELECT timestamp, capsule_mb, capsule_kwh, overlay, simulated FROM emissions " \
+              "WHERE wallet_id = ? AND timestamp >= ? AND timestamp < ?"
+        params = [wallet_id, since, until]
+        if overlay is not None:
+            sql += " AND overlay = ?"
+            params.append(overlay)
+        sql += " ORDER BY timestamp"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _existing_log_files(directory):
+    stem, suffix = os.path.splitext(EMISSION_LOG_NAME)
+    rotated = sorted(f for f in os.listdir(directory) if f.startswith(stem + ".") and f.endswith(suffix) and f != EMISSION_LOG_NAME)
+    current = [EMISSION_LOG_NAME] if os.path.exists(os.path.join(directory, EMISSION_LOG_NAME)) else []
+    return [os.path.join(directory, f) for f in rotated + current]
+
+
+def open_emission_store(directory):
+    """Opens the store in the rigs folder, importing the JSON logs on first use; None if SQLite is unusable."""
+    db_path = os.path.join(directory, STORE_NAME)
+    is_new = not os.path.exists(db_path)
+    try:
+        store = EmissionStore(db_path)
+    except sqlite3.Error as e:
+        print(f"⚠️ Emission store unavailable ({e}) — dashboard emission totals disabled.")
+        return None
+    if is_new:
+        imported = sum(store.import_log_file(path) for path in _existing_log_files(directory))
+        if imported:
+            print(f"🧾 Imported {imported} emission log entries into {STORE_NAME}")
+    return store
+
+
+# --- Self-check ---
+
+def self_check():
+    import shutil
+    import tempfile
+
+    ok = True
+
+    def check(label, passed):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    directory = tempfile.mkdtemp(prefix="emission_store_check_")
+    db_path = os.path.join(directory, STORE_NAME)
+    first, second = EmissionStore(db_path), EmissionStore(db_path)
+    try:
+        emission = lambda ts: {"wallet_id": "W1", "timestamp": ts, "capsule_MB": 2.0, "capsule_kWh": 0.5}
+        first.append_batch([emission(100.0), emission(200.0)])
+        second.append_batch([emission(50.0)])
+        first.append_batch([emission(300.0)])
+        totals = first.totals("W1")
+        check(f"Two sessions' totals add up in memory ({totals['entries']} entries)",
+              totals == {"entries": 4, "capsule_MB": 8.0, "capsule_kWh": 2.0, "first_timestamp": 50.0, "last_timestamp": 300.0})
+        totals_elsewhere = second.totals("W1")
+        check("A session that did not write the last batch still sees it", totals_elsewhere == totals)
+        second.totals("W1")
+        first.append_batch([emission(400.0)])
+        check("A cached reader picks up another session's later batch", second.totals("W1")["entries"] == 5)
+        reopened = EmissionStore(db_path)
+        check("Reopened store reads the same totals", reopened.totals("W1") == first.totals("W1"))
+        reopened.close()
+        check("Totals match the raw rows", first.overlay_totals("W1", until=1000) == {None: (5, 10.0, 2.5)})
+    finally:
+        first.close()
+        second.close()
+        shutil.rmtree(directory, ignore_errors=True)
+    return ok
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--check"]:
+        sys.exit(0 if self_check() else 1)
+    if len(sys.argv) < 2:
+        print("Usage: python -m manierism.emission_store /path/to/rigs [wallet_id] [days]")
+        sys.exit(1)
+    store = open_emission_store(sys.argv[1])
+    if store is None:
+        sys.exit(1)
+    if len(sys.argv) == 2:
+        for wallet_id in store.wallet_ids():
+            totals = store.totals(wallet_id)
+            print(f"{wallet_id}: {totals['entries']} emissions, {totals['capsule_MB']:.6e} MB, {totals['capsule_kWh']:.6e} kWh")
+    else:
+        wallet_id = sys.argv[2]
+        days = float(sys.argv[3]) if len(sys.argv) > 3 else 7
+        window = store.window_totals(wallet_id, time.time() - days * 86400)
+        print(f"⚡ {wallet_id} — last {days:g} days: {window['entries']} emissions, "
+              f"{window['capsule_MB']:.6e} MB, {window['capsule_kWh']:.6e} kWh")
+        for overlay, (count, mb, kwh) in sorted(store.overlay_totals(wallet_id, time.time() - days * 86400).items()):
+            print(f"   {overlay}: {count} x, {kwh:.6e} kWh")
+    store.close()
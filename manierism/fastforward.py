@@ -0,0 +1,135 @@
+"""
+Closed-form fast-forward of a rig
+- Advances a wallet by N ticks in O(1) along its mean path: every roll at its mean (8), SHA
+  boosts at their expected rate (1 in 25 capsules x 1.25), torrent capsules at 5 in 25
+- Permanent hash power is exact for a given number of SHA hits: h0 x 1.001^N x 1.25^k
+- cpu / wifi / sha / kinetic: rewards are a geometric series in the hash power
+- cache: (cache + 1000) grows by a product of (1 + a x h_t) terms; its log is an arithmetic
+  series plus a log1p correction summed as a closed-form power series
+- All values come back as Magnitude, which calculate_rig_hash_power and format_large_number accept,
+  so nothing is expanded into 200-digit Decimals
+
+Usage: python -m manierism.fastforward /path/to/{wallet_id}_wallet.json 27375 cache
+"""
+
+import sys
+import math
+import json
+
+from manierism.magnitude import Magnitude
+from manierism.simulator import (
+    BASE_HASH_POWER, HASH_GROWTH_RATE, OVERLAY_FACTOR, USD_RATES, CUSTOM_REWARDS, TORRENT_CAPSULES
+)
+
+MEAN_ROLL = 8  # randint(1, 15)
+SHA_RATE = CUSTOM_REWARDS.count("SHA") / len(CUSTOM_REWARDS)
+TORRENT_RATE = sum(c.lower() in TORRENT_CAPSULES for c in CUSTOM_REWARDS) / len(CUSTOM_REWARDS)
+
+KEYS = ["rig_hash_power", "capsule_value_mb", "cache_value_mb", "real_kwh", "bandwidth_MBps", "torrent_value_mb"]
+
+LN10 = math.log(10)
+
+
+def _ln(value):
+    return Magnitude.of(value).log10() * LN10
+
+
+def _from_ln(ln_value):
+    return Magnitude.from_log10(ln_value / LN10)
+
+
+def fast_forward_hash_power(rig_hash_power, ticks, sha_hits=0, growth_rate=HASH_GROWTH_RATE):
+    """Permanent H/s after `ticks` passive growth steps and `sha_hits` SHA boosts (order does not matter)."""
+    ln_hash = _ln(rig_hash_power) + ticks * math.log1p(growth_rate) + sha_hits * math.log(1.25)
+    return _from_ln(ln_hash)
+
+
+def _ln_geometric_sum(ln_ratio, ticks):
+    """ln of sum_{t<N} r^t for r = e^ln_ratio > 1."""
+    if ticks <= 0:
+        return float("-inf")
+    ln_power = ticks * ln_ratio
+    # (r^N - 1) / (r - 1), with both factors kept in log form
+    return ln_power + math.log(-math.expm1(-ln_power)) - math.log(math.expm1(ln_ratio))
+
+
+def _ln_product_one_plus(ln_u0, ln_ratio, ticks):
+    """ln of prod_{t<N} (1 + u0 x r^t) for r > 1."""
+    total = 0.0
+    # Walk the first terms directly while u_t is small; the series below needs 1 / u_t < 1/2
+    while ticks > 0 and ln_u0 < math.log(2):
+        total += math.log1p(math.exp(ln_u0))
+        ln_u0 += ln_ratio
+        ticks -= 1
+    if ticks <= 0:
+        return total
+    # ln(1 + u) = ln u + ln(1 + x) with x = 1 / u shrinking geometrically by 1 / r
+    total += ticks * ln_u0 + ln_ratio * ticks * (ticks - 1) / 2
+    x0 = math.exp(-ln_u0)
+    k = 1
+    while True:
+        term = x0 ** k / k
+        if term < 1e-18:
+            break
+        # sum_t x_t^k = x0^k (1 - r^-kN) / (1 - r^-k)
+        total += (-1) ** (k + 1) * term * -math.expm1(-k * ln_ratio * ticks) / -math.expm1(-k * ln_ratio)
+        k += 1
+    return total
+
+
+def fast_forward(wallet, ticks, mining_type="cpu", multiplier=79000, base_hash_power=BASE_HASH_POWER):
+    """Returns a copy of `wallet` advanced `ticks` mean-path ticks, with Magnitude balances."""
+    projected = dict(wallet)
+    values = {key: Magnitude.of(wallet.get(key, 0)) for key in KEYS}
+    if values["rig_hash_power"] == 0:
+        values["rig_hash_power"] = Magnitude.of(base_hash_power)
+
+    ln_growth = math.log1p(HASH_GROWTH_RATE)
+    if mining_type == "sha":
+        ln_growth += math.log1p(0.25 * SHA_RATE)
+    ln_hash0 = _ln(values["rig_hash_power"])
+    ln_per_hash = math.log(MEAN_ROLL * multiplier / base_hash_power)
+
+    if mining_type == "cache":
+        # y = cache + 1000 obeys y' = y (1 + a h_t); each tick's MB reward is exactly y' - y
+        ln_y0 = _ln(values["cache_value_mb"] + 1000)
+        ln_a = ln_per_hash - math.log(1000)
+        ln_y = ln_y0 + _ln_product_one_plus(ln_a + ln_hash0, ln_growth, ticks)
+        mined = _from_ln(ln_y) - _from_ln(ln_y0)
+        values["cache_value_mb"] = values["cache_value_mb"] + mined
+        bandwidth = mined
+    else:
+        cache_factor = 1 + values["cache_value_mb"] / 1000
+        ln_sum_hash = ln_hash0 + _ln_geometric_sum(ln_growth, ticks)
+        mined = _from_ln(ln_per_hash + ln_sum_hash) * cache_factor
+        bandwidth = mined
+
+    values["capsule_value_mb"] = values["capsule_value_mb"] + mined
+    values["real_kwh"] = values["real_kwh"] + mined * OVERLAY_FACTOR
+    values["bandwidth_MBps"] = values["bandwidth_MBps"] + bandwidth
+    values["torrent_value_mb"] = values["torrent_value_mb"] + mined * (TORRENT_RATE / 2)
+    values["rig_hash_power"] = _from_ln(ln_hash0 + ticks * ln_growth)
+
+    projected.update(values)
+    return projected
+
+
+def projected_total_usd(projected):
+    total = Magnitude()
+    for key, rate in USD_RATES.items():
+        total = total + Magnitude.of(projected.get(key, 0)) * rate
+    return total
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python -m manierism.fastforward /path/to/wallet.json TICKS [cpu|wifi|sha|cache]")
+        sys.exit(1)
+    with open(sys.argv[1]) as f:
+        wallet = json.load(f)
+    mining_type = sys.argv[3] if len(sys.argv) > 3 else "cpu"
+    projected = fast_forward(wallet, int(sys.argv[2]), mining_type)
+    print(f"🔮 {wallet.get('wallet_id', '?')} after {int(sys.argv[2]):,} {mining_type.upper()} ticks (mean path)")
+    for key in KEYS:
+        print(f"   {key}: {projected[key]:.6e}")
+    print(f"💰 Total USD Value: ${projected_total_usd(projected):.6e}")
@@ -0,0 +1,147 @@
+"""
+Large number formatting
+- format_large_number output ("1,234.568 Quadrillion"), with the scale picked from the Decimal's
+  adjusted exponent through a precomputed table instead of float comparisons
+- Each rig keeps its own top scale name (Tredecillion, Vigintillion, ..., Millinillion); values
+  past the top name and past float range fall back to scientific notation ("1.035e+6002")
+- Accepts Decimal, int, float and Magnitude; recent results are cached
+- Micro-benchmark against the original implementation: python -m manierism.formatting
+"""
+
+import sys
+import time
+import random
+from decimal import Decimal, getcontext
+from functools import lru_cache
+
+from manierism.magnitude import Magnitude
+
+# Exponent -> short-scale name, in the order the rig scripts list them
+SCALE_NAMES = [
+    (12, "Trillion"), (15, "Quadrillion"), (18, "Quintillion"), (21, "Sextillion"), (24, "Septillion"),
+    (27, "Octillion"), (30, "Nonillion"), (33, "Decillion"), (36, "Undecillion"), (39, "Duodecillion"),
+    (42, "Tredecillion"), (45, "Quattuordecillion"), (48, "Quindecillion"), (51, "Sexdecillion"),
+    (54, "Septendecillion"), (57, "Octodecillion"), (60, "Novemdecillion"), (63, "Vigintillion"),
+    (66, "Unvigintillion"), (69, "Duovigintillion"), (72, "Trevigintillion"), (75, "Quattuorvigintillion"),
+    (78, "Quinvigintillion"), (81, "Sexvigintillion"), (84, "Septenvigintillion"), (87, "Octovigintillion"),
+    (90, "Novemvigintillion"), (93, "Trigintillion"), (96, "Untrigintillion"), (99, "Duotrigintillion"),
+    (102, "Trestrigintillion"), (105, "Quattuortrigintillion"), (108, "Quintrigintillion"),
+    (111, "Sextrigintillion"), (114, "Septentrigintillion"), (117, "Octotrigintillion"),
+    (120, "Novemtrigintillion"), (123, "Quadragintillion"), (153, "Quinquagintillion"),
+    (183, "Sexagintillion"), (213, "Septuagintillion"), (243, "Octogintillion"), (273, "Nonagintillion"),
+    (303, "Centillion"), (603, "Ducentillion"), (903, "Trecentillion"), (1203, "Quadringentillion"),
+    (1503, "Quingentillion"), (1803, "Sescentillion"), (2103, "Septingentillion"),
+    (2403, "Octingentillion"), (2703, "Nongentillion"), (3003, "Millinillion")
+]
+
+FLOAT_MAX_EXPONENT = 308
+
+
+def _as_decimal(n):
+    if isinstance(n, Decimal):
+        return n
+    if isinstance(n, Magnitude):
+        return n.to_decimal()
+    if isinstance(n, int):
+        return Decimal(n)
+    return Decimal(repr(float(n)))
+
+
+def make_large_number_formatter(top_exponent=42, scientific_above=None, cache_size=4096):
+    """format_large_number for a rig whose largest scale name is 10^top_exponent."""
+    if scientific_above is None:
+        scientific_above = max(FLOAT_MAX_EXPONENT, top_exponent + 2)
+    first_exponent = SCALE_NAMES[0][0]
+    # scales[e - first_exponent] = (scale exponent, name) for every adjusted exponent e we name
+    scales = []
+    names = [(e, name) for e, name in SCALE_NAMES if e <= top_exponent]
+    for exponent in range(first_exponent, scientific_above + 1):
+        while len(names) > 1 and names[1][0] <= exponent:
+            names.pop(0)
+        scales.append(names[0])
+
+    @lru_cache(maxsize=cache_size, typed=True)
+    def _format(n):
+        try:
+            value = _as_decimal(n)
+        except (TypeError, ValueError, ArithmeticError):
+            return str(n)
+        if not value.is_finite():
+            return str(value)
+        exponent = value.adjusted()
+        if value == 0 or exponent < first_exponent:
+            return f"{n:,.6f}" if not isinstance(n, Magnitude) else f"{value:,.6f}"
+        if exponent > scientific_above:
+            return f"{value:.3e}"
+        scale_exponent, unit = scales[exponent - first_exponent]
+        return f"{value.scaleb(-scale_exponent):,.3f} {unit}"
+
+    def format_large_number(n):
+        try:
+            return _format(n)
+        except TypeError:  # unhashable input
+            return _format.__wrapped__(n)
+
+    format_large_number.cache_info = _format.cache_info
+    format_large_number.cache_clear = _format.cache_clear
+    return format_large_number
+
+
+# --- Micro-benchmark ---
+
+def _legacy_format_large_number(n):
+    # run.py before the shared formatter
+    n_float = float(n)
+    if n_float < 1e12:
+        return f"{n:,.6f}"
+    powers = {
+        1e12: "Trillion", 1e15: "Quadrillion", 1e18: "Quintillion",
+        1e21: "Sextillion", 1e24: "Septillion", 1e27: "Octillion",
+        1e30: "Nonillion", 1e33: "Decillion", 1e36: "Undecillion",
+        1e39: "Duodecillion", 1e42: "Tredecillion"
+    }
+    scale = 1
+    unit = ""
+    for p, u in sorted(powers.items()):
+        if n_float >= p:
+            scale = p
+            unit = u
+        else:
+            break
+    scaled_n = n / Decimal(scale)
+    return f"{scaled_n:,.3f} {unit}"
+
+
+def benchmark(calls=200_000, distinct=64, seed=7):
+    """Mining-tick style workload: a small set of balances formatted over and over."""
+    getcontext().prec = 200
+    rng = random.Random(seed)
+    values = [Decimal(rng.randint(1, 10 ** 15)).scaleb(rng.randint(-6, 40)) / 7 for _ in range(distinct)]
+    workload = [values[rng.randrange(distinct)] for _ in range(calls)]
+    formatter = make_large_number_formatter(42)
+
+    mismatches = 0
+    for value in values:
+        # the legacy code divides by float powers of ten, which are inexact from 10^23 up
+        if value.adjusted() < 23 and formatter(value) != _legacy_format_large_number(value):
+            mismatches += 1
+
+    results = {}
+    for label, fn in [("legacy", _legacy_format_large_number), ("table + cache", formatter),
+                      ("table, no cache", make_large_number_formatter(42, cache_size=0))]:
+        start = time.perf_counter()
+        for value in workload:
+            fn(value)
+        results[label] = (time.perf_counter() - start) / calls * 1e6
+    return results, mismatches
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    results, mismatches = benchmark(calls)
+    for label, micros in results.items():
+        print(f"⏱️ {label:<16} {micros:8.3f} µs/call  ({results['legacy'] / micros:5.1f}x)")
+    print(f"{'✅' if not mismatches else '❌'} Output matches the legacy formatter below 10^23 ({mismatches} mismatches)")
+    fmt = make_large_number_formatter(303)
+    for sample in [Decimal("1e6000") * Decimal("103.55"), Magnitude(2.5, 400), Decimal("1e310")]:
+        print(f"   {sample!r:>32} -> {fmt(sample)}")
@@ -0,0 +1,311 @@
+"""
+Raspberry Pi GPIO for the electricity emitters (coil motor, resistor, capacitor)
+- RPi.GPIO is imported and the pins set up on the first emission, not when a rig script starts
+- rpi_gpio() returns the configured RPi.GPIO module, or None off the Pi (the rigs print a
+  simulation instead); the probe runs once per process
+- actuator_scheduler() runs the emitters on one background thread fed by a queue, so a mining
+  tick only enqueues its emission: commands waiting in the queue are coalesced into one run
+  (fastest coil speed, summed heat time, one discharge), the PWM duty cycle is clamped to 0-100%
+  and the heat time to MAX_HEAT_SECONDS, and the coil and resistor run at the same time
+- stats() reports queue depth, coalesced / clamped commands and each actuator's utilisation
+- FakeGPIO records pin changes instead of driving hardware:
+  python -m manierism.gpio --check
+"""
+
+import sys
+import time
+import queue
+import atexit
+import threading
+
+MOTOR_PIN = 18
+RESISTOR_PIN = 23
+CAPACITOR_PIN = 24
+
+PWM_FREQUENCY = 1000
+SPIN_SECONDS = 5.0
+MAX_HEAT_SECONDS = 10.0
+DISCHARGE_SECONDS = 0.1
+
+_lock = threading.Lock()
+_probed = False
+_gpio = None
+_scheduler = None
+
+
+def setup_pins(GPIO):
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(MOTOR_PIN, GPIO.OUT)
+    GPIO.setup(RESISTOR_PIN, GPIO.OUT)
+    GPIO.setup(CAPACITOR_PIN, GPIO.OUT)
+
+
+def rpi_gpio():
+    global _probed, _gpio
+    if _probed:
+        return _gpio
+    with _lock:
+        if not _probed:
+            try:
+                import RPi.GPIO as GPIO
+                setup_pins(GPIO)
+                _gpio = GPIO
+            except (ImportError, RuntimeError):
+                _gpio = None
+            _probed = True
+    return _gpio
+
+
+def actuator_scheduler():
+    """The process's running ActuatorScheduler on the Pi, started on first use; None off the Pi."""
+    global _scheduler
+    GPIO = rpi_gpio()
+    if GPIO is None:
+        return None
+    with _lock:
+        if _scheduler is None:
+            _scheduler = ActuatorScheduler(GPIO).start()
+            atexit.register(_scheduler.close)
+    return _scheduler
+
+
+def actuator_stats():
+    """stats() of the running scheduler, or None if no emission has started one."""
+    return _scheduler.stats() if _scheduler is not None else None
+
+
+# --- Actuator scheduler ---
+
+class ActuatorScheduler:
+    def __init__(self, gpio, spin_seconds=SPIN_SECONDS, max_heat_seconds=MAX_HEAT_SECONDS,
+                 discharge_seconds=DISCHARGE_SECONDS, pwm_frequency=PWM_FREQUENCY):
+        """gpio: RPi.GPIO with the pins set up (setup_pins), or a FakeGPIO."""
+        self.gpio = gpio
+        self.spin_seconds = spin_seconds
+        self.max_heat_seconds = max_heat_seconds
+        self.discharge_seconds = discharge_seconds
+        self.pwm_frequency = pwm_frequency
+        self.submitted = 0
+        self.coalesced = 0
+        self.clamped = 0
+        self.runs = 0
+        self.busy_seconds = {"coil": 0.0, "resistor": 0.0, "capacitor": 0.0}
+        self.started_at = None
+        self._queue = queue.Queue()
+        self._pending = 0
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="actuator-scheduler", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, speed_percent=0.0, heat_seconds=0.0, discharge=False):
+        """Queues one emission and returns at once."""
+        with self._lock:
+            self.submitted += 1
+            self._pending += 1
+            self._idle.clear()
+        self._queue.put((float(speed_percent), float(heat_seconds), discharge))
+
+    def emit(self, kWh):
+        # Same mapping as the rigs' synchronous emit_real_electricity: kWh x 100 % coil, kWh seconds of heat
+        self.submit(float(kWh) * 100, float(kWh), discharge=True)
+
+    def wait_idle(self, timeout=None):
+        """True once every queued emission has run."""
+        return self._idle.wait(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            command = self._queue.get()
+            if command is None:
+                break
+            speed, heat, discharge = command
+            merged = 1
+            while True:
+                try:
+                    command = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if command is None:
+                    break
+                speed, heat, discharge = max(speed, command[0]), heat + command[1], discharge or command[2]
+                merged += 1
+            self._actuate(speed, heat, discharge, merged)
+            with self._lock:
+                self._pending -= merged
+                if self._pending <= 0:
+                    self._pending = 0
+                    self._idle.set()
+
+    def _actuate(self, speed, heat, discharge, merged):
+        GPIO = self.gpio
+        duty = min(max(speed, 0.0), 100.0)
+        heat_for = min(max(heat, 0.0), self.max_heat_seconds)
+        spin_for = self.spin_seconds if duty > 0 else 0.0
+        started = time.monotonic()
+        pwm, heating = None, False
+        try:
+            if spin_for > 0:
+                pwm = GPIO.PWM(MOTOR_PIN, self.pwm_frequency)
+                pwm.start(duty)
+            if heat_for > 0:
+                GPIO.output(RESISTOR_PIN, GPIO.HIGH)
+                heating = True
+            # Coil and resistor run side by side; each is switched off at its own deadline
+            for offset, actuator in sorted([(spin_for, "coil"), (heat_for, "resistor")]):
+                if self._stop.wait(max(0.0, started + offset - time.monotonic())):
+                    break
+                if actuator == "coil" and pwm is not None:
+                    pwm.stop()
+                    pwm = None
+                elif actuator == "resistor" and heating:
+                    GPIO.output(RESISTOR_PIN, GPIO.LOW)
+                    heating = False
+        finally:
+            if pwm is not None:
+                pwm.stop()
+            if heating:
+                GPIO.output(RESISTOR_PIN, GPIO.LOW)
+        coil_busy = min(spin_for, time.monotonic() - started)
+        heat_busy = min(heat_for, time.monotonic() - started)
+        discharge_busy = 0.0
+        if discharge and not self._stop.is_set():
+            GPIO.output(CAPACITOR_PIN, GPIO.HIGH)
+            self._stop.wait(self.discharge_seconds)
+            GPIO.output(CAPACITOR_PIN, GPIO.LOW)
+            discharge_busy = self.discharge_seconds
+        with self._lock:
+            self.runs += 1
+            self.coalesced += merged - 1
+            self.clamped += int(duty != speed or heat_for != heat)
+            self.busy_seconds["coil"] += coil_busy
+            self.busy_seconds["resistor"] += heat_busy
+            self.busy_seconds["capacitor"] += discharge_busy
+
+    def stats(self):
+        with self._lock:
+            elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+            return {
+                "queued": self._queue.qsize(),
+                "submitted": self.submitted,
+                "runs": self.runs,
+                "coalesced": self.coalesced,
+                "clamped": self.clamped,
+                "utilisation": {name: (busy / elapsed if elapsed > 0 else 0.0) for name, busy in self.busy_seconds.items()},
+            }
+
+    def close(self, timeout=2.0):
+        """Stops the thread; a run in progress is cut short and every pin left LOW."""
+        self._stop.set()
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def format_actuator_stats(stats):
+    utilisation = ", ".join(f"{name} {share * 100:.1f}%" for name, share in stats["utilisation"].items())
+    return (f"🔌 Actuators: {stats['runs']} runs for {stats['submitted']} emissions "
+            f"({stats['coalesced']} coalesced, {stats['clamped']} clamped, {stats['queued']} queued) — {utilisation}")
+
+
+# --- Fake backend ---
+
+class FakeGPIO:
+    """RPi.GPIO stand-in: records (seconds since creation, pin, value) instead of driving pins."""
+    BCM = "BCM"
+    OUT = "OUT"
+    HIGH = 1
+    LOW = 0
+
+    def __init__(self):
+        self.created_at = time.monotonic()
+        self.events = []
+        self.pins = {}
+        self._lock = threading.Lock()
+
+    def _record(self, pin, value):
+        with self._lock:
+            self.pins[pin] = value
+            self.events.append((time.monotonic() - self.created_at, pin, value))
+
+    def setmode(self, mode):
+        self.mode = mode
+
+    def setup(self, pin, direction):
+        self._record(pin, self.LOW)
+
+    def output(self, pin, value):
+        self._record(pin, value)
+
+    def PWM(self, pin, frequency):
+        return _FakePWM(self, pin)
+
+    def cleanup(self):
+        self.pins.clear()
+
+
+class _FakePWM:
+    def __init__(self, gpio, pin):
+        self.gpio = gpio
+        self.pin = pin
+
+    def start(self, duty_cycle):
+        if not 0 <= duty_cycle <= 100:
+            raise ValueError("dutycycle must have a value from 0.0 to 100.0")
+        self.gpio._record(self.pin, f"pwm {duty_cycle:g}%")
+
+    def stop(self):
+        self.gpio._record(self.pin, self.gpio.LOW)
+
+
+# --- Self-check ---
+
+def self_check():
+    ok = True
+
+    def check(label, passed):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    GPIO = FakeGPIO()
+    setup_pins(GPIO)
+    scheduler = ActuatorScheduler(GPIO, spin_seconds=0.2, max_heat_seconds=0.3, discharge_seconds=0.01).start()
+
+    started = time.perf_counter()
+    for _ in range(50):
+        scheduler.emit(1e30)
+    submit_ms = (time.perf_counter() - started) * 1000
+    check(f"50 huge emissions queued in {submit_ms:.2f} ms (synchronous: 1e30 s of heat each)", submit_ms < 50)
+    check("Scheduler drained the queue", scheduler.wait_idle(5))
+    stats = scheduler.stats()
+    check(f"Queued emissions coalesced: {stats['runs']} runs for 50 emissions", stats["runs"] < 50 and stats["runs"] + stats["coalesced"] == 50)
+    check("Coil PWM duty cycle clamped to 100%", (MOTOR_PIN, "pwm 100%") in [(pin, value) for _, pin, value in GPIO.events])
+    heat = [t for t, pin, value in GPIO.events if pin == RESISTOR_PIN and value == GPIO.HIGH]
+    cool = [t for t, pin, value in GPIO.events if pin == RESISTOR_PIN and value == GPIO.LOW and t > heat[0]]
+    check(f"Resistor heat clamped to 0.3 s ({cool[0] - heat[0]:.2f} s)", 0.25 < cool[0] - heat[0] < 0.6)
+    spin = [t for t, pin, value in GPIO.events if pin == MOTOR_PIN and value == "pwm 100%"]
+    check("Coil and resistor started together", abs(spin[0] - heat[0]) < 0.05)
+    print(format_actuator_stats(stats))
+
+    scheduler.emit(1e30)
+    time.sleep(0.05)
+    started = time.perf_counter()
+    scheduler.close()
+    check(f"close() cut the running emission short in {(time.perf_counter() - started) * 1000:.0f} ms",
+          time.perf_counter() - started < 0.2)
+    check("Every pin LOW after close()", all(value == GPIO.LOW for value in GPIO.pins.values()))
+    return ok
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        sys.exit(0 if self_check() else 1)
+    print("Usage: python -m manierism.gpio --check")
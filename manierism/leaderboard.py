@@ -0,0 +1,326 @@
+"""
+Leaderboard and network totals over every rig wallet
+- save_wallet feeds each saved wallet to track(): every metric (rig_hash_power, Watts-backed
+  value, world debt paid, capsule MB) has a max-heap of wallets and a running total, so a top-N
+  or a network total never loads or sorts the rigs folder
+- A heap entry is pushed only when the wallet's metric changes; entries it replaces are skipped
+  when the top is read and dropped when the heap is rebuilt (once it holds twice the wallets)
+- Totals are kept as 10^18-scaled ints (manierism.ledger): each wallet counts to 18 decimals and
+  the totals never drift
+- LeaderboardServer serves snapshot() as JSON on a local port:
+  GET /leaderboard[?n=10], /leaderboard/<metric>[?n=10], /stats
+- python -m manierism.leaderboard --check | --bench [--wallets 1000]
+"""
+
+import sys
+import json
+import time
+import heapq
+import random
+import threading
+from decimal import Decimal
+from urllib.parse import urlparse, parse_qs
+
+from manierism.ledger import to_units, from_units
+
+DEFAULT_SIZE = 10
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8790
+
+
+class Leaderboard:
+    def __init__(self, metrics, size=DEFAULT_SIZE, exclude=()):
+        """metrics: {name: wallet -> Decimal}; wallets in `exclude` are neither ranked nor counted."""
+        self.metrics = dict(metrics)
+        self.size = size
+        self.exclude = set(exclude)
+        self.seeded = False
+        self.rebuilds = 0
+        self._rig_ids = {}
+        self._current = {name: {} for name in self.metrics}  # name -> {wallet_id: (value, units, seq)}
+        self._heaps = {name: [] for name in self.metrics}
+        self._totals = {name: 0 for name in self.metrics}
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    # --- Updates ---
+
+    def track(self, wallet):
+        """Records a saved wallet: its heap entries and the totals move only for metrics that changed."""
+        wallet_id = wallet["wallet_id"]
+        if wallet_id in self.exclude:
+            return
+        values = {name: metric(wallet) for name, metric in self.metrics.items()}
+        with self._lock:
+            self._rig_ids[wallet_id] = wallet.get("rig_id", wallet_id)
+            for name, value in values.items():
+                current = self._current[name]
+                old = current.get(wallet_id)
+                if old is not None and old[0] == value:
+                    continue
+                units = to_units(value)
+                self._seq += 1
+                current[wallet_id] = (value, units, self._seq)
+                self._totals[name] += units - (old[1] if old is not None else 0)
+                heap = self._heaps[name]
+                heapq.heappush(heap, (-value, wallet_id, self._seq))
+                if len(heap) > 2 * len(current) + self.size:
+                    self._rebuild(name)
+
+    def forget(self, wallet_id):
+        with self._lock:
+            self._rig_ids.pop(wallet_id, None)
+            for name, current in self._current.items():
+                old = current.pop(wallet_id, None)
+                if old is not None:
+                    self._totals[name] -= old[1]
+
+    def seed(self, wallet_ids, load):
+        """Tracks every wallet not saved yet this session (load: wallet_id -> wallet); runs once."""
+        with self._lock:
+            untracked = [wallet_id for wallet_id in wallet_ids if wallet_id not in self._rig_ids]
+        for wallet_id in untracked:
+            if wallet_id in self.exclude:
+                continue
+            wallet = load(wallet_id)
+            # A wallet saved while seeding is already tracked with newer balances
+            if wallet is not None and wallet_id not in self._rig_ids:
+                self.track(wallet)
+        self.seeded = True
+
+    def _rebuild(self, name):
+        heap = [(-value, wallet_id, seq) for wallet_id, (value, _, seq) in self._current[name].items()]
+        heapq.heapify(heap)
+        self._heaps[name] = heap
+        self.rebuilds += 1
+
+    # --- Queries ---
+
+    def top(self, name, n=None):
+        """[(wallet_id, rig_id, value), ...] for the n wallets highest on `name`."""
+        n = self.size if n is None else n
+        with self._lock:
+            heap, current = self._heaps[name], self._current[name]
+            taken = []
+            while heap and len(taken) < n:
+                entry = heapq.heappop(heap)
+                latest = current.get(entry[1])
+                if latest is not None and latest[2] == entry[2]:
+                    taken.append(entry)
+            for entry in taken:
+                heapq.heappush(heap, entry)
+            return [(wallet_id, self._rig_ids[wallet_id], -negative) for negative, wallet_id, _ in taken]
+
+    def total(self, name):
+        return from_units(self._totals[name])
+
+    def totals(self):
+        with self._lock:
+            return {name: from_units(units) for name, units in self._totals.items()}
+
+    def rig_count(self):
+        return len(self._rig_ids)
+
+    def snapshot(self, n=None):
+        """JSON-ready totals and top-n of every metric; amounts are decimal strings."""
+        return {
+            "rigs": self.rig_count(),
+            "totals": {name: _amount(value) for name, value in self.totals().items()},
+            "leaders": {name: [{"wallet_id": wallet_id, "rig_id": rig_id, "value": _amount(value)}
+                               for wallet_id, rig_id, value in self.top(name, n)] for name in self.metrics},
+        }
+
+    def stats(self):
+        with self._lock:
+            return {"rigs": len(self._rig_ids), "heap_entries": sum(len(heap) for heap in self._heaps.values()),
+                    "rebuilds": self.rebuilds}
+
+
+def _amount(value):
+    return format(value, "f")
+
+
+# --- Local JSON endpoint ---
+
+class LeaderboardServer:
+    def __init__(self, board, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Serves `board` on host:port (port 0 picks a free one) once start() is called."""
+        self.board = board
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, background=True):
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+        server_ref = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = server_ref.respond(self.path)
+                payload = json.dumps(body, indent=2).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_port
+        if background:
+            threading.Thread(target=self._server.serve_forever, name="leaderboard-server", daemon=True).start()
+        else:
+            self._server.serve_forever()
+        return self
+
+    def respond(self, path):
+        """(HTTP status, JSON body) for a GET of `path`."""
+        self.requests += 1
+        url = urlparse(path)
+        try:
+            n = int(parse_qs(url.query).get("n", [self.board.size])[0])
+        except ValueError:
+            return 400, {"error": "n must be a whole number"}
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["leaderboard"]:
+            return 200, self.board.snapshot(n)
+        if len(parts) == 2 and parts[0] == "leaderboard":
+            if parts[1] not in self.board.metrics:
+                return 404, {"error": f"unknown metric {parts[1]}", "metrics": list(self.board.metrics)}
+            return 200, [{"wallet_id": wallet_id, "rig_id": rig_id, "value": _amount(value)}
+                         for wallet_id, rig_id, value in self.board.top(parts[1], n)]
+        if parts == ["stats"]:
+            return 200, {"rigs": self.board.rig_count(),
+                         "totals": {name: _amount(value) for name, value in self.board.totals().items()}}
+        return 404, {"error": "not found", "routes": ["/leaderboard", "/leaderboard/<metric>", "/stats"]}
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# --- Self-check and benchmark ---
+
+METRICS = {
+    "rig_hash_power": lambda wallet: wallet["rig_hash_power"],
+    "capsule_value_mb": lambda wallet: wallet["capsule_value_mb"],
+    "world_debt_paid_usd": lambda wallet: wallet["world_debt_paid_usd"],
+}
+
+
+def _random_wallet(i, rng):
+    return {"wallet_id": f"W{i:05d}", "rig_id": f"Rig {i}",
+            "rig_hash_power": Decimal(10000 + rng.randint(0, 500)),
+            "capsule_value_mb": Decimal(rng.randint(0, 10 ** 9)) / Decimal(7),
+            "world_debt_paid_usd": Decimal(rng.randint(0, 100))}
+
+
+def _tick(wallet, rng):
+    wallet = wallet.copy()
+    wallet["capsule_value_mb"] += Decimal(rng.randint(1, 10 ** 6)) / Decimal(3)
+    if rng.random() < 0.1:
+        wallet["rig_hash_power"] += Decimal(rng.randint(1, 50))
+    return wallet
+
+
+def _scan_top(wallets, name, n):
+    ranked = sorted(wallets.values(), key=lambda wallet: (-METRICS[name](wallet), wallet["wallet_id"]))
+    return [(wallet["wallet_id"], wallet["rig_id"], METRICS[name](wallet)) for wallet in ranked[:n]]
+
+
+def self_check():
+    ok = True
+
+    def check(label, passed):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    rng = random.Random(3)
+    wallets = {wallet["wallet_id"]: wallet for wallet in (_random_wallet(i, rng) for i in range(300))}
+    wallets["WD"] = dict(_random_wallet(999, rng), wallet_id="WD")
+    board = Leaderboard(METRICS, size=10, exclude=["WD"])
+    board.seed(list(wallets), wallets.get)
+    for _ in range(20_000):
+        wallet_id = f"W{rng.randrange(300):05d}"
+        wallets[wallet_id] = _tick(wallets[wallet_id], rng)
+        board.track(wallets[wallet_id])
+    ranked = {wallet_id: wallet for wallet_id, wallet in wallets.items() if wallet_id != "WD"}
+    check("Top 10 of every metric matches a full sort after 20,000 saves",
+          all(board.top(name, 10) == _scan_top(ranked, name, 10) for name in METRICS))
+    check("Totals match a full sum", all(board.total(name) == from_units(sum(to_units(METRICS[name](w)) for w in ranked.values()))
+                                         for name in METRICS))
+    check("Excluded wallet neither ranked nor counted", board.rig_count() == 300)
+    stats = board.stats()
+    check(f"Heaps stay bounded ({stats['heap_entries']} entries for 300 rigs x 3, {stats['rebuilds']} rebuilds)",
+          stats["heap_entries"] <= 3 * (2 * 300 + 10 + 1))
+    board.forget("W00000")
+    check("forget() drops a wallet from ranks and totals",
+          all(wallet_id != "W00000" for name in METRICS for wallet_id, _, _ in board.top(name, 300)) and board.rig_count() == 299)
+
+    import urllib.request
+    server = LeaderboardServer(board, port=0).start()
+    try:
+        with urllib.request.urlopen(f"{server.url}/leaderboard?n=3") as response:
+            body = json.load(response)
+        check(f"GET /leaderboard?n=3 serves the snapshot ({server.url})", body == json.loads(json.dumps(board.snapshot(3))))
+        with urllib.request.urlopen(f"{server.url}/leaderboard/rig_hash_power?n=1") as response:
+            leader = json.load(response)[0]
+        check("GET /leaderboard/<metric> serves one metric", Decimal(leader["value"]) == board.top("rig_hash_power", 1)[0][2])
+        try:
+            urllib.request.urlopen(f"{server.url}/leaderboard/nope")
+            check("Unknown metric is a 404", False)
+        except urllib.error.HTTPError as e:
+            check("Unknown metric is a 404", e.code == 404)
+    finally:
+        server.close()
+    return ok
+
+
+def benchmark(count=1000):
+    rng = random.Random(8)
+    wallets = {wallet["wallet_id"]: wallet for wallet in (_random_wallet(i, rng) for i in range(count))}
+    board = Leaderboard(METRICS)
+    board.seed(list(wallets), wallets.get)
+
+    def timed(label, fn, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        seconds = (time.perf_counter() - start) / repeat
+        print(f"⏱️ {label:<46} {seconds * 1e6:10.1f} µs")
+        return seconds
+
+    def save():
+        wallet_id = f"W{rng.randrange(count):05d}"
+        wallets[wallet_id] = _tick(wallets[wallet_id], rng)
+        board.track(wallets[wallet_id])
+
+    timed("track() per save", save, 20_000)
+    scan = timed(f"Top 10 x 3 + totals, scanning {count} wallets",
+                 lambda: ([_scan_top(wallets, name, 10) for name in METRICS],
+                          [sum(METRICS[name](w) for w in wallets.values()) for name in METRICS]), 5)
+    heap = timed("Top 10 x 3 + totals, heaps", lambda: ([board.top(name) for name in METRICS], board.totals()), 2000)
+    print(f"📈 {scan / heap:,.0f}x (the scan above starts from wallets already in memory)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = dict(zip(args[1::2], args[2::2]))
+    if args[:1] == ["--check"]:
+        sys.exit(0 if self_check() else 1)
+    elif args[:1] == ["--bench"]:
+        benchmark(int(options.get("--wallets", 1000)))
+    else:
+        print("Usage: python -m manierism.leaderboard --check | --bench [--wallets 1000]")
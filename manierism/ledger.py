@@ -0,0 +1,149 @@
+"""
+Fixed-point ledger
+- Balances as Python ints scaled by 10^18 ("units"); bigints cover the 79,000x balances exactly
+- Integer kernels for the reward, hash power and USD arithmetic of the mining loop
+- Exact conversion to / from the Decimal values the menus and wallet files use, in a context of
+  its own, so a thread left at Python's default 28-digit precision converts the same way
+- Benchmark against the Decimal(prec=200) path: python -m manierism.ledger [ticks]
+"""
+
+import sys
+import time
+import random
+from decimal import Decimal, Context, getcontext, MAX_PREC, MAX_EMAX, MIN_EMIN
+
+SCALE_DIGITS = 18
+SCALE = 10 ** SCALE_DIGITS
+
+# Shifting by 10^18 never rounds in this context, whatever the calling thread's precision
+EXACT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+# Keys held as units inside the mining loop
+LEDGER_KEYS = [
+    "capsule_value_mb", "cache_value_mb", "rig_hash_power", "real_kwh",
+    "bandwidth_MBps", "world_debt_paid_usd", "torrent_value_mb"
+]
+
+USD_RATE_KEYS = ["capsule_value_mb", "cache_value_mb", "real_kwh", "bandwidth_MBps", "torrent_value_mb"]
+
+
+def to_units(value):
+    if isinstance(value, int):
+        return value * SCALE
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.scaleb(SCALE_DIGITS, EXACT))
+
+
+def from_units(units, places=SCALE_DIGITS):
+    """Decimal for a unit count, floored to `places` decimals (exact at the default)."""
+    return Decimal(units // 10 ** (SCALE_DIGITS - places)).scaleb(-places, EXACT)
+
+
+def units_to_str(units):
+    """Digit string of a unit count; unlike str(int) it has no 4300-digit limit."""
+    return str(Decimal(units))
+
+
+def units_from_str(text):
+    return int(Decimal(text))
+
+
+def wallet_units(wallet, keys=LEDGER_KEYS):
+    return {key: to_units(wallet.get(key, 0)) for key in keys}
+
+
+def mul(a, b):
+    """Product of two unit amounts, floored to the ledger resolution."""
+    return a * b // SCALE
+
+
+# --- Kernels ---
+
+def rig_hash_power_units(rig_hash_power, cache_value_mb, quantum=10 ** (SCALE_DIGITS - 6)):
+    """Permanent H/s x (1 + cache MB / 1000), floored to 0.000001 like the Decimal quantize."""
+    effective = rig_hash_power * (SCALE + cache_value_mb // 1000) // SCALE
+    return effective - effective % quantum
+
+
+def total_usd_units(balances, rates):
+    """Sum of balance x rate over the USD-backed resources; rates are unit amounts per key."""
+    total = 0
+    for key, rate in rates.items():
+        total += balances.get(key, 0) * rate
+    return total // SCALE
+
+
+def reward_units(roll, effective_hash_power, base_hash_power, multiplier):
+    """roll x (effective / base) x multiplier with a single floor at the end."""
+    return roll * effective_hash_power * multiplier // (base_hash_power * SCALE)
+
+
+def usd_rate_units(rates):
+    return {key: to_units(rate) for key, rate in rates.items()}
+
+
+# --- Benchmark ---
+
+def _decimal_tick(wallet, roll, bandwidth_roll):
+    base = Decimal("10000")
+    effective = (wallet["rig_hash_power"] * (Decimal("1") + wallet["cache_value_mb"] / Decimal("1000"))).quantize(Decimal("0.000001"))
+    scaling = effective / base
+    reward_mb = Decimal(roll) * scaling * Decimal("79000")
+    reward_kwh = (reward_mb * Decimal("0.85") * Decimal("1.2")) / Decimal("0.5")
+    reward_bandwidth = Decimal(bandwidth_roll) * scaling * Decimal("79000")
+    wallet["rig_hash_power"] += wallet["rig_hash_power"] * Decimal("0.001")
+    wallet["capsule_value_mb"] += reward_mb
+    wallet["real_kwh"] += reward_kwh
+    wallet["bandwidth_MBps"] += reward_bandwidth
+    return (
+        wallet["capsule_value_mb"] * Decimal("5.00") + wallet["cache_value_mb"] * Decimal("0.42") +
+        wallet["real_kwh"] * Decimal("0.17") + wallet["bandwidth_MBps"] * Decimal("0.42")
+    )
+
+
+def _units_tick(units, roll, bandwidth_roll, rates, base, multiplier, overlay, growth):
+    effective = rig_hash_power_units(units["rig_hash_power"], units["cache_value_mb"])
+    reward_mb = reward_units(roll * SCALE, effective, base, multiplier)
+    reward_kwh = mul(reward_mb, overlay)
+    reward_bandwidth = reward_units(bandwidth_roll * SCALE, effective, base, multiplier)
+    units["rig_hash_power"] += mul(units["rig_hash_power"], growth)
+    units["capsule_value_mb"] += reward_mb
+    units["real_kwh"] += reward_kwh
+    units["bandwidth_MBps"] += reward_bandwidth
+    return total_usd_units(units, rates)
+
+
+def benchmark(ticks=50_000, seed=7):
+    getcontext().prec = 200
+    rng = random.Random(seed)
+    rolls = [(rng.randint(1, 15), rng.randint(1, 15)) for _ in range(ticks)]
+    start_values = {
+        "rig_hash_power": Decimal("10000"), "capsule_value_mb": Decimal("0"), "cache_value_mb": Decimal("0"),
+        "real_kwh": Decimal("0"), "bandwidth_MBps": Decimal("0")
+    }
+
+    wallet = dict(start_values)
+    start = time.perf_counter()
+    for roll, bandwidth_roll in rolls:
+        decimal_usd = _decimal_tick(wallet, roll, bandwidth_roll)
+    decimal_elapsed = time.perf_counter() - start
+
+    units = wallet_units(start_values, start_values.keys())
+    rates = usd_rate_units({"capsule_value_mb": "5.00", "cache_value_mb": "0.42", "real_kwh": "0.17", "bandwidth_MBps": "0.42"})
+    base, multiplier = to_units(10000), to_units(79000)
+    overlay, growth = to_units("2.04"), to_units("0.001")
+    start = time.perf_counter()
+    for roll, bandwidth_roll in rolls:
+        units_usd = _units_tick(units, roll, bandwidth_roll, rates, base, multiplier, overlay, growth)
+    units_elapsed = time.perf_counter() - start
+
+    drift = abs(from_units(units_usd) - decimal_usd) / decimal_usd if decimal_usd else Decimal("0")
+    print(f"Decimal(prec=200): {ticks / decimal_elapsed:,.0f} ticks/sec")
+    print(f"Fixed-point units: {ticks / units_elapsed:,.0f} ticks/sec ({decimal_elapsed / units_elapsed:.2f}x)")
+    print(f"Relative USD difference after {ticks:,} ticks: {drift:.3e}")
+    return ticks / decimal_elapsed, ticks / units_elapsed
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
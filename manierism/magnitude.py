@@ -0,0 +1,141 @@
+"""
+Magnitude: mantissa x 10^exponent for values far past float range
+- Cheap mul / div / add with no Decimal context precision involved
+- Converts from int, float, Decimal or log10 and back to a short Decimal when a wallet needs one
+"""
+
+import math
+from decimal import Decimal
+
+
+class Magnitude:
+    __slots__ = ("mantissa", "exponent")
+
+    def __init__(self, mantissa=0.0, exponent=0):
+        mantissa = float(mantissa)
+        if mantissa == 0 or math.isnan(mantissa):
+            self.mantissa, self.exponent = 0.0, 0
+            return
+        shift = math.floor(math.log10(abs(mantissa)))
+        mantissa /= 10.0 ** shift
+        # log10 rounding can leave the mantissa a hair outside [1, 10)
+        if abs(mantissa) >= 10:
+            mantissa, shift = mantissa / 10, shift + 1
+        elif abs(mantissa) < 1:
+            mantissa, shift = mantissa * 10, shift - 1
+        self.mantissa, self.exponent = mantissa, int(exponent) + shift
+
+    @classmethod
+    def of(cls, value):
+        if isinstance(value, Magnitude):
+            return value
+        if isinstance(value, Decimal):
+            if value == 0:
+                return cls()
+            exponent = value.adjusted()
+            return cls(float(value.scaleb(-exponent)), exponent)
+        if isinstance(value, int) and not -10 ** 300 < value < 10 ** 300:
+            digits = str(abs(value))
+            return cls(math.copysign(float(digits[:17]), value), len(digits) - 17)
+        return cls(value, 0)
+
+    @classmethod
+    def from_log10(cls, log_value):
+        if log_value == float("-inf"):
+            return cls()
+        exponent = math.floor(log_value)
+        return cls(10.0 ** (log_value - exponent), exponent)
+
+    def log10(self):
+        if self.mantissa <= 0:
+            return float("-inf")
+        return self.exponent + math.log10(self.mantissa)
+
+    def to_decimal(self):
+        """Short Decimal (17 significant digits) — never a 200-digit expansion."""
+        return Decimal(repr(self.mantissa)).scaleb(self.exponent)
+
+    def __float__(self):
+        if self.exponent > 308:
+            return math.copysign(float("inf"), self.mantissa)
+        if self.exponent < -330:
+            return 0.0
+        return self.mantissa * 10.0 ** self.exponent
+
+    # --- Arithmetic ---
+
+    def __mul__(self, other):
+        other = Magnitude.of(other)
+        return Magnitude(self.mantissa * other.mantissa, self.exponent + other.exponent)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = Magnitude.of(other)
+        return Magnitude(self.mantissa / other.mantissa, self.exponent - other.exponent)
+
+    def __add__(self, other):
+        other = Magnitude.of(other)
+        if self.mantissa == 0:
+            return other
+        if other.mantissa == 0:
+            return self
+        big, small = (self, other) if self.exponent >= other.exponent else (other, self)
+        gap = big.exponent - small.exponent
+        if gap > 17:
+            return big
+        return Magnitude(big.mantissa + small.mantissa * 10.0 ** -gap, big.exponent)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return Magnitude(-self.mantissa, self.exponent)
+
+    def __sub__(self, other):
+        return self + -Magnitude.of(other)
+
+    # --- Comparison ---
+
+    def _key(self):
+        if self.mantissa == 0:
+            return (0, 0, 0.0)
+        sign = 1 if self.mantissa > 0 else -1
+        return (sign, sign * self.exponent, self.mantissa)
+
+    def __eq__(self, other):
+        other = Magnitude.of(other)
+        return self.mantissa == other.mantissa and self.exponent == other.exponent
+
+    def __lt__(self, other):
+        return self._key() < Magnitude.of(other)._key()
+
+    def __le__(self, other):
+        return self == other or self < other
+
+    def __gt__(self, other):
+        return Magnitude.of(other) < self
+
+    def __ge__(self, other):
+        return self == other or self > other
+
+    def __hash__(self):
+        return hash((self.mantissa, self.exponent))
+
+    # --- Formatting ---
+
+    def __format__(self, spec):
+        if -300 < self.exponent < 300:
+            return format(float(self), spec)
+        digits = 6
+        if "." in spec:
+            try:
+                digits = int(spec.split(".")[1].rstrip("eEfFgG%"))
+            except ValueError:
+                pass
+        return f"{self.mantissa:.{digits}f}e{self.exponent:+d}"
+
+    def __str__(self):
+        return format(self, ".6e")
+
+    def __repr__(self):
+        return f"Magnitude({self.mantissa!r}, {self.exponent})"
@@ -0,0 +1,256 @@
+"""
+Vectorized Monte Carlo rig valuation (needs NumPy: pip install numpy)
+- Simulates thousands of independent rigs per mining type as NumPy arrays, in natural-log space
+- Same rules as unified_mining_loop: randint(1, 15) rolls, SHA 1/4 boost, HASH_GROWTH_RATE
+  compounding, cache mining crediting Cache + Capsule MB, torrent capsules paying half the reward
+- randint(5, 150) sleeps give each rig its own runtime, so results are bucketed by rig runtime
+- Reports total USD percentiles per runtime bucket and mining type (kinetic mines like cpu / wifi)
+- --rig picks the rig script (manierism.simulator.load_rig): its RewardPolicy sets the multiplier
+  and the MB rolls (the fixed 12V input included), and its mining types are the default --types
+- Cross-check against the exact integer ledger path: python -m manierism.montecarlo --check
+
+Usage: python -m manierism.montecarlo --rig Minea12voltbattery_andriod.py --rigs 10000 --seed 1
+"""
+
+import sys
+import math
+import json
+import argparse
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from manierism.simulator import (
+    BASE_HASH_POWER, HASH_GROWTH_RATE, OVERLAY_FACTOR, USD_RATES, CUSTOM_REWARDS, TORRENT_CAPSULES,
+    DEFAULT_RIG, NEG_INF, load_rig, to_log, format_log
+)
+
+# Runtime buckets from the README pricing table, in seconds
+RUNTIME_BUCKETS = [
+    ("1 minute", 60), ("30 minutes", 30 * 60), ("60 minutes", 60 * 60),
+    ("12 hours", 12 * 3600), ("24 hours", 24 * 3600)
+]
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+LN10 = math.log(10)
+SHA_INDEX = CUSTOM_REWARDS.index("SHA")
+TORRENT_MASK = [c.lower() in TORRENT_CAPSULES for c in CUSTOM_REWARDS]
+# "E^2*Л" (the E2PI roll bonus) is not in CUSTOM_REWARDS, so the loop can never draw it
+
+
+class _Drawn:
+    """Stands in for the rng of policy.base_roll, handing back a roll drawn beforehand."""
+
+    def __init__(self, roll):
+        self.roll = roll
+
+    def randint(self, low, high):
+        return self.roll
+
+
+def _session_multiplier(policy, wallet_id="MONTE-CARLO"):
+    """The policy's multiplier for a new wallet's first session, which lasts every simulated tick."""
+    wallet = {"wallet_id": wallet_id}
+    policy.prepare(wallet)
+    policy.start_session(wallet)
+    return policy.multiplier(wallet)
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("NumPy is required for the Monte Carlo engine — pip install numpy")
+
+
+class RigBatch:
+    """n independent rigs of one mining type, all quantities as natural logs."""
+
+    KEYS = ["rig_hash_power", "capsule_value_mb", "cache_value_mb", "real_kwh", "bandwidth_MBps", "torrent_value_mb"]
+
+    def __init__(self, n, policy, mining_type="cpu", rng=None, debug_sha_boost=True):
+        _require_numpy()
+        self.n = n
+        self.mining_type = mining_type
+        self.policy = policy
+        self.log_multiplier = to_log(_session_multiplier(policy)) * LN10
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.debug_sha_boost = debug_sha_boost
+        self.state = {key: np.full(n, -np.inf) for key in self.KEYS}
+        self.state["rig_hash_power"][:] = math.log(BASE_HASH_POWER)
+        self.elapsed = np.zeros(n, dtype=np.int64)
+        self.tick_count = 0
+        # ln of the policy's MB roll for each randint(1, 15) draw (all the same on fixed-input rigs)
+        self._ln_rolls = np.array([-np.inf] + [math.log(policy.base_roll(CUSTOM_REWARDS[0], _Drawn(r))) for r in range(1, 16)])
+        self._ln_bandwidth_rolls = np.log(np.arange(16, dtype=np.float64).clip(min=1e-300))
+        self._torrent_mask = np.array(TORRENT_MASK)
+
+    def draw(self):
+        """One tick of draws, in the loop's order: capsule, MB roll, bandwidth roll, sleep."""
+        rng, n = self.rng, self.n
+        return (
+            rng.integers(0, len(CUSTOM_REWARDS), n), rng.integers(1, 16, n),
+            rng.integers(1, 16, n), rng.integers(5, 151, n)
+        )
+
+    def step(self, draws=None):
+        capsule_index, roll, bandwidth_roll, sleep = draws if draws is not None else self.draw()
+        state = self.state
+        if self.debug_sha_boost and self.tick_count == 0 and self.mining_type == "sha":
+            capsule_index = np.full(self.n, SHA_INDEX)
+
+        log_multiplier = self.log_multiplier
+        log_effective = state["rig_hash_power"] + np.logaddexp(0.0, state["cache_value_mb"] - math.log(1000))
+        log_scaling = log_effective - math.log(BASE_HASH_POWER) + log_multiplier
+
+        if self.mining_type == "sha":
+            state["rig_hash_power"] = state["rig_hash_power"] + np.where(capsule_index == SHA_INDEX, math.log(1.25), 0.0)
+
+        log_reward = self._ln_rolls[roll] + log_scaling
+        log_bandwidth = self._ln_bandwidth_rolls[bandwidth_roll] + log_scaling
+
+        state["rig_hash_power"] = state["rig_hash_power"] + math.log1p(HASH_GROWTH_RATE)
+        if self.mining_type == "cache":
+            state["cache_value_mb"] = np.logaddexp(state["cache_value_mb"], log_reward)
+        state["capsule_value_mb"] = np.logaddexp(state["capsule_value_mb"], log_reward)
+        state["real_kwh"] = np.logaddexp(state["real_kwh"], log_reward + math.log(OVERLAY_FACTOR))
+        state["bandwidth_MBps"] = np.logaddexp(state["bandwidth_MBps"], log_bandwidth)
+        torrent = self._torrent_mask[capsule_index]
+        state["torrent_value_mb"] = np.where(
+            torrent, np.logaddexp(state["torrent_value_mb"], log_reward + math.log(0.5)), state["torrent_value_mb"]
+        )
+
+        self.elapsed += sleep
+        self.tick_count += 1
+
+    def total_usd_ln(self):
+        total = np.full(self.n, -np.inf)
+        for key, rate in USD_RATES.items():
+            total = np.logaddexp(total, self.state[key] + math.log(rate))
+        return total
+
+
+def run_monte_carlo(rig_config, rigs=10_000, mining_types=None, seed=None, buckets=RUNTIME_BUCKETS):
+    """Returns {mining_type: {bucket_label: {"p5": log10 USD, ...}}} for load_rig()'s settings."""
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    results = {}
+    for mining_type in mining_types or rig_config["mining_types"]:
+        batch = RigBatch(rigs, rig_config["policy"], mining_type, rng)
+        captured = {}
+        pending = list(buckets)
+        while pending:
+            # A bucket is read off before the first tick that would start at or after its runtime
+            label, seconds = pending[0]
+            done = batch.elapsed >= seconds
+            if label not in captured:
+                captured[label] = np.full(rigs, np.nan)
+            newly = done & np.isnan(captured[label])
+            if newly.any():
+                captured[label][newly] = batch.total_usd_ln()[newly]
+            if done.all():
+                pending.pop(0)
+                continue
+            batch.step()
+        results[mining_type] = {
+            label: {f"p{p}": float(np.percentile(values, p)) / LN10 for p in PERCENTILES}
+            for label, values in captured.items()
+        }
+    return results
+
+
+def print_results(results):
+    for mining_type, table in results.items():
+        print(f"\n=== {mining_type.upper()} mining — Total USD Value percentiles ===")
+        print(f"{'Runtime':<12}" + "".join(f"{'p' + str(p):>16}" for p in PERCENTILES))
+        for label, row in table.items():
+            print(f"{label:<12}" + "".join(f"{'$' + format_log(row['p' + str(p)]):>16}" for p in PERCENTILES))
+
+
+# --- Cross-check against the scalar integer ledger ---
+
+def _ledger_reference(draws, mining_type, policy, debug_sha_boost=True):
+    """Replays one rig's draws with the exact integer kernels used by the rig's LEDGER_MODE tick."""
+    from manierism.ledger import SCALE, to_units, mul, rig_hash_power_units, reward_units, total_usd_units, usd_rate_units
+    multiplier = to_units(_session_multiplier(policy))
+    units = {key: 0 for key in RigBatch.KEYS}
+    units["rig_hash_power"] = to_units(BASE_HASH_POWER)
+    base, growth = to_units(BASE_HASH_POWER), to_units(str(HASH_GROWTH_RATE))
+    overlay = to_units("2.04")
+    for tick, (capsule_index, roll, bandwidth_roll) in enumerate(draws):
+        capsule_type = CUSTOM_REWARDS[capsule_index]
+        if debug_sha_boost and tick == 0 and mining_type == "sha":
+            capsule_type = "SHA"
+        effective = rig_hash_power_units(units["rig_hash_power"], units["cache_value_mb"])
+        if mining_type == "sha" and capsule_type == "SHA":
+            units["rig_hash_power"] += units["rig_hash_power"] // 4
+        reward = reward_units(to_units(policy.base_roll(capsule_type, _Drawn(roll))), effective, base, multiplier)
+        bandwidth = reward_units(bandwidth_roll * SCALE, effective, base, multiplier)
+        units["rig_hash_power"] += mul(units["rig_hash_power"], growth)
+        if mining_type == "cache":
+            units["cache_value_mb"] += reward
+        units["capsule_value_mb"] += reward
+        units["real_kwh"] += mul(reward, overlay)
+        units["bandwidth_MBps"] += bandwidth
+        if capsule_type.lower() in TORRENT_CAPSULES:
+            units["torrent_value_mb"] += reward // 2
+    return units, total_usd_units(units, usd_rate_units({k: str(v) for k, v in USD_RATES.items()}))
+
+
+def _log10_units(units):
+    # math.log10 accepts arbitrarily large ints
+    return math.log10(units) - 18 if units > 0 else NEG_INF
+
+
+def cross_check(rig_config, rigs=16, ticks=60, seed=11, mining_types=None, rel_tol=1e-9):
+    """Vector engine vs the scalar integer ledger on identical draws; returns True when every rig matches."""
+    _require_numpy()
+    ok = True
+    policy = rig_config["policy"]
+    for mining_type in mining_types or rig_config["mining_types"]:
+        batch = RigBatch(rigs, policy, mining_type, np.random.default_rng(seed))
+        history = []
+        for _ in range(ticks):
+            draws = batch.draw()
+            history.append(draws)
+            batch.step(draws)
+        usd = batch.total_usd_ln() / LN10
+        worst = 0.0
+        for rig in range(rigs):
+            rig_draws = [(int(c[rig]), int(r[rig]), int(b[rig])) for c, r, b, _ in history]
+            units, usd_units = _ledger_reference(rig_draws, mining_type, policy)
+            for key in RigBatch.KEYS:
+                worst = max(worst, abs(batch.state[key][rig] / LN10 - _log10_units(units[key])) if units[key] else 0.0)
+            worst = max(worst, abs(usd[rig] - _log10_units(usd_units)))
+        # log10 difference d means a relative error of about d * ln(10)
+        matched = worst * LN10 <= rel_tol
+        ok = ok and matched
+        print(f"{'✅' if matched else '❌'} {mining_type:<8} {rigs} rigs x {ticks} ticks — max relative error {worst * LN10:.2e}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vectorized Monte Carlo rig valuation")
+    parser.add_argument("--rigs", type=int, default=10_000)
+    parser.add_argument("--rig", default=DEFAULT_RIG, help="rig script whose reward rules to use (default: run.py)")
+    parser.add_argument("--types", default=None, help="comma-separated mining types (default: the rig's)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", default=None, help="write the percentile table (log10 USD) to this path")
+    parser.add_argument("--check", action="store_true", help="cross-check against the scalar ledger rules and exit")
+    args = parser.parse_args(argv)
+
+    rig_config = load_rig(args.rig)
+    mining_types = args.types.split(",") if args.types else None
+    if args.check:
+        sys.exit(0 if cross_check(rig_config, mining_types=mining_types) else 1)
+
+    results = run_monte_carlo(rig_config, args.rigs, mining_types, args.seed)
+    print_results(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,255 @@
+"""
+SHA-256d nonce search for the rig's VH_BTC capsules
+- Pre-image: sha256(BLOCK_HEADER) hex + TEЛ² + E²Л (constant for every rig), then the capsule
+  header and hash power of the job, then the nonce as 8 little-endian bytes; the hash is
+  sha256(sha256(pre-image)), compared big-endian against the target
+- The constant prefix is hashed once into a midstate and each job's prefix once per batch;
+  a nonce costs one hashlib copy(), a 8-byte update and the second sha256, nothing is formatted
+- Nonces are searched in batches on a long-lived process pool (inline with processes=1), a
+  batch per worker in flight plus one queued, until a hash under the target turns up, the
+  nonce budget runs out or the time budget is spent
+- NonceResult.hash_rate is the measured H/s of the search; rig.POW_MINING feeds it to the
+  cpu / sha mining ticks as their effective hash power
+- python -m manierism.noncesearch --check | --bench [--seconds 2] [--processes N]
+"""
+
+import os
+import sys
+import math
+import time
+import hashlib
+import threading
+from collections import deque
+from decimal import Decimal
+
+from manierism.policies import E2PI_VALUE
+
+TEPI2_VALUE = Decimal(str(1 * 9e16 * (math.pi**2)))
+TEPI2 = f"TEЛ²_CONST_{TEPI2_VALUE:.2e}"
+E2PI = f"E²Л_CONST_{E2PI_VALUE:.2e}"
+BLOCK_HEADER = "MM_BLOCK_HEADER_2025"
+SHA_BLOCK = hashlib.sha256(BLOCK_HEADER.encode()).hexdigest()
+CONSTANT_PREFIX = f"{SHA_BLOCK}{TEPI2}{E2PI}".encode()
+MIDSTATE = hashlib.sha256(CONSTANT_PREFIX)
+
+BATCH_SIZE = 20_000
+DEFAULT_TARGET_BITS = 20
+MAX_TARGET = 2 ** 256 - 1
+
+
+def target_from_bits(zero_bits):
+    """Target for a hash with at least zero_bits leading zero bits."""
+    return MAX_TARGET >> zero_bits
+
+
+def job_prefix(capsule_header, amp_capsule):
+    """Job-specific bytes that follow CONSTANT_PREFIX in the pre-image."""
+    return f"{capsule_header}{amp_capsule}".encode()
+
+
+def sha256d(job, nonce):
+    """Straight SHA-256d of one nonce, without the midstate; the reference for the search."""
+    pre_image = CONSTANT_PREFIX + job + nonce.to_bytes(8, "little")
+    return hashlib.sha256(hashlib.sha256(pre_image).digest()).digest()
+
+
+# --- Worker side ---
+
+_job_midstates = {}
+
+
+def _job_midstate(job):
+    midstate = _job_midstates.get(job)
+    if midstate is None:
+        if len(_job_midstates) >= 64:
+            _job_midstates.clear()
+        midstate = MIDSTATE.copy()
+        midstate.update(job)
+        _job_midstates[job] = midstate
+    return midstate
+
+
+def search_batch(args):
+    """(job, start_nonce, count, target bytes) -> (nonce, digest, hashes, seconds): the first nonce
+    under the target, or the batch's lowest hash when none is"""
+    job, start, count, target = args
+    copy = _job_midstate(job).copy
+    sha256 = hashlib.sha256
+    best_nonce, best = None, b"\xff" * 32
+    started = time.perf_counter()
+    for nonce in range(start, start + count):
+        h = copy()
+        h.update(nonce.to_bytes(8, "little"))
+        digest = sha256(h.digest()).digest()
+        if digest < best:
+            best_nonce, best = nonce, digest
+            if digest < target:
+                return nonce, digest, nonce - start + 1, time.perf_counter() - started
+    return best_nonce, best, count, time.perf_counter() - started
+
+
+# --- Search ---
+
+class NonceResult:
+    def __init__(self, nonce, digest, best_nonce, hashes, seconds, processes):
+        self.nonce = nonce
+        self.digest = digest
+        self.best_nonce = best_nonce
+        self.hashes = hashes
+        self.seconds = seconds
+        self.processes = processes
+
+    @property
+    def found(self):
+        return self.nonce is not None
+
+    @property
+    def hash_hex(self):
+        return self.digest.hex()
+
+    @property
+    def hash_rate(self):
+        return self.hashes / self.seconds if self.seconds > 0 else 0.0
+
+
+class NonceSearch:
+    def __init__(self, processes=None, batch_size=BATCH_SIZE):
+        self.processes = processes or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self):
+        with self._lock:
+            if self._pool is None and self.processes > 1:
+                # multiprocessing is only imported once a search needs workers, not at rig startup
+                from multiprocessing import Pool
+                self._pool = Pool(self.processes)
+            return self._pool
+
+    def search(self, job, target_bits=DEFAULT_TARGET_BITS, seconds=None, max_nonces=None, start_nonce=0, target=None):
+        """
+        Searches nonces from start_nonce for a SHA-256d under the target (target_bits leading
+        zero bits, or an explicit int target); stops at the first hit, after max_nonces or after
+        `seconds`. The hit is always the lowest matching nonce of the searched range.
+        """
+        target = (target_from_bits(target_bits) if target is None else target).to_bytes(32, "big")
+        end = start_nonce + max_nonces if max_nonces is not None else None
+        deadline = time.perf_counter() + seconds if seconds is not None else None
+        pool = self.pool
+        window = 2 * self.processes if pool is not None else 1
+
+        def batches():
+            nonce = start_nonce
+            while end is None or nonce < end:
+                count = self.batch_size if end is None else min(self.batch_size, end - nonce)
+                yield (job, nonce, count, target)
+                nonce += count
+
+        started = time.perf_counter()
+        pending, jobs = deque(), batches()
+        hashes, hit, best_nonce, best = 0, None, None, b"\xff" * 32
+        while True:
+            while len(pending) < window and hit is None and (deadline is None or time.perf_counter() < deadline):
+                batch = next(jobs, None)
+                if batch is None:
+                    break
+                pending.append(pool.apply_async(search_batch, (batch,)) if pool is not None else batch)
+            if not pending:
+                break
+            done = pending.popleft()
+            nonce, digest, batch_hashes, _ = done.get() if pool is not None else search_batch(done)
+            hashes += batch_hashes
+            # Batches come back in nonce order, so the first hit is the lowest one
+            if digest < target and hit is None:
+                hit = (nonce, digest)
+            if digest < best:
+                best_nonce, best = nonce, digest
+        elapsed = time.perf_counter() - started
+        if hit is not None:
+            return NonceResult(hit[0], hit[1], hit[0], hashes, elapsed, self.processes)
+        return NonceResult(None, best, best_nonce, hashes, elapsed, self.processes)
+
+    def measure_hash_rate(self, seconds=1.0, job=b"hash_rate_probe"):
+        """Measured H/s: a search with an impossible target for `seconds`."""
+        return self.search(job, seconds=seconds, target=0).hash_rate
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+
+
+# --- Self-check and benchmark ---
+
+def legacy_vh_btc_hash(capsule_header, amp_capsule, nonce):
+    # The rig's old per-call path: sha256(BLOCK_HEADER) again and an f-string pre-image every hash
+    sha_block = hashlib.sha256(BLOCK_HEADER.encode()).hexdigest()
+    pre_image = f"{capsule_header}{sha_block}{amp_capsule}{TEPI2}{E2PI}{nonce}"
+    return hashlib.sha256(hashlib.sha256(pre_image.encode()).digest()).hexdigest()
+
+
+def self_check(processes=2):
+    ok = True
+
+    def check(label, passed):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    job = job_prefix("SHA", "10000.000000")
+    nonce, digest, _, _ = search_batch((job, 0, 5000, target_from_bits(8).to_bytes(32, "big")))
+    check("Midstate hash matches a straight SHA-256d of the full pre-image", digest == sha256d(job, nonce))
+    lowest = next(n for n in range(5000) if int.from_bytes(sha256d(job, n), "big") <= target_from_bits(8))
+    check(f"Batch returns the lowest nonce under an 8-bit target ({nonce})", nonce == lowest)
+
+    inline = NonceSearch(processes=1, batch_size=2000).search(job, target_bits=14)
+    pooled = NonceSearch(processes=processes, batch_size=2000)
+    try:
+        parallel = pooled.search(job, target_bits=14)
+        check(f"{processes} processes find the same nonce as one ({inline.nonce})", inline.found and parallel.nonce == inline.nonce)
+        check("Found hash has 14 leading zero bits", int.from_bytes(parallel.digest, "big") <= target_from_bits(14))
+        budget = pooled.search(job, max_nonces=10_000, target=0)
+        check("Nonce budget is searched exactly once", not budget.found and budget.hashes == 10_000)
+        timed = pooled.search(job, seconds=0.3, target=0)
+        check(f"Time budget respected ({timed.seconds * 1000:.0f} ms for 300 ms)", timed.seconds < 0.3 + 1.0 and timed.hashes > 0)
+    finally:
+        pooled.close()
+    return ok
+
+
+def benchmark(seconds=2.0, processes=None):
+    job = job_prefix("SHA", "10000.000000")
+    count, started = 0, time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        for nonce in range(count, count + 1000):
+            legacy_vh_btc_hash("SHA", "10000.000000", nonce)
+        count += 1000
+    legacy_rate = count / (time.perf_counter() - started)
+    print(f"🐢 Per-call f-string pre-image:  {legacy_rate:,.0f} H/s")
+
+    inline_rate = NonceSearch(processes=1).measure_hash_rate(seconds, job)
+    print(f"⛏️ Midstate, 1 process:          {inline_rate:,.0f} H/s ({inline_rate / legacy_rate:.2f}x)")
+    search = NonceSearch(processes=processes)
+    if search.processes > 1:
+        try:
+            search.measure_hash_rate(0.2, job)
+            pooled_rate = search.measure_hash_rate(seconds, job)
+            print(f"⛏️ Midstate, {search.processes} processes:        {pooled_rate:,.0f} H/s ({pooled_rate / legacy_rate:.2f}x)")
+        finally:
+            search.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = dict(zip(args[1::2], args[2::2]))
+    processes = int(options["--processes"]) if "--processes" in options else None
+    if args[:1] == ["--check"]:
+        sys.exit(0 if self_check(processes or 2) else 1)
+    elif args[:1] == ["--bench"]:
+        benchmark(float(options.get("--seconds", 2.0)), processes)
+    else:
+        print("Usage: python -m manierism.noncesearch --check | --bench [--seconds 2] [--processes N]")
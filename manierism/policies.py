@@ -0,0 +1,149 @@
+"""
+Reward policies and rig currencies
+- A rig script picks one RewardPolicy and one Currency and hands them to manierism.rig.configure
+- HalvingPolicy: the flat 79,000x pre-game halving multiplier over 75 years (run.py, Minea12, Free_flowing)
+- EpochDecayPolicy: the 1000-year schedule, 10^78 per block decaying by 0.8 every 50-year
+  epoch (vodka, uv, the Windows and jsonbin rigs, the EGP rigs); as on those rigs, the epoch is
+  worked out from blocks_mined (a Decimal) when a mining session starts and kept for the session
+- Both take the capsule roll options:
+  - eginma_multiplier scales E^2*Л capsules (10^9, or 10^12 on sun_egp)
+  - fixed_mb_input replaces the 1-15 MB roll of every other capsule (the 12V battery rig's 12 MB)
+- Currency: USD, or EGP at a fixed exchange rate applied to every USD resource rate
+"""
+
+import math
+import time
+import random
+from decimal import Decimal
+
+E2PI_VALUE = Decimal(str((9e16)**2 * math.pi))
+E2PI_CAPSULE = "E^2*Л"
+
+EGINMA_MULTIPLIER = Decimal("1000000000")
+FIXED_12V_MB_INPUT = Decimal("12")
+
+
+class RewardPolicy:
+    total_years = 75
+    # Cache MB donations are amplified by the original pre-game multiplier on every rig
+    donation_multiplier = Decimal("79000")
+
+    def __init__(self, eginma_multiplier=None, fixed_mb_input=None):
+        self.eginma_multiplier = eginma_multiplier
+        self.fixed_mb_input = fixed_mb_input
+
+    def prepare(self, wallet):
+        """Adds the wallet fields the policy keeps between ticks; True if the wallet changed."""
+        return False
+
+    def start_session(self, wallet):
+        """Called with the wallet before the first tick of each mining session."""
+
+    def base_roll(self, capsule_type, rng=random):
+        """MB roll for one capsule, before the hash power scaling and the multiplier; rng is a seeded
+        random.Random when manierism.simulator replays the rules."""
+        if capsule_type == E2PI_CAPSULE:
+            roll = Decimal(rng.randint(1, 15)) * (E2PI_VALUE / Decimal(1e30))
+            if self.eginma_multiplier is not None:
+                roll *= self.eginma_multiplier
+            return roll
+        if self.fixed_mb_input is not None:
+            return self.fixed_mb_input
+        return Decimal(rng.randint(1, 15))
+
+    def multiplier(self, wallet):
+        """Reward multiplier for the wallet's next block."""
+        raise NotImplementedError
+
+    def after_tick(self, wallet):
+        pass
+
+    def tick_notes(self, wallet, capsule_type):
+        """Extra lines for the verbose capsule report."""
+        notes = []
+        if capsule_type == E2PI_CAPSULE and self.eginma_multiplier is not None:
+            notes.append(f"⚡ ENHANCED REWARD RATE: Eginma Multiplier (10^{self.eginma_multiplier.adjusted()}) APPLIED!")
+        elif capsule_type != E2PI_CAPSULE and self.fixed_mb_input is not None:
+            notes.append(f"🔋 FIXED 12V INPUT: Using {self.fixed_mb_input} as base capsule MB for Igma overlay.")
+        return notes
+
+
+class HalvingPolicy(RewardPolicy):
+    def __init__(self, halving_multiplier=Decimal("79000"), total_years=75, **roll_options):
+        super().__init__(**roll_options)
+        self.halving_multiplier = halving_multiplier
+        self.total_years = total_years
+
+    def multiplier(self, wallet):
+        return self.halving_multiplier
+
+
+class EpochDecayPolicy(RewardPolicy):
+    def __init__(self, initial_block_reward=Decimal("1e78"), decay_rate=Decimal("0.8"), epoch_years=50,
+                 total_years=1000, blocks_per_year=Decimal(365.25 * 24 * 4), **roll_options):
+        super().__init__(**roll_options)
+        self.initial_block_reward = initial_block_reward
+        self.decay_rate = decay_rate
+        self.epoch_years = epoch_years
+        self.total_years = total_years
+        self.blocks_per_epoch = blocks_per_year * epoch_years
+        self.epochs = total_years // epoch_years
+        self._session_epochs = {}  # wallet_id -> epoch fixed at the start of its mining session
+
+    def prepare(self, wallet):
+        if "blocks_mined" in wallet:
+            return False
+        wallet["blocks_mined"] = Decimal("0")
+        wallet["last_block_time"] = time.time()
+        return True
+
+    def start_session(self, wallet):
+        self._session_epochs[wallet["wallet_id"]] = self.epoch_of_blocks(wallet.get("blocks_mined", 0))
+
+    def epoch_of_blocks(self, blocks_mined):
+        return math.floor(float(blocks_mined) / float(self.blocks_per_epoch))
+
+    def epoch(self, wallet):
+        """The session's epoch once start_session ran, else the one blocks_mined is in now."""
+        epoch = self._session_epochs.get(wallet.get("wallet_id"))
+        if epoch is not None:
+            return epoch
+        return self.epoch_of_blocks(wallet.get("blocks_mined", 0))
+
+    def multiplier(self, wallet):
+        epoch = self.epoch(wallet)
+        if epoch >= self.epochs:
+            return Decimal("0")  # the schedule ends after total_years
+        return self.initial_block_reward * (self.decay_rate ** epoch)
+
+    def after_tick(self, wallet):
+        wallet["blocks_mined"] = Decimal(str(wallet.get("blocks_mined", 0))) + 1
+        wallet["last_block_time"] = time.time()
+
+    def tick_notes(self, wallet, capsule_type):
+        epoch = self.epoch(wallet)
+        notes = [f"⚡ {self.total_years}-YR REWARD EPOCH: {epoch + 1} of {self.epochs} (Decay Rate: {self.decay_rate})"]
+        return notes + super().tick_notes(wallet, capsule_type)
+
+
+class Currency:
+    def __init__(self, code="USD", usd_rate=Decimal("1"), symbol=None):
+        self.code = code
+        self.usd_rate = usd_rate
+        self.symbol = symbol
+        self.value_key = f"{code.lower()}_value"
+        self.debt_paid_key = f"world_debt_paid_{code.lower()}"
+
+    def convert(self, usd_amount, quantum=Decimal("0.000001")):
+        """A USD amount in this currency; USD amounts pass through untouched."""
+        if self.usd_rate == 1:
+            return usd_amount
+        return (usd_amount * self.usd_rate).quantize(quantum)
+
+    def label(self, text):
+        """'$1.00' for USD, '1.00 EGP' for currencies without a symbol."""
+        return f"{self.symbol}{text}" if self.symbol else f"{text} {self.code}"
+
+
+USD = Currency("USD", symbol="$")
+EGP = Currency("EGP", Decimal("30.90"))
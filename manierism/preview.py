@@ -0,0 +1,337 @@
+"""
+Caching reverse proxy for the internet terminal's page preview
+- The preview route streams the remote page into the preview template as it downloads instead
+  of buffering r.text first
+- Fetched pages stay in memory (LRU, `max_bytes` in total; pages over `max_page_bytes` are
+  streamed but not kept); a refresh revalidates them with If-None-Match / If-Modified-Since and
+  a 304 from the origin is served from memory
+- Pages without an ETag / Last-Modified are reused for their Cache-Control max-age, or `ttl`
+  seconds; no-store pages are never kept; if the origin is unreachable a kept copy is served
+- The browser gets the origin's ETag, so its own conditional requests end in a 304 here
+- Thread-safe: the preview Flask app runs threaded, so several viewers are served at once
+- Self-check against a local origin server: python -m manierism.preview --check
+"""
+
+import re
+import sys
+import time
+import codecs
+import threading
+from collections import OrderedDict
+
+MB = 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+PREVIEW_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="UTF-8"><title>Local Page Preview</title></head>
+<body>"""
+PREVIEW_TAIL = """</body>
+</html>
+"""
+
+
+def preview_html(content):
+    return PREVIEW_HEAD + content + PREVIEW_TAIL
+
+
+class CachedPage:
+    def __init__(self, url, body, size, etag, last_modified, expires_at):
+        self.url = url
+        self.body = body
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+
+def _freshness(headers, ttl):
+    """(cacheable, seconds the page may be served without asking the origin)"""
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-store" in cache_control:
+        return False, 0
+    if "no-cache" in cache_control:
+        return True, 0
+    max_age = re.search(r"max-age=(\d+)", cache_control)
+    if max_age:
+        return True, int(max_age.group(1))
+    if headers.get("ETag") or headers.get("Last-Modified"):
+        return True, 0
+    return True, ttl
+
+
+class PagePreview:
+    def __init__(self, client, max_bytes=32 * MB, max_page_bytes=8 * MB, ttl=15.0):
+        """client: the terminal's SearchClient, so previews share its pooled session and timeout."""
+        self.client = client
+        self.current_url = None
+        self.max_bytes = max_bytes
+        self.max_page_bytes = max_page_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.fetched = 0
+        self.bytes_downloaded = 0
+        self._pages = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+    # --- Memory cache ---
+
+    def _get(self, url):
+        with self._lock:
+            page = self._pages.get(url)
+            if page is not None:
+                self._pages.move_to_end(url)
+            return page
+
+    def _put(self, page):
+        with self._lock:
+            old = self._pages.pop(page.url, None)
+            if old is not None:
+                self._cached_bytes -= old.size
+            self._pages[page.url] = page
+            self._cached_bytes += page.size
+            while self._cached_bytes > self.max_bytes and len(self._pages) > 1:
+                _, evicted = self._pages.popitem(last=False)
+                self._cached_bytes -= evicted.size
+
+    def _drop(self, url):
+        with self._lock:
+            old = self._pages.pop(url, None)
+            if old is not None:
+                self._cached_bytes -= old.size
+
+    # --- Preview route ---
+
+    def response(self, url, request_headers=None):
+        """Flask Response for the preview of url (request_headers: the browser's, for its 304s)."""
+        from flask import Response
+
+        page = self._get(url)
+        if page is not None and time.time() < page.expires_at:
+            self.hits += 1
+            return self._serve_cached(page, request_headers)
+
+        conditional = {}
+        if page is not None and page.etag:
+            conditional["If-None-Match"] = page.etag
+        if page is not None and page.last_modified:
+            conditional["If-Modified-Since"] = page.last_modified
+        try:
+            upstream = self.client.session.get(url, headers=conditional, timeout=self.client.timeout, stream=True)
+        except Exception as e:
+            if page is not None:
+                return self._serve_cached(page, request_headers)
+            return Response(preview_html(f"<p>Could not fetch URL: {e}</p>"), mimetype="text/html")
+
+        if upstream.status_code == 304 and page is not None:
+            upstream.close()
+            _, fresh_for = _freshness(upstream.headers, self.ttl)
+            page.expires_at = time.time() + fresh_for
+            page.etag = upstream.headers.get("ETag", page.etag)
+            self.revalidated += 1
+            return self._serve_cached(page, request_headers)
+
+        self.fetched += 1
+        headers = {}
+        if upstream.headers.get("ETag"):
+            headers["ETag"] = upstream.headers["ETag"]
+        if upstream.headers.get("Last-Modified"):
+            headers["Last-Modified"] = upstream.headers["Last-Modified"]
+        return Response(self._stream(url, upstream), mimetype="text/html", headers=headers)
+
+    def _serve_cached(self, page, request_headers):
+        from flask import Response
+        headers = {}
+        if page.etag:
+            headers["ETag"] = page.etag
+            if request_headers is not None and request_headers.get("If-None-Match") == page.etag:
+                return Response(status=304, headers=headers)
+        if page.last_modified:
+            headers["Last-Modified"] = page.last_modified
+        return Response(preview_html(page.body), mimetype="text/html", headers=headers)
+
+    def _stream(self, url, upstream):
+        try:
+            decoder = codecs.getincrementaldecoder(upstream.encoding or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        cacheable, fresh_for = _freshness(upstream.headers, self.ttl)
+        cacheable = cacheable and upstream.status_code == 200
+        parts, size = [], 0
+        try:
+            yield PREVIEW_HEAD
+            for chunk in upstream.iter_content(STREAM_CHUNK_SIZE):
+                size += len(chunk)
+                text = decoder.decode(chunk)
+                if cacheable:
+                    parts.append(text)
+                    if size > self.max_page_bytes:
+                        cacheable, parts = False, []
+                yield text
+            text = decoder.decode(b"", final=True)
+            parts.append(text)
+            with self._lock:
+                self.bytes_downloaded += size
+            if cacheable:
+                self._put(CachedPage(url, "".join(parts), size, upstream.headers.get("ETag"),
+                                     upstream.headers.get("Last-Modified"), time.time() + fresh_for))
+            else:
+                self._drop(url)
+            yield text + PREVIEW_TAIL
+        finally:
+            upstream.close()
+
+    def stats(self):
+        with self._lock:
+            return {"pages": len(self._pages), "cached_bytes": self._cached_bytes, "hits": self.hits,
+                    "revalidated": self.revalidated, "fetched": self.fetched, "bytes_downloaded": self.bytes_downloaded}
+
+
+def create_preview_app(preview):
+    """The terminal's Flask preview app, showing preview.current_url (the URL last entered)."""
+    from flask import Flask, Response, request
+    app = Flask(__name__)
+
+    @app.route('/')
+    def render_page():
+        url = preview.current_url
+        if not url:
+            return Response(preview_html("<p>No URL selected. Enter a URL in the terminal search.</p>"), mimetype="text/html")
+        return preview.response(url, request.headers)
+
+    return app
+
+
+def run_preview_app(app, host='0.0.0.0', port=5000):
+    # threaded: a slow page no longer blocks other viewers or a refresh
+    app.run(host=host, port=port, debug=False, use_reloader=False, threaded=True)
+
+
+# --- Local origin self-check ---
+
+def start_origin_server(slow_chunks=10, slow_delay=0.1):
+    """Local origin: /etag (ETag + 304s), /plain (max-age=60, no validators), /slow (drip-fed), /big."""
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    stats = {"full": {}, "not_modified": 0}
+    etag = '"v1"'
+
+    class OriginHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _body(self, body, headers):
+            stats["full"][self.path] = stats["full"].get(self.path, 0) + 1
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/etag":
+                if self.headers.get("If-None-Match") == etag:
+                    stats["not_modified"] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self._body(b"<h1>ETag page</h1>", {"ETag": etag})
+            elif self.path == "/plain":
+                self._body(b"<h1>Plain page</h1>", {"Cache-Control": "max-age=60"})
+            elif self.path == "/big":
+                self._body(b"<p>" + b"x" * (2 * MB) + b"</p>", {"ETag": '"big"'})
+            elif self.path == "/slow":
+                stats["full"]["/slow"] = stats["full"].get("/slow", 0) + 1
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(slow_chunks * 1024))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                for _ in range(slow_chunks):
+                    self.wfile.write(b"y" * 1024)
+                    self.wfile.flush()
+                    time.sleep(slow_delay)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OriginHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}", stats
+
+
+def self_check():
+    import logging
+    import requests
+    from werkzeug.serving import make_server
+    from manierism.search import SearchClient
+
+    origin, origin_url, origin_stats = start_origin_server()
+    preview = PagePreview(SearchClient(), max_page_bytes=MB)
+    app = create_preview_app(preview)
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    preview_url = f"http://127.0.0.1:{server.server_port}/"
+    ok = True
+
+    def check(label, passed):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    def view(path, headers=None):
+        preview.current_url = origin_url + path
+        return requests.get(preview_url, headers=headers, timeout=10)
+
+    first = view("/etag")
+    check("First view streams the page inside the preview template", first.status_code == 200 and "<h1>ETag page</h1></body>" in first.text)
+    second = view("/etag")
+    check("Refresh revalidated with If-None-Match, origin sent 304, body served from memory",
+          second.text == first.text and origin_stats["full"]["/etag"] == 1 and origin_stats["not_modified"] == 1)
+    check("Browser's own If-None-Match answered with 304", view("/etag", {"If-None-Match": '"v1"'}).status_code == 304)
+
+    view("/plain")
+    view("/plain")
+    check("max-age page served from memory without asking the origin", origin_stats["full"]["/plain"] == 1)
+
+    view("/big")
+    view("/big")
+    check("Page over max_page_bytes streamed but not kept", origin_stats["full"]["/big"] == 2)
+
+    preview.current_url = origin_url + "/slow"
+    start = time.perf_counter()
+    with requests.get(preview_url, stream=True, timeout=10) as r:
+        chunks = r.iter_content(1024)
+        next(chunks)
+        first_byte = time.perf_counter() - start
+        for _ in chunks:
+            pass
+    single = time.perf_counter() - start
+    check(f"Slow page streamed: first bytes after {first_byte * 1000:.0f} ms of {single * 1000:.0f} ms", first_byte < single / 2)
+
+    threads = [threading.Thread(target=lambda: requests.get(preview_url, timeout=10)) for _ in range(4)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    together = time.perf_counter() - start
+    check(f"4 concurrent viewers of the slow page in {together * 1000:.0f} ms (one viewer: {single * 1000:.0f} ms)", together < single * 2)
+
+    origin.shutdown()
+    origin.server_close()
+    check("Origin down: the kept copy is still served", view("/etag").text == first.text)
+    server.shutdown()
+    print(f"📊 {preview.stats()}")
+    return ok
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        sys.exit(0 if self_check() else 1)
+    print("Usage: python -m manierism.preview --check")
@@ -0,0 +1,2305 @@
+"""
+Shared rig runtime
+- Wallet store, mining loop, supervisor, menus, blackjack, exports and the internet terminal
+  for every rig script; a script is a reward policy plus an entry point:
+
+      from manierism import rig
+      from manierism.policies import HalvingPolicy
+      rig.configure(HalvingPolicy())
+      from manierism.rig import *
+
+      if __name__ == "__main__":
+          rig.main()
+
+- configure() opens the wallet store, emission log / store, registry and device cache scanner
+  for the rig's folder; the module-level switches below (LEDGER_MODE, WALLET_STORE_ENGINE, ...)
+  can be changed on the module before calling it; feature rigs (Watts Token ads, trading cards,
+  XMR) add their wallet fields, menu entries and a between-ticks hook through configure()'s hooks
+- Flask, requests, bs4 and webbrowser are only imported when the internet terminal opens, and
+  RPi.GPIO on the first electricity emission (manierism.gpio); startup is tracked by
+  python -m manierism.startup
+"""
+
+import os, sys, time, json, random, uuid, hashlib, threading, atexit
+from decimal import Decimal, getcontext, DefaultContext
+import math
+
+from manierism.wallet_store import open_wallet_store
+from manierism.wallet_registry import open_wallet_registry
+from manierism.magnitude import Magnitude
+from manierism.formatting import make_large_number_formatter
+from manierism.ledger import SCALE, to_units, from_units, wallet_units, mul, rig_hash_power_units, total_usd_units, reward_units, usd_rate_units, USD_RATE_KEYS
+from manierism.emission_log import get_emission_log
+from manierism.emission_store import open_emission_store
+from manierism.device_cache import DeviceCacheScanner
+from manierism.gpio import rpi_gpio, actuator_scheduler, actuator_stats, format_actuator_stats
+from manierism.supervisor import MiningSupervisor
+from manierism.search import SearchClient, BING_SEARCH_URL, CACHE_NAME as SEARCH_CACHE_NAME, parse_batch_lines
+from manierism.preview import PagePreview, create_preview_app, run_preview_app
+from manierism.transfers import TransferEngine, TransferError, read_payroll
+from manierism.valuation import ValuationCache
+from manierism.leaderboard import Leaderboard, LeaderboardServer
+from manierism.noncesearch import NonceSearch, job_prefix, TEPI2_VALUE, TEPI2, E2PI, BLOCK_HEADER, SHA_BLOCK
+from manierism.policies import E2PI_VALUE, USD
+
+# Decimal contexts are per thread: DefaultContext is what supervisor workers, the emission writer
+# and the leaderboard server start from, so it has to carry the precision before any of them start
+DefaultContext.prec = 200
+getcontext().prec = 200
+
+ANDROID_BASEDIR = "/storage/emulated/0/Download/manierismmegabytes"
+USER_DOWNLOADS_BASEDIR = os.path.join(os.path.expanduser("~"), "Downloads", "manierismmegabytes")
+
+# SQLite index of the emission log with hourly / daily rollups; set to False to keep only the JSON log
+EMISSION_STORE_ENABLED = True
+
+# Reward, hash power and USD arithmetic on 10^18-scaled ints; wallet files also keep the exact values
+LEDGER_MODE = True
+
+# "resident" keeps wallets in memory and checkpoints in batches; "json" rewrites the file on every save
+WALLET_STORE_ENGINE = "resident"
+
+# SQLite index of wallet_id / rig_id / node_id for the menus; set to False to scan the rigs folder instead
+WALLET_REGISTRY_ENABLED = True
+
+# Internet terminal searches; point SEARCH_URL at a local stub server to test without Bing
+SEARCH_URL = BING_SEARCH_URL
+SEARCH_CACHE_TTL = 3600
+# Requests in flight at once for batch searches (terminal "batch FILE" or --search-batch)
+SEARCH_CONCURRENCY = 8
+SEARCH_CLIENT = None
+PAGE_PREVIEW = None
+
+# Real SHA-256d proof-of-work (manierism.noncesearch) for POW_MINING_TYPES: every tick searches nonces
+# for POW_SECONDS and the measured H/s is the tick's effective hash power; off by default
+POW_MINING = False
+POW_MINING_TYPES = ("cpu", "sha")
+POW_SECONDS = 1.0
+POW_TARGET_BITS = 20
+POW_PROCESSES = None
+NONCE_SEARCH = None
+
+# Mining loops / supervisors running in this process; background upkeep waits for rig_idle()
+_MINING_LOCK = threading.Lock()
+_MINING_SESSIONS = 0
+
+# Top rigs and network totals (manierism.leaderboard), kept up to date by save_wallet; main menu
+# option 10 shows them and can serve them as JSON on LEADERBOARD_HOST:LEADERBOARD_PORT
+LEADERBOARD_SIZE = 10
+LEADERBOARD_HOST = "127.0.0.1"
+LEADERBOARD_PORT = 8790
+LEADERBOARD_SERVER = None
+
+DONATION_WALLET_ID = "WM-CPH0O7J3"
+WORLD_DEBT_WALLET_ID = "WD-P4Y29G7B"
+WORLD_DEBT_NODE_ID = "9efae649-eb1f-4ef0-ac97-ed4df6d2942f"
+INITIAL_WORLD_DEBT_USD = Decimal("31300000000000.00")
+WORLD_DEBT_DATE = "October 4th, 2025"
+DEBT_NODE_PASSIVE_USD_VALUE = Decimal("0.0001")
+
+BASE_HASH_POWER = Decimal("10000")
+HASH_GROWTH_RATE = Decimal("0.001")
+
+MB_USD_RATE = Decimal("5.00")
+CACHE_USD_RATE = Decimal("0.42")
+KWH_USD_RATE = Decimal("0.17")
+BANDWIDTH_USD_RATE = Decimal("0.42")
+TORRENT_USD_RATE = MB_USD_RATE
+USD_RATES = dict(zip(USD_RATE_KEYS, [MB_USD_RATE, CACHE_USD_RATE, KWH_USD_RATE, BANDWIDTH_USD_RATE, TORRENT_USD_RATE]))
+
+LEDGER_BASE_HASH_POWER = to_units(BASE_HASH_POWER)
+LEDGER_HASH_GROWTH_RATE = to_units(HASH_GROWTH_RATE)
+LEDGER_OVERLAY_FACTOR = to_units(Decimal("0.85") * Decimal("1.2") / Decimal("0.5"))
+
+DEBUG_SHA_BOOST = True
+
+# .jsonbin exports are NUL-padded to whole ~0.03 KB blocks
+JSONBIN_BLOCK_BYTES = 31
+
+DEFAULT_EXPORT_FORMATS = ["json", "txt", "torrent", "capsule"]
+
+SIMULATION_MESSAGES = {
+    "default": (
+        "🌀 Simulated coil spin at {:.2f}%",
+        "🔥 Simulated resistor heat for {:.2f} seconds",
+        "⚡ Simulated capacitor discharge"
+    ),
+    # POTATO POWER SIMULATION LOGIC: Safe for phone
+    "right_atom": (
+        "🌀 Simulated Right Atom Coil Spin (Potato Power) at {:.2f}%",
+        "🔥 Simulated Right Atom Resistor Heat for {:.2f} seconds",
+        "⚡ Simulated Right Atom Capacitor Discharge"
+    )
+}
+
+# --- Rig Configuration ---
+
+def configure(policy, currency=USD, basedir=ANDROID_BASEDIR, scale_exponent=42, primary_mining=("CPU", "cpu"),
+              simulation="default", export_formats=DEFAULT_EXPORT_FORMATS, sha_capsule_export=False,
+              plant_name=None, device_cache_root="/storage/emulated/0/", watts_token=False, wallet_fields=None,
+              wallet_actions=(), menu_actions=(), dashboard_lines=None, export_resources=(), mining_hook=None,
+              on_wallet_created=None, tick_seconds=(5, 150)):
+    """
+    Sets up the rig folder, stores and reward rules; call once, before anything else in this module.
+    The rest are the hooks feature rigs build on:
+    - watts_token: the Watts Token ad payouts (watts_token / btc_address fields, cash-out actions)
+    - wallet_fields: {key: default} every wallet carries on top of the resources (Decimal defaults load as Decimal)
+    - wallet_actions / menu_actions: [(label, action)] appended to the wallet menu (action(wallet)) / main menu (action())
+    - dashboard_lines: wallet -> [lines] shown under the balances; export_resources: extra wallet keys to export
+    - mining_hook: (wallet, ticks) after every tick of an interactive mining loop (not the supervisor),
+      outside the wallet lock; returning False stops mining
+    - on_wallet_created: wallet -> None after the main menu creates a rig; tick_seconds: (min, max) pause between ticks
+    """
+    global POLICY, CURRENCY, BASEDIR, TARGETDIR, EMISSION_LOG, EMISSION_STORE, DEVICE_CACHE_ROOT, DEVICE_CACHE_SCANNER
+    global WALLET_STORE, WALLET_REGISTRY, RESOURCE_RATES, MB_RATE, LEDGER_RATES, INITIAL_WORLD_DEBT, DEBT_NODE_PASSIVE_VALUE
+    global MINING_LABEL, MINING_TYPES, SIMULATION, EXPORT_FORMATS, SHA_CAPSULE_EXPORT, PLANT_NAME, format_large_number
+    global TRANSFERS, VALUATION, LEADERBOARD
+    global WATTS_TOKEN, WALLET_FIELDS, WALLET_ACTIONS, MENU_ACTIONS, DASHBOARD_LINES, EXPORT_RESOURCES, MINING_HOOK
+    global ON_WALLET_CREATED, TICK_SECONDS
+    POLICY = policy
+    CURRENCY = currency
+
+    BASEDIR = basedir
+    TARGETDIR = os.path.join(BASEDIR, "rigs")
+    os.makedirs(TARGETDIR, exist_ok=True)
+
+    # Emission lines are queued and appended in batches by a background writer thread
+    EMISSION_LOG = get_emission_log(TARGETDIR)
+    EMISSION_STORE = open_emission_store(TARGETDIR) if EMISSION_STORE_ENABLED else None
+    if EMISSION_STORE:
+        EMISSION_LOG.add_sink(EMISSION_STORE.append_batch)
+
+    # Device cache size comes from a directory-mtime index; its scanner starts on the first dashboard view
+    DEVICE_CACHE_ROOT = device_cache_root
+    DEVICE_CACHE_SCANNER = None
+
+    WALLET_STORE = open_wallet_store(TARGETDIR, WALLET_STORE_ENGINE, exact_ledger=LEDGER_MODE)
+    atexit.register(WALLET_STORE.close)
+    WALLET_REGISTRY = open_wallet_registry(TARGETDIR) if WALLET_REGISTRY_ENABLED else None
+
+    # Resource rates and world debt figures in the rig currency
+    RESOURCE_RATES = {key: currency.convert(rate) for key, rate in USD_RATES.items()}
+    MB_RATE = RESOURCE_RATES["capsule_value_mb"]
+    LEDGER_RATES = usd_rate_units(RESOURCE_RATES)
+    INITIAL_WORLD_DEBT = currency.convert(INITIAL_WORLD_DEBT_USD, Decimal("0"))
+    DEBT_NODE_PASSIVE_VALUE = currency.convert(DEBT_NODE_PASSIVE_USD_VALUE)
+    # Wallet values and the all-wallet totals are kept up to date by save_wallet
+    VALUATION = ValuationCache(RESOURCE_RATES, exact=LEDGER_MODE, sum_keys=[currency.debt_paid_key])
+    LEADERBOARD = Leaderboard({
+        "rig_hash_power": lambda wallet: wallet.get("rig_hash_power", BASE_HASH_POWER),
+        "total_value": calculate_total_value,
+        currency.debt_paid_key: lambda wallet: wallet.get(currency.debt_paid_key, Decimal("0")),
+        "capsule_value_mb": lambda wallet: wallet.get("capsule_value_mb", Decimal("0")),
+    }, size=LEADERBOARD_SIZE, exclude=[DONATION_WALLET_ID, WORLD_DEBT_WALLET_ID])
+    if WALLET_STORE.engine == "resident":
+        # Wallets saved by another process on this folder reach the totals when this one picks them up
+        WALLET_STORE.on_outside_write = _track_wallet
+
+    MINING_LABEL = primary_mining[0]
+    MINING_TYPES = rig_mining_types(primary_mining)
+    SIMULATION = SIMULATION_MESSAGES[simulation]
+    EXPORT_FORMATS = list(export_formats)
+    SHA_CAPSULE_EXPORT = sha_capsule_export
+    PLANT_NAME = plant_name
+
+    # Feature rigs: extra wallet fields, menu entries and mining hooks on top of the shared runtime
+    WATTS_TOKEN = watts_token
+    WALLET_FIELDS = dict(WATTS_TOKEN_FIELDS) if watts_token else {}
+    WALLET_FIELDS.update(wallet_fields or {})
+    WALLET_ACTIONS = (WATTS_TOKEN_ACTIONS if watts_token else []) + list(wallet_actions)
+    MENU_ACTIONS = list(menu_actions)
+    DASHBOARD_LINES = dashboard_lines
+    EXPORT_RESOURCES = (["watts_token"] if watts_token else []) + list(export_resources)
+    MINING_HOOK = mining_hook
+    ON_WALLET_CREATED = on_wallet_created
+    TICK_SECONDS = tick_seconds
+
+    # Named scales up to the rig's top name (10^scale_exponent), scientific notation beyond
+    format_large_number = make_large_number_formatter(scale_exponent)
+
+    # Sends, donations and debt payments lock their wallets and go through transfers.journal;
+    # a second process on the same folder (write-through fallback) runs without the journal
+    fallback_store = WALLET_STORE_ENGINE == "resident" and WALLET_STORE.engine == "json"
+    TRANSFERS = TransferEngine(WALLET_STORE, TARGETDIR, load=load_wallet, save=save_wallet,
+                               lock_last=[DONATION_WALLET_ID, WORLD_DEBT_WALLET_ID], journal=not fallback_store)
+    atexit.register(TRANSFERS.close)
+
+
+def rig_mining_types(primary_mining):
+    """The rig's primary mining type (cpu, kinetic, UV, ...), then wifi, sha and cache."""
+    return [primary_mining[1], "wifi", "sha", "cache"]
+
+def overlay_formula(MB, entropy=Decimal("0.85"), resonance=Decimal("1.2"), resistance=Decimal("0.5")):
+    return (MB * entropy * resonance) / resistance
+
+# On the Pi the emitters run on the actuator scheduler thread (manierism.gpio): these only queue
+# the command, so a huge kWh reward never holds up the mining loop
+
+def spin_coil(speed_percent):
+    scheduler = actuator_scheduler()
+    if scheduler:
+        scheduler.submit(speed_percent=speed_percent)
+    else:
+        print(SIMULATION[0].format(speed_percent))
+
+def heat_resistor(duration):
+    scheduler = actuator_scheduler()
+    if scheduler:
+        scheduler.submit(heat_seconds=duration)
+    else:
+        print(SIMULATION[1].format(duration))
+
+def discharge_capacitor():
+    scheduler = actuator_scheduler()
+    if scheduler:
+        scheduler.submit(discharge=True)
+    else:
+        print(SIMULATION[2])
+
+def emit_real_electricity(kWh, verbose=True):
+    scheduler = actuator_scheduler()
+    if scheduler:
+        scheduler.emit(kWh)
+        return
+    if not verbose:
+        return  # off the Pi there is nothing to drive; the emission log is the record
+    spin_coil(float(kWh) * 100)
+    heat_resistor(float(kWh))
+    discharge_capacitor()
+
+def log_real_emission(wallet_id, MB, kWh, overlay):
+    entry = {
+        "wallet_id": wallet_id,
+        "timestamp": time.time(),
+        "capsule_MB": float(MB),
+        "capsule_kWh": float(kWh),
+        "overlay": overlay,
+        "simulated": rpi_gpio() is None
+    }
+    EMISSION_LOG.write(entry)
+
+# --- Blackjack Mini-Game Constants & Utilities ---
+
+CARD_SYMBOLS = {
+    'Spades': '♠', 'Hearts': '♥', 'Diamonds': '♦', 'Clubs': '♣'
+}
+CARD_RANKS = {
+    '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
+    'T': 10, 'J': 10, 'Q': 10, 'K': 10, 'A': 11
+}
+
+# CORRECTED CURRENCIES MAPPING based on wallet keys
+CURRENCIES = {
+    # Key displayed to user: (Display Name, Wallet Key)
+    '1': ('Torrents Payloads (MB)', 'torrent_value_mb'),
+    '2': ('Capsule Megabytes', 'capsule_value_mb'),
+    '3': ('Kilowatts (kWh)', 'real_kwh'),
+    '4': ('Cache Megabytes', 'cache_value_mb'),
+    '5': ('Bandwidth MB/s', 'bandwidth_MBps'),
+}
+
+def create_deck():
+    """Creates a standard 52-card deck."""
+    deck = []
+    suits = list(CARD_SYMBOLS.keys())
+    ranks = list(CARD_RANKS.keys())
+    for suit in suits:
+        for rank in ranks:
+            deck.append((rank, suit))
+    random.shuffle(deck)
+    return deck
+
+def get_hand_value(hand):
+    """Calculates the total value of a hand, accounting for Aces."""
+    value = sum(CARD_RANKS[card[0]] for card in hand)
+    num_aces = sum(1 for card in hand if card[0] == 'A')
+    
+    # Adjust Aces from 11 to 1 if the total is over 21
+    while value > 21 and num_aces > 0:
+        value -= 10
+        num_aces -= 1
+    return value
+
+def get_card_art(card, face_down=False):
+    """Generates ASCII art for a card."""
+    rank, suit_name = card
+    suit_symbol = CARD_SYMBOLS.get(suit_name, ' ')
+    
+    if face_down:
+        lines = [
+            "┌───────┐",
+            "│░░░░░░░│",
+            "│░░░░░░░│",
+            "│░░░░░░░│",
+            "│░░░░░░░│",
+            "│░░░░░░░│",
+            "└───────┘"
+        ]
+    else:
+        lines = [
+            "┌───────┐",
+            f"│ {rank:<2}    │",
+            "│       │",
+            f"│   {suit_symbol}   │",
+            "│       │",
+            f"│    {rank:>2} │",
+            "└───────┘"
+        ]
+    return lines
+
+def display_hands(player_hand, dealer_hand, hide_dealer_card=True):
+    """Prints the player and dealer hands side-by-side in the terminal."""
+    
+    # Configure which of the dealer's cards to display
+    dealer_display = []
+    if hide_dealer_card:
+        # Hide the dealer's second card
+        dealer_cards = [dealer_hand[0], ('?', 'Down')] + dealer_hand[2:]
+    else:
+        dealer_cards = dealer_hand
+
+    # Get card art for both hands
+    player_art = [get_card_art(c, False) for c in player_hand]
+    dealer_art = [get_card_art(c, c[0] == '?') for c in dealer_cards]
+
+    print("\n" + "="*50)
+    
+    # Print Dealer Hand
+    print("DEALER'S HAND:")
+    # Transpose the card art lines to print them horizontally
+    for i in range(len(dealer_art[0])):
+        line = "    ".join(card[i] for card in dealer_art)
+        print(line)
+    
+    if not hide_dealer_card:
+        print(f"Value: {get_hand_value(dealer_hand)}")
+        
+    print("\n" + "-"*50)
+    
+    # Print Player Hand
+    print("YOUR HAND:")
+    for i in range(len(player_art[0])):
+        line = "    ".join(card[i] for card in player_art)
+        print(line)
+    print(f"Value: {get_hand_value(player_hand)}")
+    print("="*50)
+
+
+def _adjust_bet_balance(wallet_id, currency_key, delta):
+    """Adds delta to a fresh copy of the wallet under its lock; None if the balance can't cover it."""
+    with TRANSFERS.locked(wallet_id):
+        wallet = load_wallet(wallet_id)
+        if wallet is None or wallet.get(currency_key, Decimal("0")) + delta < 0:
+            return None
+        wallet[currency_key] = wallet.get(currency_key, Decimal("0")) + delta
+        save_wallet(wallet)
+        return wallet
+
+def blackjack_game(wallet):
+    
+    # Load the latest wallet data
+    wallet = load_wallet(wallet['wallet_id'])
+    
+    print(f"\n⚡ Blackjack - Choose Your Betting Currency ⚡")
+    print("1. Torrents Payloads (MB)")
+    print("2. Capsule Megabytes")
+    print("3. Kilowatts (real_kwh)")
+    print("4. Cache Megabytes")
+    print("5. Bandwidth MB/s")
+    
+    # --- 1. Get Currency Choice ---
+    while True:
+        choice = input("Enter choice (1-5): ").strip()
+        if choice in CURRENCIES:
+            currency_name, currency_key = CURRENCIES[choice]
+            break
+        else:
+            print("Invalid choice. Please enter 1, 2, 3, 4, or 5.")
+            
+    current_balance = wallet.get(currency_key, Decimal("0"))
+    
+    if current_balance <= 0:
+        print(f"❌ You have no {currency_name} to bet! Go mining to earn some.")
+        return
+
+    print(f"Current Balance in {currency_name}: {format_large_number(current_balance)}")
+
+    # --- 2. Get Bet ---
+    while True:
+        bet_input = input(f"Enter your bet in {currency_name}: ").strip()
+        try:
+            bet = Decimal(bet_input)
+            if bet <= 0:
+                print("Bet must be a positive number.")
+            elif bet > current_balance:
+                print(f"You can't bet more than your current balance of {format_large_number(current_balance)}.")
+            else:
+                break
+        except:
+            print("Invalid input. Please enter a number.")
+
+    # Deduct the bet and save the wallet (Bet is removed immediately upon starting the hand)
+    staked = _adjust_bet_balance(wallet['wallet_id'], currency_key, -bet)
+    if staked is None:
+        print(f"❌ Your {currency_name} balance changed and no longer covers the bet.")
+        return
+    wallet = staked
+    print(f"Bet placed: {format_large_number(bet)} {currency_name}. New balance: {format_large_number(wallet[currency_key])} {currency_name}.")
+
+    # --- 3. Setup Game ---
+    deck = create_deck()
+    player_hand = [deck.pop(), deck.pop()]
+    dealer_hand = [deck.pop(), deck.pop()]
+
+    # Check for immediate Blackjacks
+    player_blackjack = get_hand_value(player_hand) == 21
+    
+    # --- 4. Player's Turn ---
+    player_busted = False
+    if not player_blackjack:
+        
+        while True:
+            display_hands(player_hand, dealer_hand, hide_dealer_card=True)
+            p_value = get_hand_value(player_hand)
+            
+            # Options available: Hit, Stand, Double Down (only on first move)
+            has_enough_for_double = bet <= wallet.get(currency_key, Decimal("0"))
+            
+            if len(player_hand) == 2 and has_enough_for_double:
+                 action = input("Action (H)it, (S)tand, (D)ouble Down: ").strip().lower()
+            else:
+                 action = input("Action (H)it or (S)tand: ").strip().lower()
+
+            if action == 'h':
+                player_hand.append(deck.pop())
+                p_value = get_hand_value(player_hand)
+                if p_value > 21:
+                    player_busted = True
+                    display_hands(player_hand, dealer_hand, hide_dealer_card=True)
+                    print("BUST! You went over 21. Funds were already deducted.")
+                    break
+            elif action == 's':
+                break
+            elif action == 'd' and len(player_hand) == 2 and has_enough_for_double:
+                # Double Down logic: double bet, deduct second bet, take one card, then stand
+                doubled = _adjust_bet_balance(wallet['wallet_id'], currency_key, -bet) # Deduct the second bet amount
+                if doubled is None:
+                    print(f"❌ Your {currency_name} balance changed and no longer covers a double down.")
+                    continue
+                wallet = doubled
+                bet *= 2 # Total bet is now doubled
+                print(f"Double Down! New total bet: {format_large_number(bet)} {currency_name}.")
+                player_hand.append(deck.pop())
+                p_value = get_hand_value(player_hand)
+                if p_value > 21:
+                    player_busted = True
+                    display_hands(player_hand, dealer_hand, hide_dealer_card=True)
+                    print("BUST on Double Down! Funds were already deducted.")
+                break
+            else:
+                print("Invalid action.")
+    
+    # --- 5. Dealer's Turn (only if player didn't bust) ---
+    d_value = get_hand_value(dealer_hand)
+    dealer_blackjack = d_value == 21 and len(dealer_hand) == 2
+    d_busted = False
+    
+    if not player_busted and not (player_blackjack and dealer_blackjack):
+        
+        print("\n--- Dealer's Turn ---")
+        display_hands(player_hand, dealer_hand, hide_dealer_card=False) # Show both dealer cards
+        
+        # Dealer must hit on soft 17 or less
+        while d_value < 17:
+            print("Dealer hits...")
+            time.sleep(1) # Pause for terminal display effect
+            dealer_hand.append(deck.pop())
+            d_value = get_hand_value(dealer_hand)
+            display_hands(player_hand, dealer_hand, hide_dealer_card=False)
+            
+        if d_value > 21:
+            print("DEALER BUSTS!")
+            d_busted = True
+        else:
+            print("Dealer stands.")
+            
+    # --- 6. Determine Winner and Payout ---
+    print("\n=== Game Result ===")
+    display_hands(player_hand, dealer_hand, hide_dealer_card=False)
+    
+    p_value = get_hand_value(player_hand)
+    d_value = get_hand_value(dealer_hand)
+    
+    payout = Decimal("0") # This will be the total amount returned (Bet + Winnings)
+    
+    if player_busted:
+        # Player Busted: Bet was already deducted. Total return is 0.
+        print(f"You lose {format_large_number(bet)} {currency_name}.")
+    elif player_blackjack and not dealer_blackjack:
+        # Player Blackjack: 1.5x profit (reward) + 1x bet returned = 2.5x total return
+        payout = bet * Decimal("2.5")
+        print(f"👑 BLACKJACK! You win 1.5 times your bet! Total return (Bet + Reward): {format_large_number(payout)} {currency_name}.")
+    elif d_busted:
+        # Dealer busts: 1x profit (reward) + 1x bet returned = 2x total return
+        payout = bet * Decimal("2")
+        print(f"🎉 Dealer Busts! You win 1 time your bet! Total return (Bet + Reward): {format_large_number(payout)} {currency_name}.")
+    elif p_value > d_value:
+        # Regular win: 1x profit (reward) + 1x bet returned = 2x total return
+        payout = bet * Decimal("2")
+        print(f"✅ You Win! Your {p_value} beats the dealer's {d_value}. Total return (Bet + Reward): {format_large_number(payout)} {currency_name}.")
+    elif p_value == d_value:
+        # Push: bet is returned (1x total return)
+        payout = bet
+        print(f"🤝 Push. It's a tie, your bet of {format_large_number(payout)} {currency_name} is returned.")
+    else:
+        # Loss: Total return is 0.
+        print(f"❌ You Lose. Dealer's {d_value} beats your {p_value}.")
+
+    # Add total return (payout) to the wallet
+    if payout > 0:
+        wallet = _adjust_bet_balance(wallet['wallet_id'], currency_key, payout) or wallet
+    print(f"Final Balance in {currency_name}: {format_large_number(wallet[currency_key])}")
+
+
+# --- VH_BTC Hash Function ---
+
+def vh_btc_hash_function(capsule_header, amp_capsule):
+    # sha256(BLOCK_HEADER) is computed once, as manierism.noncesearch.SHA_BLOCK
+    pre_image = f"{capsule_header}{SHA_BLOCK}{amp_capsule}{TEPI2}{E2PI}"
+    final_hash = hashlib.sha256(pre_image.encode()).hexdigest()
+    return final_hash
+
+def _nonce_search():
+    # One process pool per process, reused by every proof-of-work tick
+    global NONCE_SEARCH
+    if NONCE_SEARCH is None:
+        NONCE_SEARCH = NonceSearch(POW_PROCESSES)
+        atexit.register(NONCE_SEARCH.close)
+    return NONCE_SEARCH
+
+def proof_of_work(capsule_type, hash_power):
+    """SHA-256d nonce search for one capsule, POW_SECONDS long or until a hash under the target."""
+    return _nonce_search().search(job_prefix(capsule_type, hash_power), POW_TARGET_BITS, seconds=POW_SECONDS)
+
+# --- Hash Power Calculation ---
+
+def calculate_rig_hash_power(wallet):
+    # Fast-forwarded projections (manierism.fastforward) carry Magnitude values
+    if isinstance(wallet.get("rig_hash_power"), Magnitude):
+        return wallet["rig_hash_power"] * (1 + Magnitude.of(wallet.get("cache_value_mb", Decimal("0"))) / 1000)
+    if LEDGER_MODE:
+        return from_units(rig_hash_power_units(
+            to_units(wallet.get("rig_hash_power", BASE_HASH_POWER)), to_units(wallet.get("cache_value_mb", Decimal("0")))
+        ), 6)
+    permanent_hash_power = wallet.get("rig_hash_power", BASE_HASH_POWER)
+    resource_bonus = wallet.get("cache_value_mb", Decimal("0")) / Decimal("1000")
+    effective_hash_power = permanent_hash_power * (Decimal("1") + resource_bonus)
+    return effective_hash_power.quantize(Decimal("0.000001"))
+
+# --- Node Utility ---
+
+def generate_node_id():
+    return str(uuid.uuid4())
+
+# --- Wallet Utilities ---
+
+def save_wallet(wallet):
+    # The resident store hands back a merge when another process saved this wallet in the meantime
+    _track_wallet(WALLET_STORE.save(wallet) or wallet)
+
+def _track_wallet(wallet):
+    VALUATION.track(wallet)
+    LEADERBOARD.track(wallet)
+    if WALLET_REGISTRY is not None:
+        WALLET_REGISTRY.track(wallet)
+
+def _ensure_wallet_has_node(data):
+    if data.get('wallet_id') == WORLD_DEBT_WALLET_ID:
+        if data.get("node_id") != WORLD_DEBT_NODE_ID:
+            data["node_id"] = WORLD_DEBT_NODE_ID
+    elif "node_id" not in data or not data["node_id"]:
+        data["node_id"] = generate_node_id()
+    return data
+
+def load_wallet(wallet_id):
+    data = WALLET_STORE.load(wallet_id)
+    if data is None:
+        return None
+
+    debt_key = CURRENCY.debt_paid_key  
+    if debt_key not in data:  
+        # Wallets first mined on a USD rig carry their contributions over at the rig's rate
+        legacy_usd = data.pop("world_debt_paid_usd", None) if debt_key != "world_debt_paid_usd" else None  
+        data[debt_key] = CURRENCY.convert(Decimal(str(legacy_usd))) if legacy_usd is not None else Decimal("0")  
+    _add_wallet_fields(data)  
+
+    data["sha_boost_active"] = False  
+    original_node_id = data.get("node_id")  
+    data = _ensure_wallet_has_node(data)  
+
+    if data.get('wallet_id') == WORLD_DEBT_WALLET_ID and data.get("node_id") == WORLD_DEBT_NODE_ID and original_node_id != WORLD_DEBT_NODE_ID:  
+        save_wallet(data)  
+
+    return data
+
+def _add_wallet_fields(data):
+    # The rig's extra fields; wallets from before the rig had them start at the defaults
+    for key, default in WALLET_FIELDS.items():
+        if key not in data:
+            data[key] = default
+        elif isinstance(default, Decimal) and not isinstance(data[key], Decimal):
+            data[key] = Decimal(str(data[key]))
+    return data
+
+def create_wallet(wallet_id, rig_id=None):
+    existing = load_wallet(wallet_id)
+    if existing:
+        return existing
+
+    if wallet_id in [DONATION_WALLET_ID, WORLD_DEBT_WALLET_ID]:  
+        display_id = rig_id if rig_id else wallet_id 
+        print(f"🛑 Error: Wallet ID '{display_id}' is reserved for special system purposes and cannot be created here.")  
+        return None  
+
+    wallet = _new_wallet(wallet_id, rig_id)  
+    save_wallet(wallet)  
+    return wallet
+
+def _new_wallet(wallet_id, rig_id=None):
+    node_id = generate_node_id()  
+    return _add_wallet_fields({  
+        "wallet_id": wallet_id,  
+        "rig_id": rig_id or wallet_id,  
+        "capsule_value_mb": Decimal("0"),  
+        "cache_value_mb": Decimal("0"),  
+        "rig_hash_power": BASE_HASH_POWER,  
+        "real_kwh": Decimal("0"),  
+        "bandwidth_MBps": Decimal("0"),  
+        "torrent_value_mb": Decimal("0"),  
+        "node_id": node_id,  
+        CURRENCY.debt_paid_key: Decimal("0"),  
+    })
+
+# --- Special Wallet Initialization ---
+
+def _initialize_special_wallets():
+    if not load_wallet(DONATION_WALLET_ID):
+        print(f"🛠️ Initializing Donation Wallet: {DONATION_WALLET_ID}")
+        wallet = {
+            "wallet_id": DONATION_WALLET_ID,
+            "rig_id": "donations",
+            "capsule_value_mb": Decimal("0"),
+            "cache_value_mb": Decimal("0"),
+            "rig_hash_power": BASE_HASH_POWER,
+            "real_kwh": Decimal("0"),
+            "bandwidth_MBps": Decimal("0"),
+            "torrent_value_mb": Decimal("0"),
+            "node_id": generate_node_id(),
+            CURRENCY.debt_paid_key: Decimal("0"),
+        }
+        save_wallet(_add_wallet_fields(wallet))
+
+    if not load_wallet(WORLD_DEBT_WALLET_ID):  
+        print(f"🛠️ Initializing World Debt Wallet: {WORLD_DEBT_WALLET_ID}")  
+        wallet = {  
+            "wallet_id": WORLD_DEBT_WALLET_ID,  
+            "rig_id": "world debt fund",  
+            "capsule_value_mb": Decimal("0"),  
+            "cache_value_mb": Decimal("0"),  
+            "rig_hash_power": BASE_HASH_POWER,  
+            "real_kwh": Decimal("0"),  
+            "bandwidth_MBps": Decimal("0"),  
+            "torrent_value_mb": Decimal("0"),  
+            "node_id": WORLD_DEBT_NODE_ID,  
+            CURRENCY.debt_paid_key: Decimal("0"),  
+        }  
+        save_wallet(_add_wallet_fields(wallet))
+
+# --- World Debt Node Passive Value Generation ---
+
+def world_debt_node_value_generation():
+    # Supervised rigs and debt payments all credit the debt node, so its read-modify-write holds its wallet lock
+    with TRANSFERS.locked(WORLD_DEBT_WALLET_ID):
+        debt_wallet = load_wallet(WORLD_DEBT_WALLET_ID)
+        if not debt_wallet or debt_wallet.get('node_id') != WORLD_DEBT_NODE_ID:
+            return
+        mb_generated = DEBT_NODE_PASSIVE_VALUE / MB_RATE
+        debt_wallet['capsule_value_mb'] += mb_generated
+        save_wallet(debt_wallet)
+
+# --- Currency Value Calculation ---
+
+def calculate_total_value(wallet):
+    """Watts-backed value of a wallet in the rig currency (USD, EGP, ...)."""
+    return VALUATION.value(wallet)
+
+def recompute_total_value(wallet):
+    """calculate_total_value from scratch, without the valuation cache."""
+    if LEDGER_MODE:
+        return from_units(total_usd_units(wallet_units(wallet, USD_RATE_KEYS), LEDGER_RATES))
+    return sum((wallet.get(key, Decimal("0")) * rate for key, rate in RESOURCE_RATES.items()), Decimal("0"))
+
+def _valuation_seeded():
+    # Wallets nobody saved yet this session are read once; after that every total moves with save_wallet
+    if not VALUATION.seeded:
+        VALUATION.seed(WALLET_STORE.wallet_ids(), load_wallet)
+    return VALUATION
+
+def all_wallets_value():
+    """Watts-backed value of every wallet on this rig folder together (O(1) once seeded)."""
+    return _valuation_seeded().grand_total()
+
+def all_wallets_debt_paid():
+    """World debt paid by every wallet on this rig folder together (O(1) once seeded)."""
+    return _valuation_seeded().key_total(CURRENCY.debt_paid_key)
+
+def check_valuation():
+    """Recomputes every wallet's value and the all-wallet totals from disk; prints and returns the drift."""
+    _valuation_seeded()
+    drift = VALUATION.check(_get_all_wallets(), recompute_total_value)
+    for name, cached, actual in drift:
+        print(f"❌ Valuation drift {name}: cached {cached}, recomputed {actual}")
+    stats = VALUATION.stats()
+    print(f"{'✅' if not drift else '⚠️'} Valuation checked: {stats['wallets']} wallets, {len(drift)} drifted "
+          f"({stats['hits']} cache hits, {stats['recomputed_terms']} terms recomputed)")
+    return drift
+
+# --- Capsule Types ---
+
+CUSTOM_REWARDS = [
+    "Formula_Power", "Y7K DOLLAR", "bricks dollar", "2piE", "TE", "TE2pi", "Manierism", "Handrichism", "teЛ²", "E²Л",
+    "RAM", "SDRAM", "SHA", "Nuclear", "Onshore",
+    "Gigabyte", "Terabyte", "Petabyte", "PIB", "Electrism",
+    "Pirate", "Torrent", "Bootleg", "Seeder", "Swarm"
+]
+
+# --- Torrent File Generator ---
+
+def generate_torrent_file(wallet, capsule_type, reward_mb, verbose=True):
+    torrent_data = {
+        "capsule_type": capsule_type,
+        "wallet_id": wallet["wallet_id"],
+        "node_id": wallet.get("node_id", "N/A"),
+        "reward_mb": float(reward_mb),
+        "timestamp": time.time(),
+        "overlay_constants": {
+            "TEЛ²": TEPI2,
+            "E²Л": E2PI,
+            "block_header": BLOCK_HEADER
+        }
+    }
+    filename = f"{wallet['wallet_id']}_{capsule_type}_capsule.torrent"
+    path = os.path.join(BASEDIR, filename)
+    with open(path, "w") as f:
+        json.dump(torrent_data, f, indent=4)
+    if verbose:
+        print(f"🧲 Torrent file created: {filename}")
+
+# --- Mining Tick Arithmetic ---
+
+TORRENT_CAPSULES = ["pirate", "torrent", "bootleg", "seeder", "swarm"]
+
+def _decimal_mining_tick(wallet, mining_type, capsule_type, multiplier, measured_hash_power=None):
+    effective_hash_power = calculate_rig_hash_power(wallet) if measured_hash_power is None else measured_hash_power
+    sha_boost_amount_added = Decimal("0")
+
+    # --- SHA Boost Logic ---
+    if mining_type == "sha" and capsule_type == "SHA":
+        sha_boost_amount_added = wallet["rig_hash_power"] / Decimal("4")
+        wallet["rig_hash_power"] += sha_boost_amount_added
+
+    # --- Reward Calculation ---
+    scaling_factor = effective_hash_power / BASE_HASH_POWER
+
+    base_mb_reward_roll = POLICY.base_roll(capsule_type)
+
+    reward_mb = base_mb_reward_roll * scaling_factor * multiplier
+    reward_kwh = overlay_formula(reward_mb)
+    base_bandwidth_roll = Decimal(random.randint(1, 15))
+    reward_bandwidth = base_bandwidth_roll * scaling_factor * multiplier
+
+    reward_hash_gain = wallet["rig_hash_power"] * HASH_GROWTH_RATE
+
+    # --- Resource Allocation ---
+    if mining_type == "cache":
+        wallet["cache_value_mb"] += reward_mb
+    wallet["capsule_value_mb"] += reward_mb
+    wallet["rig_hash_power"] += reward_hash_gain
+    wallet["real_kwh"] += reward_kwh
+    wallet["bandwidth_MBps"] += reward_bandwidth
+
+    torrent_mb = Decimal("0")
+    if capsule_type.lower() in TORRENT_CAPSULES:
+        torrent_mb = reward_mb / Decimal("2")
+        wallet["torrent_value_mb"] = wallet.get("torrent_value_mb", Decimal("0")) + torrent_mb
+
+    return effective_hash_power, sha_boost_amount_added, reward_mb, reward_kwh, reward_bandwidth, reward_hash_gain, torrent_mb
+
+def _ledger_mining_tick(wallet, mining_type, capsule_type, multiplier, measured_hash_power=None):
+    # Same rules as _decimal_mining_tick, on 10^18-scaled ints
+    units = wallet_units(wallet)
+    if measured_hash_power is None:
+        effective_units = rig_hash_power_units(units["rig_hash_power"], units["cache_value_mb"])
+    else:
+        effective_units = to_units(measured_hash_power)
+
+    sha_boost_units = 0
+    if mining_type == "sha" and capsule_type == "SHA":
+        sha_boost_units = units["rig_hash_power"] // 4
+        units["rig_hash_power"] += sha_boost_units
+
+    roll_units = to_units(POLICY.base_roll(capsule_type))
+    multiplier_units = to_units(multiplier)
+
+    reward_mb_units = reward_units(roll_units, effective_units, LEDGER_BASE_HASH_POWER, multiplier_units)
+    reward_kwh_units = mul(reward_mb_units, LEDGER_OVERLAY_FACTOR)
+    reward_bandwidth_units = reward_units(random.randint(1, 15) * SCALE, effective_units, LEDGER_BASE_HASH_POWER, multiplier_units)
+    reward_hash_gain_units = mul(units["rig_hash_power"], LEDGER_HASH_GROWTH_RATE)
+
+    if mining_type == "cache":
+        units["cache_value_mb"] += reward_mb_units
+    units["capsule_value_mb"] += reward_mb_units
+    units["rig_hash_power"] += reward_hash_gain_units
+    units["real_kwh"] += reward_kwh_units
+    units["bandwidth_MBps"] += reward_bandwidth_units
+
+    torrent_units = 0
+    if capsule_type.lower() in TORRENT_CAPSULES:
+        torrent_units = reward_mb_units // 2
+        units["torrent_value_mb"] += torrent_units
+
+    for key in ["capsule_value_mb", "cache_value_mb", "rig_hash_power", "real_kwh", "bandwidth_MBps", "torrent_value_mb"]:
+        wallet[key] = from_units(units[key])
+
+    return (
+        from_units(effective_units, 6), from_units(sha_boost_units), from_units(reward_mb_units),
+        from_units(reward_kwh_units), from_units(reward_bandwidth_units), from_units(reward_hash_gain_units),
+        from_units(torrent_units)
+    )
+
+# --- Unified Mining Loop ---
+
+def mining_tick(wallet, mining_type, current_tick, verbose=True):
+    """Mines one capsule for a loaded wallet and saves it; returns the effective H/s and total value."""
+    world_debt_node_value_generation()  
+    POLICY.prepare(wallet)  
+    if current_tick == 0:  
+        POLICY.start_session(wallet)  
+
+    capsule_type = random.choice(CUSTOM_REWARDS)  
+    if DEBUG_SHA_BOOST and current_tick == 0 and mining_type == "sha":  
+        capsule_type = "SHA"  
+
+    multiplier = POLICY.multiplier(wallet)  
+    pow_result = None  
+    if POW_MINING and mining_type in POW_MINING_TYPES and not isinstance(wallet.get("rig_hash_power"), Magnitude):  
+        pow_result = proof_of_work(capsule_type, wallet["rig_hash_power"])  
+    measured_hash_power = Decimal(round(pow_result.hash_rate)) if pow_result else None  
+    if LEDGER_MODE:  
+        tick = _ledger_mining_tick(wallet, mining_type, capsule_type, multiplier, measured_hash_power)  
+    else:  
+        tick = _decimal_mining_tick(wallet, mining_type, capsule_type, multiplier, measured_hash_power)  
+    effective_hash_power, sha_boost_amount_added, reward_mb, reward_kwh, reward_bandwidth, reward_hash_gain, torrent_mb = tick  
+    policy_notes = POLICY.tick_notes(wallet, capsule_type) if verbose else []  
+    POLICY.after_tick(wallet)  
+
+    if pow_result:  
+        vh_hash = pow_result.hash_hex  
+    else:  
+        vh_hash = vh_btc_hash_function(capsule_type, str(effective_hash_power))  
+
+    if sha_boost_amount_added > 0:  
+        wallet["sha_boost_active"] = True  
+        if verbose:  
+            print(f"🌠 SHA Boost PERMANENTLY +{format_large_number(sha_boost_amount_added)} H/s to Wallet: {wallet['wallet_id']}")  
+
+    # --- Real Electricity Emission ---  
+    emit_real_electricity(reward_kwh, verbose)  
+    log_real_emission(wallet["wallet_id"], reward_mb, reward_kwh, capsule_type)  
+
+    rewarded_resource = "Cache & Capsule MB" if mining_type == "cache" else "Capsule MB"  
+    wallet["sha_boost_active"] = False  
+
+    # --- Torrent Capsule Reward ---  
+    if torrent_mb > 0:  
+        generate_torrent_file(wallet, capsule_type, torrent_mb, verbose)  
+        if verbose:  
+            print(f"🏴‍☠️ Torrent Payload Gained: {format_large_number(torrent_mb)} MB")  
+
+    save_wallet(wallet)  
+
+    total_usd = calculate_total_value(wallet)  
+    if verbose:  
+        display_permanent_hash_power = format_large_number(wallet["rig_hash_power"])  
+        print(f"\n--- Capsule Mined: {capsule_type} ({mining_type.upper()}) ---")  
+        print(f"Hash Found (VH_BTC): {vh_hash[:10]}...")  
+        if pow_result:  
+            print(f"⛏️ SHA-256d PoW: {'nonce ' + str(pow_result.nonce) if pow_result.found else 'no hash under target, best nonce ' + str(pow_result.best_nonce)}"  
+                  f" ({pow_result.hashes:,} hashes in {pow_result.seconds:.2f}s, {POW_TARGET_BITS}-bit target)")  
+        for note in policy_notes:  
+            print(note)  
+        print(f"💵 {rewarded_resource} Gained: {format_large_number(reward_mb)} MB")  
+        print(f"⚡ kWh Gained:     {format_large_number(reward_kwh)} kWh")  
+        print(f"🛰️ Bandwidth Gained: {format_large_number(reward_bandwidth)} MB/s")  
+        print(f"--------------------------")  
+        print(f"📈 H/s Gain:       {reward_hash_gain:.6f} (Passive)")  
+        print(f"🌠 H/s (Effective):{format_large_number(effective_hash_power)} (Includes Resource Bonus)")  
+        print(f"🌠 H/s (Permanent):{display_permanent_hash_power}")  
+        print(f"SHA Boost:        {format_large_number(sha_boost_amount_added)} (ADDED PERMANENTLY)")  
+        print(f"Balance MB:       {format_large_number(wallet['capsule_value_mb'])}")  
+        print(f"Balance Cache MB: {format_large_number(wallet['cache_value_mb'])}")  
+        print(f"💰 Total {CURRENCY.code} Value (Watts-backed): {CURRENCY.label(format_large_number(total_usd))}")  
+
+    return {"hash_power": effective_hash_power, "total_usd": total_usd}
+
+def unified_mining_loop(wallet, mining_type):
+    TOTAL_YEARS = POLICY.total_years
+    MAX_TICKS = TOTAL_YEARS * 365
+    current_tick = 0
+
+    _mining_session(1)
+    try:  
+        while current_tick < MAX_TICKS:  
+            with TRANSFERS.locked(wallet['wallet_id']):  
+                wallet = load_wallet(wallet['wallet_id'])  
+                if wallet:  
+                    mining_tick(wallet, mining_type, current_tick)  
+            if not wallet:  
+                print("⚠️ Wallet disappeared. Stopping mining.")  
+                break  
+
+            current_tick += 1  
+            # Feature rigs prompt between ticks (ads, ...); the hook takes the wallet lock itself if it changes the wallet
+            if MINING_HOOK is not None and MINING_HOOK(wallet, current_tick) is False:  
+                print("⛔ Mining stopped.")  
+                break  
+            time.sleep(random.randint(*TICK_SECONDS))  
+        else:  
+            print(f"\n✅ Mining complete after reaching {TOTAL_YEARS} years.")  
+
+    except KeyboardInterrupt:  
+        print("\n⛔ Mining stopped by user.")
+    finally:
+        _mining_session(-1)
+
+def _mining_session(delta):
+    global _MINING_SESSIONS
+    with _MINING_LOCK:
+        _MINING_SESSIONS += delta
+
+def rig_idle():
+    """True while no mining loop or supervisor runs in this process."""
+    return _MINING_SESSIONS == 0
+
+# --- Multi-Rig Supervisor ---
+
+def _supervised_tick(wallet_id, mining_type, current_tick):
+    # The wallet lock covers load to save, so a send or donation never lands on a stale copy
+    with TRANSFERS.locked(wallet_id):
+        wallet = load_wallet(wallet_id)
+        if not wallet:
+            return None
+        return mining_tick(wallet, mining_type, current_tick, verbose=False)
+
+def _print_supervisor_status(supervisor):
+    status = supervisor.status()
+    print(f"\n=== Supervisor: {status['mining']}/{status['rigs']} rigs mining, {status['ticks']} ticks, "
+          f"{status['elapsed'] / 60:.1f} min ===")
+    for stats in supervisor.rigs.values():
+        note = f" ⚠️ {stats.last_error}" if stats.state in ("retrying", "failed") else ""
+        print(f"  {stats.wallet_id} [{stats.mining_type.upper()}] {stats.state}: {stats.ticks} ticks, "
+              f"{format_large_number(stats.hash_power)} H/s, {CURRENCY.label(format_large_number(stats.total_usd))}{note}")
+    print(f"🚀 Aggregate H/s (Effective): {format_large_number(status['hash_power'])}")
+    print(f"💰 Aggregate {CURRENCY.code} Value: {CURRENCY.label(format_large_number(status['total_usd']))}")
+    print(f"📈 {CURRENCY.code} Throughput: {CURRENCY.label(format_large_number(status['usd_per_minute']))} / min")
+
+def run_supervisor(rigs, status_interval=30.0):
+    """Mines [(wallet_id, mining_type), ...] in parallel until done or Ctrl+C / SIGTERM."""
+    supervisor = MiningSupervisor(_supervised_tick, rigs, max_ticks=POLICY.total_years * 365)
+    print(f"🛠️ Supervising {len(rigs)} rigs — Ctrl+C stops them cleanly after their current tick.")
+    _mining_session(1)
+    try:
+        supervisor.run(status_interval, on_status=_print_supervisor_status)
+    finally:
+        _mining_session(-1)
+    WALLET_STORE.flush()
+    if not EMISSION_LOG.flush(timeout=5):
+        print("⚠️ Emission log writer did not finish in time; its last entries may be missing.")
+    print("✅ Supervisor stopped; all wallets saved.")
+
+def start_supervisor_menu():
+    rig_ids = _get_wallet_rig_ids()
+    user_wallets_ids = sorted(id for id in rig_ids.keys() if id not in [DONATION_WALLET_ID, WORLD_DEBT_WALLET_ID])
+    if not user_wallets_ids:
+        print("⚠️ No personal wallets/rigs found. Create one first (Option 6 in main menu).")
+        return
+
+    print("\n--- Select Rigs for the Supervisor ---")
+    for i, wallet_id in enumerate(user_wallets_ids, 1):
+        print(f"{i}. {rig_ids[wallet_id]} ({wallet_id})")
+    print(f"Enter numbers like 1,3:cache,4:sha (type defaults to {MINING_TYPES[0]}), or 'all' / 'all:wifi'.")
+    selection = input("Rigs: ").strip()
+
+    mining_types = {t.lower(): t for t in MINING_TYPES}
+    rigs = []
+    for item in selection.split(","):
+        number, _, mining_type = item.strip().partition(":")
+        mining_type = mining_type.strip() or MINING_TYPES[0]
+        if mining_type.lower() not in mining_types:
+            print(f"⚠️ Unknown mining type '{mining_type}'.")
+            return
+        mining_type = mining_types[mining_type.lower()]
+        if number.strip().lower() == "all":
+            rigs = [(wallet_id, mining_type) for wallet_id in user_wallets_ids]
+            break
+        if not number.strip().isdigit() or not 1 <= int(number) <= len(user_wallets_ids):
+            print(f"⚠️ Invalid selection '{item.strip()}'.")
+            return
+        rigs.append((user_wallets_ids[int(number) - 1], mining_type))
+
+    rigs = list(dict(rigs).items())  # one worker per wallet
+    if rigs:
+        run_supervisor(rigs)
+
+# --- Send and Donate Functions ---
+
+def _send_apply(source_id, target_id, resource_name, amt):
+    """Transfer of amt (a resource, or the currency value split over every resource) for TRANSFERS.run."""
+    def apply(wallets):
+        wallet = wallets[source_id]
+        if wallet is None:
+            raise TransferError(f"Wallet '{source_id}' not found.")
+        if resource_name == CURRENCY.value_key:  
+            total_usd = calculate_total_value(wallet)  
+            if amt > total_usd:  
+                raise TransferError(f"Not enough {CURRENCY.code}-backed balance. Max: {CURRENCY.label(format_large_number(total_usd))}")  
+            proportion = amt / total_usd  
+            wallet['capsule_value_mb'] -= wallet['capsule_value_mb'] * proportion  
+            wallet['cache_value_mb'] -= wallet['cache_value_mb'] * proportion  
+            wallet['real_kwh'] -= wallet['real_kwh'] * proportion  
+            wallet['bandwidth_MBps'] -= wallet['bandwidth_MBps'] * proportion  
+            wallet['torrent_value_mb'] -= wallet['torrent_value_mb'] * proportion  
+        else:  
+            if wallet.get(resource_name, Decimal("0")) < amt:  
+                raise TransferError(f"Not enough {resource_name.replace('_',' ')} balance.")  
+            wallet[resource_name] -= amt  
+
+        # A new target wallet is saved with the transfer, under the same journal record
+        target = wallets[target_id] = wallets[target_id] or _new_wallet(target_id)  
+
+        if resource_name == CURRENCY.value_key:  
+            total_usd_target = calculate_total_value(target)  
+            if total_usd_target > 0:  
+                factor = (total_usd_target + amt) / total_usd_target  
+                target['capsule_value_mb'] *= factor  
+                target['cache_value_mb'] *= factor  
+                target['real_kwh'] *= factor  
+                target['bandwidth_MBps'] *= factor  
+                target['torrent_value_mb'] *= factor  
+            else:  
+                target['capsule_value_mb'] += amt / MB_RATE  
+        else:  
+            target[resource_name] = target.get(resource_name, Decimal("0")) + amt  
+    return apply
+
+def send_resource(wallet, resource_name):
+    try:
+        target_id = input(f"Enter target Wallet ID to send {resource_name.replace('_',' ')}: ").strip()
+        if WALLET_REGISTRY is not None:
+            target_id = WALLET_REGISTRY.resolve(target_id) or target_id
+
+        if target_id in [DONATION_WALLET_ID, WORLD_DEBT_WALLET_ID]:  
+            print("🛑 Cannot send resources to these reserved wallet IDs using the general send function. Use the Donation or Debt menu.")  
+            return  
+
+        amt = Decimal(input("Amount to send: ").strip())  
+        if amt <= 0:  
+            print("⚠️ Enter a positive amount.")  
+            return  
+
+        # Both wallets are locked, re-read and saved as one journaled transfer (manierism.transfers)
+        TRANSFERS.run([wallet['wallet_id'], target_id], _send_apply(wallet['wallet_id'], target_id, resource_name, amt))  
+        print(f"✅ Sent {format_large_number(amt)} {_resource_label(resource_name)} from {wallet['wallet_id']} to {target_id}")  
+
+    except TransferError as e:  
+        print(f"⚠️ {e}")  
+    except Exception as e:  
+        print(f"❌ Error: {e}")
+
+def donate_for_hash(wallet, resource_name):
+    donation_wallet = load_wallet(DONATION_WALLET_ID)
+    if not donation_wallet:
+        print("⚠️ Donation wallet not found.")
+        return
+    try:
+        amt = Decimal(input(f"Amount {resource_name.replace('_',' ')} to donate: ").strip())
+        if amt <= 0:
+            print("⚠️ Enter a positive amount.")
+            return
+
+        def apply(wallets):
+            donor, donation_wallet = wallets[wallet['wallet_id']], wallets[DONATION_WALLET_ID]
+            if donor is None:
+                raise TransferError(f"Wallet '{wallet['wallet_id']}' not found.")
+            if donor.get(resource_name, Decimal("0")) < amt:  
+                raise TransferError(f"Not enough {resource_name.replace('_',' ')} balance.")  
+
+            donor[resource_name] -= amt  
+            donation_wallet[resource_name] = donation_wallet.get(resource_name, Decimal("0")) + amt  
+
+            hash_power_gain = amt  
+            if resource_name == "cache_value_mb":  
+                hash_power_gain *= POLICY.donation_multiplier  
+            donor["rig_hash_power"] += hash_power_gain  
+            return hash_power_gain  
+
+        hash_power_gain = TRANSFERS.run([wallet['wallet_id'], DONATION_WALLET_ID], apply)  
+        if resource_name == "cache_value_mb":  
+            print(f"✨ Applied {POLICY.donation_multiplier}x amplifier to Hash Power gain for Cache MB donation.")  
+        print(f"🙏 Donated {format_large_number(amt)} {resource_name.replace('_',' ')}.")  
+        print(f"🚀 Gained {format_large_number(hash_power_gain)} Hash Power!")  
+
+    except TransferError as e:  
+        print(f"⚠️ {e}")  
+    except Exception as e:  
+        print(f"❌ Error: {e}")
+
+# --- Batch Payroll ---
+
+PAYROLL_RESOURCES = ["capsule_value_mb", "cache_value_mb", "real_kwh", "bandwidth_MBps", "torrent_value_mb"]
+
+def _resource_label(resource_name):
+    return 'Watts ' + CURRENCY.code if resource_name == CURRENCY.value_key else resource_name.replace('_',' ')
+
+def run_payroll(wallet, rows):
+    """
+    Pays many wallets from `wallet` in one grouped commit. rows: [(row, target wallet_id, resource,
+    amount), ...] as read by manierism.transfers.read_payroll; resources are send_resource's keys,
+    CURRENCY.value_key is split proportionally like option 5. The totals are checked once against
+    the locked sender: if they don't fit, nothing is paid. Returns [(row, wallet_id, resource, amount, error or None), ...].
+    """
+    sender_id = wallet['wallet_id']
+    resources = PAYROLL_RESOURCES + [CURRENCY.value_key]
+    report, payments = [], []
+    for row, target_id, resource, amount in rows:
+        if WALLET_REGISTRY is not None and target_id:
+            target_id = WALLET_REGISTRY.resolve(target_id) or target_id
+        try:
+            amt = Decimal(amount)
+        except Exception:
+            amt = None
+        if not target_id:
+            error = "missing wallet ID"
+        elif target_id in [DONATION_WALLET_ID, WORLD_DEBT_WALLET_ID]:
+            error = "reserved wallet ID, use the Donation or Debt menu"
+        elif target_id == sender_id:
+            error = "cannot pay the sending wallet"
+        elif resource not in resources:
+            error = f"unknown resource '{resource}' (use {', '.join(resources)})"
+        elif amt is None or not amt.is_finite() or amt <= 0:
+            error = f"invalid amount '{amount}'"
+        else:
+            payments.append((row, target_id, resource, amt))
+            continue
+        report.append((row, target_id, resource, amount, error))
+        print(f"❌ Row {row}: {target_id or '?'} — {error}")
+    if not payments:
+        print("⚠️ No valid payroll rows.")
+        return report
+
+    totals = {}
+    for _, _, resource, amt in payments:
+        totals[resource] = totals.get(resource, Decimal("0")) + amt
+
+    def check_totals(wallets):
+        sender = wallets[sender_id]
+        if sender is None:
+            raise TransferError(f"Wallet '{sender_id}' not found.")
+        remaining = dict(sender)
+        for resource, total in totals.items():
+            if resource == CURRENCY.value_key:
+                continue
+            if remaining.get(resource, Decimal("0")) < total:
+                raise TransferError(f"Payroll needs {format_large_number(total)} {_resource_label(resource)}, "
+                                    f"{sender_id} has {format_large_number(remaining.get(resource, Decimal('0')))}")
+            remaining[resource] -= total
+        if CURRENCY.value_key in totals:
+            available = calculate_total_value(remaining)
+            if totals[CURRENCY.value_key] > available:
+                raise TransferError(f"Payroll needs {CURRENCY.label(format_large_number(totals[CURRENCY.value_key]))}, "
+                                    f"{sender_id} has {CURRENCY.label(format_large_number(available))} left after the other rows")
+
+    start = time.perf_counter()
+    results = TRANSFERS.run_batch([([sender_id], check_totals)] + [
+        ([sender_id, target_id], _send_apply(sender_id, target_id, resource, amt)) for _, target_id, resource, amt in payments
+    ], atomic=True)
+    elapsed = time.perf_counter() - start
+
+    checked, _ = results[0]
+    if not checked:
+        print(f"🛑 Payroll not paid: {results[0][1]}")
+    for (row, target_id, resource, amt), (paid, error) in zip(payments, results[1:]):
+        error = None if paid else str(error)
+        report.append((row, target_id, resource, amt, error))
+        if paid:
+            print(f"✅ Row {row}: {format_large_number(amt)} {_resource_label(resource)} → {target_id}")
+        elif checked:
+            print(f"❌ Row {row}: {target_id} — {error}")
+    report.sort(key=lambda entry: entry[0])
+
+    if checked and all(paid for paid, _ in results[1:]):
+        paid_totals = ", ".join(f"{format_large_number(total)} {_resource_label(resource)}" for resource, total in totals.items())
+        print(f"💸 Paid {len(payments)} rows to {len({target_id for _, target_id, _, _ in payments})} wallets from {sender_id} "
+              f"in one commit ({elapsed:.2f}s): {paid_totals}")
+    return report
+
+def payroll_menu(wallet):
+    path = input("Payroll file (CSV or JSON rows of wallet_id, resource, amount): ").strip().strip('"')
+    if not os.path.exists(path):
+        print(f"⚠️ File '{path}' not found.")
+        return
+    try:
+        rows = read_payroll(path)
+    except (ValueError, OSError) as e:
+        print(f"❌ Could not read {path}: {e}")
+        return
+    print(f"📋 {len(rows)} payroll rows from {path}, paying from {wallet['wallet_id']}.")
+    if input("Type YES to pay them, or press Enter to cancel: ").strip() != "YES":
+        print("🛑 Cancelled.")
+        return
+    run_payroll(wallet, rows)
+
+# --- Watts Token Payouts ---
+
+# Rigs configured with watts_token=True pay confirmed ad views in USD into each wallet's Watts
+# Token (and the same amount as capsule MB); from PAYOUT_THRESHOLD_USD it can be cashed out to BTC
+WATTS_TOKEN_FIELDS = {"watts_token": Decimal("0"), "btc_address": "", "ad_views": 0}
+PAYOUT_THRESHOLD_USD = Decimal("5.00")
+ADMIN_NOTIFICATION_NAME = "admin_notifications.txt"
+WITHDRAWAL_REQUESTS_NAME = "withdrawal_requests.json"
+
+def get_node_count():
+    """Joined nodes, as Bing's result count for the join post; 0 when it can't be read."""
+    import re
+    import requests
+    from bs4 import BeautifulSoup
+    try:
+        response = requests.get(BING_SEARCH_URL, params={"q": "joined Manierism Megabytes node"}, timeout=10)
+        count_tag = BeautifulSoup(response.text, "html.parser").find("span", class_="sb_count")
+        match = re.search(r'(\d+(?:,\d+)*) results', count_tag.text if count_tag else "")
+        return int(match.group(1).replace(",", "")) if match else 0
+    except Exception:
+        return 0
+
+def credit_ad_reward(wallet_id, reward_usd):
+    """Pays one confirmed ad view (reward_usd to the Watts Token and as capsule MB); returns the saved wallet."""
+    with TRANSFERS.locked(wallet_id):
+        wallet = load_wallet(wallet_id)
+        if wallet is None:
+            return None
+        wallet['capsule_value_mb'] += reward_usd / MB_USD_RATE
+        wallet['watts_token'] += reward_usd
+        wallet['ad_views'] = wallet.get('ad_views', 0) + 1
+        save_wallet(wallet)
+
+    if wallet['watts_token'] >= PAYOUT_THRESHOLD_USD and wallet.get('btc_address'):
+        with open(os.path.join(BASEDIR, ADMIN_NOTIFICATION_NAME), "a") as f:
+            f.write(f"Wallet {wallet['wallet_id']} reached ${wallet['watts_token']:.2f} Watts Token. "
+                    f"BTC Address: {wallet['btc_address']}. Node ID: {wallet['node_id']}\n")
+        print("🎉 Watts Token threshold reached! Admin notified for payout to your BTC address.")
+    return wallet
+
+def ask_btc_address(wallet, prompt="Enter your BTC wallet address for payouts (optional): "):
+    btc_addr = input(prompt).strip()
+    if not btc_addr:
+        return
+    with TRANSFERS.locked(wallet['wallet_id']):
+        current = load_wallet(wallet['wallet_id'])
+        if current is None:
+            return
+        current['btc_address'] = btc_addr
+        save_wallet(current)
+    wallet['btc_address'] = btc_addr
+    print(f"✅ BTC address set to {btc_addr}")
+
+def set_btc_address(wallet):
+    print(f"Help: Add wallet for BTC. Reach ${PAYOUT_THRESHOLD_USD} in Watts Token to cash out.")
+    ask_btc_address(wallet, "Enter your BTC wallet address for payouts: ")
+
+def load_withdrawal_requests():
+    path = os.path.join(BASEDIR, WITHDRAWAL_REQUESTS_NAME)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        return json.load(f)
+
+def _save_withdrawal_requests(requests):
+    path = os.path.join(BASEDIR, WITHDRAWAL_REQUESTS_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(requests, f, indent=4)
+    os.replace(path + ".tmp", path)
+
+def request_cash_out(wallet):
+    def apply(wallets):
+        owner, donation_wallet = wallets[wallet['wallet_id']], wallets[DONATION_WALLET_ID]
+        if owner is None:
+            raise TransferError(f"Wallet '{wallet['wallet_id']}' not found.")
+        if owner['watts_token'] < PAYOUT_THRESHOLD_USD:
+            raise TransferError(f"You need at least ${PAYOUT_THRESHOLD_USD} in Watts Token to cash out. Current: ${owner['watts_token']:.2f}")
+        if not owner.get('btc_address'):
+            raise TransferError("No BTC address set. Please set one first (Set BTC Wallet Address).")
+        # The payout is held in the donation wallet until the admin sends the BTC
+        owner['watts_token'] -= PAYOUT_THRESHOLD_USD
+        if donation_wallet:
+            donation_wallet['watts_token'] = donation_wallet.get('watts_token', Decimal("0")) + PAYOUT_THRESHOLD_USD
+        return owner
+
+    try:
+        owner = TRANSFERS.run([wallet['wallet_id'], DONATION_WALLET_ID], apply)
+    except TransferError as e:
+        print(f"⚠️ {e}")
+        return
+
+    with TRANSFERS.locked(DONATION_WALLET_ID):
+        requests = load_withdrawal_requests()
+        requests.append({
+            "wallet_id": owner['wallet_id'],
+            "node_id": owner['node_id'],
+            "btc_address": owner['btc_address'],
+            "amount": float(PAYOUT_THRESHOLD_USD),
+            "timestamp": time.time()
+        })
+        _save_withdrawal_requests(requests)
+    print(f"✅ Cash-out request for ${PAYOUT_THRESHOLD_USD} sent to admin. It will be processed to your BTC address: {owner['btc_address']}")
+
+def view_withdrawal_requests(wallet):
+    if wallet['wallet_id'] != DONATION_WALLET_ID:
+        print("🛑 Withdrawal requests can only be viewed from the donation (admin) wallet.")
+        return
+    requests = load_withdrawal_requests()
+    if not requests:
+        print("No withdrawal requests pending.")
+        return
+
+    print("\n--- Pending Withdrawal Requests ---")
+    for req in requests:
+        print(f"Wallet ID: {req['wallet_id']}")
+        print(f"Node ID: {req['node_id']}")
+        print(f"BTC Address: {req['btc_address']}")
+        print(f"Amount: ${req['amount']}")
+        print(f"Timestamp: {time.ctime(req['timestamp'])}")
+        print("-----------------------------")
+
+WATTS_TOKEN_ACTIONS = [
+    ("Send Watts Token", lambda wallet: send_resource(wallet, "watts_token")),
+    ("Donate Watts Token to Creator (Gain Hash Power)", lambda wallet: donate_for_hash(wallet, "watts_token")),
+    ("Set BTC Wallet Address", set_btc_address),
+    (f"Cash Out Watts Token (if >= ${PAYOUT_THRESHOLD_USD})", request_cash_out),
+    ("View Withdrawal Requests (Admin Only)", view_withdrawal_requests),
+]
+
+# --- Wallet Selection ---
+
+def _get_all_wallets():
+    wallets_data = {}
+    for wallet_id in WALLET_STORE.wallet_ids():
+        wallets_data[wallet_id] = load_wallet(wallet_id)
+    return wallets_data
+
+def _get_wallet_rig_ids():
+    if WALLET_REGISTRY is None:
+        return {wallet_id: data.get('rig_id', wallet_id) for wallet_id, data in _get_all_wallets().items()}
+    WALLET_REGISTRY.sync(TARGETDIR, WALLET_STORE.wallet_ids())
+    return dict(WALLET_REGISTRY.list_wallets())
+
+def select_wallet_or_rig():
+    rig_ids = _get_wallet_rig_ids()
+    if not rig_ids:
+        print("⚠️ No wallets/rigs found.")
+        return None
+
+    print("\nSelect a Rig/Wallet or type Wallet ID:")  
+    sorted_wallet_ids = sorted(rig_ids.keys(), key=lambda x: (x != WORLD_DEBT_WALLET_ID, x != DONATION_WALLET_ID, x))  
+
+    for i, wallet_id in enumerate(sorted_wallet_ids, 1):  
+        print(f"{i}. {rig_ids[wallet_id]} ({wallet_id})")  
+
+    choice = input("Enter number or Wallet ID: ").strip()  
+    if choice.isdigit():  
+        idx = int(choice)  
+        if 1 <= idx <= len(sorted_wallet_ids):  
+            wallet_id = sorted_wallet_ids[idx-1]  
+            return load_wallet(wallet_id)  
+
+    return load_wallet(choice) if choice in rig_ids else None
+
+def select_wallet_for_mining():
+    rig_ids = _get_wallet_rig_ids()
+    user_wallets_ids = [id for id in rig_ids.keys() if id not in [DONATION_WALLET_ID, WORLD_DEBT_WALLET_ID]]
+
+    if not user_wallets_ids:  
+        print("⚠️ No personal wallets/rigs found. Create one first (Option 6 in main menu).")  
+        return None  
+
+    print("\n--- Select Rig for Mining ---")  
+    sorted_user_wallets = sorted(user_wallets_ids)  
+    for i, wallet_id in enumerate(sorted_user_wallets, 1):  
+        print(f"{i}. {rig_ids[wallet_id]} ({wallet_id})")  
+
+    choice = input("Enter number: ").strip()  
+    if choice.isdigit():  
+        idx = int(choice)  
+        if 1 <= idx <= len(sorted_user_wallets):  
+            wallet_id = sorted_user_wallets[idx-1]  
+            return load_wallet(wallet_id)  
+
+    print("⚠️ Invalid selection.")  
+    return None
+
+# --- Rig Dashboard ---
+
+def _emission_summary(wallet_id):
+    """Lifetime and last-24h emission totals from the emission store's rollups, or None."""
+    if not EMISSION_STORE:
+        return None
+    EMISSION_LOG.flush(timeout=5)
+    summary = EMISSION_STORE.totals(wallet_id)
+    summary["last_24h_kWh"] = EMISSION_STORE.window_totals(wallet_id, time.time() - 86400)["capsule_kWh"]
+    return summary
+
+def show_rig_dashboard(wallet):
+    if wallet['wallet_id'] in [WORLD_DEBT_WALLET_ID, DONATION_WALLET_ID]:
+        wallet = load_wallet(wallet['wallet_id'])
+
+    device_cache, _ = scan_device_cache_mb()  
+    total_value = calculate_total_value(wallet)  
+    effective_hash_power = calculate_rig_hash_power(wallet)  
+    plant = f" ({PLANT_NAME})" if PLANT_NAME else ""  
+
+    print(f"\n--- Capsule Rig Dashboard — {wallet['rig_id']}{plant} ---")  
+    print(f"Wallet ID: {wallet['wallet_id']}")  
+    print(f"🌐 Node ID: {wallet.get('node_id','N/A')[:8]}...")  
+    print(f"🌠 Hash Power (Permanent): {format_large_number(wallet['rig_hash_power'])}")  
+    print(f"🚀 Hash Power (Effective): {format_large_number(effective_hash_power)} (Used for Mining Rate)")  
+    if wallet.get("sha_boost_active"):  
+        boost_calc = wallet['rig_hash_power'] / Decimal('4')  
+        print(f"⚡ SHA Boost ACTIVE: +{format_large_number(boost_calc)} H/s ")  
+    print(f"💾 Capsule MB: {format_large_number(wallet['capsule_value_mb'])}")  
+    print(f"📦 Cache MB: {format_large_number(wallet['cache_value_mb'])}")  
+    print(f"📥 Device Cache (User Folders): {device_cache:.6f} MB{'' if _device_cache_scanner().ready else ' (first scan running...)'}")  
+    print(f"⚡ Real kWh: {format_large_number(wallet['real_kwh'])}")  
+    print(f"📡 Bandwidth: {format_large_number(wallet['bandwidth_MBps'])} MB/s")  
+    print(f"🧲 Torrent Payloads: {format_large_number(wallet.get('torrent_value_mb', Decimal('0')))} MB")  
+    if WATTS_TOKEN:  
+        print(f"🔋 Watts Token: {format_large_number(wallet.get('watts_token', Decimal('0')))} USD")  
+    for line in DASHBOARD_LINES(wallet) if DASHBOARD_LINES else []:  
+        print(line)  
+    print(f"💵 WATTS {CURRENCY.code} Value: {CURRENCY.label(format_large_number(total_value))}")  
+    emissions = _emission_summary(wallet['wallet_id'])  
+    if emissions:  
+        print(f"🔌 Emissions Logged: {emissions['entries']} ({emissions['capsule_kWh']:.6e} kWh, last 24h: {emissions['last_24h_kWh']:.6e} kWh)")  
+    print("-" * 40)  
+
+    if wallet['wallet_id'] == WORLD_DEBT_WALLET_ID:  
+        total_debt_paid = calculate_total_value(wallet)  
+        print(f"🌎 Total Debt Paid: {CURRENCY.label(format_large_number(total_debt_paid))} (This Wallet's {CURRENCY.code} Value)")  
+    elif wallet['wallet_id'] != DONATION_WALLET_ID:  
+        print(f"🌎 World Debt Contributed: {CURRENCY.label(format_large_number(wallet[CURRENCY.debt_paid_key]))}")  
+    print("-" * 40)
+
+# --- Internet Terminal Integration ---
+
+def _search_client():
+    # One pooled session and result page cache per process, shared by every terminal session
+    global SEARCH_CLIENT
+    if SEARCH_CLIENT is None:
+        SEARCH_CLIENT = SearchClient(os.path.join(BASEDIR, SEARCH_CACHE_NAME), search_url=SEARCH_URL, ttl=SEARCH_CACHE_TTL,
+                                     pool_size=SEARCH_CONCURRENCY)
+    return SEARCH_CLIENT
+
+def _page_preview():
+    # One caching preview server per process; later terminal sessions reuse it instead of rebinding port 5000
+    global PAGE_PREVIEW
+    if PAGE_PREVIEW is None:
+        PAGE_PREVIEW = PagePreview(_search_client())
+        threading.Thread(target=run_preview_app, args=(create_preview_app(PAGE_PREVIEW),), daemon=True).start()
+    return PAGE_PREVIEW
+
+def _burn_search_mb(wallet_id, entries):
+    """
+    Burns [(MB, kWh), ...] of search downloads from a fresh copy of the wallet under its lock and
+    credits the kWh; returns (saved wallet or None, MB burned, kWh rewarded).
+    """
+    burned_MB = sum((mb for mb, _ in entries), Decimal("0"))
+    reward_kwh = sum((kwh for _, kwh in entries), Decimal("0"))
+    with TRANSFERS.locked(wallet_id):
+        wallet = load_wallet(wallet_id)
+        if wallet is None:
+            return None, burned_MB, reward_kwh
+        wallet['capsule_value_mb'] -= burned_MB
+        if wallet['capsule_value_mb'] < 0:
+            wallet['capsule_value_mb'] = Decimal("0")
+        wallet['real_kwh'] += reward_kwh
+        save_wallet(wallet)
+    emit_real_electricity(reward_kwh)
+    for mb, kwh in entries:
+        log_real_emission(wallet_id, mb, kwh, "InternetSearch")
+    return wallet, burned_MB, reward_kwh
+
+def run_search_batch(lines, wallet=None, concurrency=None):
+    """
+    Batch internet searches: 'WALLET_ID | query' lines (plain 'query' lines go to `wallet`).
+    All queries are fetched concurrently; each wallet's MB burn, kWh reward and emission log
+    entries are applied at the end with one wallet write.
+    """
+    concurrency = concurrency or SEARCH_CONCURRENCY
+    wallets = {wallet["wallet_id"]: wallet} if wallet is not None else {}
+    jobs = []
+    for wallet_id, query in parse_batch_lines(lines):
+        wallet_id = wallet_id or (wallet["wallet_id"] if wallet is not None else None)
+        if wallet_id is None:
+            print(f"⚠️ No wallet for '{query}' (use 'WALLET_ID | query'), skipped.")
+            continue
+        if wallet_id not in wallets:
+            wallets[wallet_id] = load_wallet(wallet_id)
+            if wallets[wallet_id] is None:
+                print(f"⚠️ Wallet '{wallet_id}' not found, its queries are skipped.")
+        if wallets[wallet_id] is not None:
+            jobs.append((wallet_id, query))
+    if not jobs:
+        print("⚠️ No queries to run.")
+        return
+
+    print(f"\n📦 Searching {len(jobs)} queries for {len({w for w, _ in jobs})} wallet(s), {concurrency} at a time...")
+    start = time.perf_counter()
+    outcomes = _search_client().search_many([query for _, query in jobs], concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+
+    burns = {}  # wallet_id -> [(MB, kWh), ...]
+    log_lines = []
+    fetched = cached = failed = 0
+    for (wallet_id, query), (results, page, error) in zip(jobs, outcomes):
+        if error is not None:
+            failed += 1
+            print(f"❌ {wallet_id} | {query}: {error}")
+            continue
+        capsule_type = random.choice(CUSTOM_REWARDS)
+        vh_hash = vh_btc_hash_function(capsule_type, str(wallets[wallet_id]['rig_hash_power']))
+        log_lines.append(f"{capsule_type} | {vh_hash} | {query}\n")
+        burned_MB = Decimal(page.bytes_downloaded) / Decimal(1024 * 1024)
+        if burned_MB > 0:
+            burns.setdefault(wallet_id, []).append((burned_MB, overlay_formula(burned_MB)))
+        cached += page.from_cache
+        fetched += not page.from_cache
+        top = f" — {results[0]['title']}" if results else ""
+        print(f"{'♻️' if page.from_cache else '🔍'} {wallet_id} | {query}: {len(results)} results, {burned_MB:.6f} MB{top}")
+
+    # One write per wallet for the whole batch
+    for wallet_id, entries in burns.items():
+        target, burned_MB, reward_kwh = _burn_search_mb(wallet_id, entries)
+        if target is None:
+            print(f"⚠️ Wallet '{wallet_id}' disappeared during the batch, its burn is skipped.")
+            continue
+        if wallet is not None and wallet_id == wallet["wallet_id"]:
+            wallet.update(target)
+        print(f"🔥 {wallet_id}: {burned_MB:.6f} MB burned over {len(entries)} queries, ⚡ {format_large_number(reward_kwh)} kWh, "
+              f"💾 {format_large_number(target['capsule_value_mb'])} MB left")
+
+    with open(os.path.join(BASEDIR, "query_log.txt"), "a") as f:
+        f.writelines(log_lines)
+    print(f"📦 Batch done in {elapsed:.2f}s: {fetched} fetched, {cached} from cache, {failed} failed")
+
+def _read_batch_lines(source):
+    if source == "-":
+        print("Enter queries ('WALLET_ID | query' or 'query'), an empty line to finish:")
+        lines = []
+        while True:
+            try:
+                line = input()
+            except EOFError:
+                break
+            if not line.strip():
+                break
+            lines.append(line)
+        return lines
+    with open(source, "r", encoding="utf-8") as f:
+        return f.readlines()
+
+def run_internet_terminal(wallet):
+    # webbrowser, requests and Flask are only needed here, so mining-only sessions never import them
+    import webbrowser
+
+    node_id = wallet.get("node_id")
+    MB_USED_TOTAL = Decimal("0")
+    search = _search_client()
+
+    def fetch_bing_results(query, max_results=5):  
+        nonlocal MB_USED_TOTAL  
+        results, page = search.search(query, max_results)  
+        # Burn what this request downloaded; a cached result page costs nothing
+        burned_MB = Decimal(page.bytes_downloaded) / Decimal(1024 * 1024)  
+        MB_USED_TOTAL += burned_MB  
+        if burned_MB > 0:  
+            # Burned from a fresh copy under the wallet lock, so a mining tick or transfer in between isn't undone
+            saved, _, _ = _burn_search_mb(wallet['wallet_id'], [(burned_MB, overlay_formula(burned_MB))])  
+            if saved is not None:  
+                wallet.update(saved)  
+        return results, page  
+
+    print(f"\n🍫 Willy Wonka Internet Terminal 🍫")  
+    print(f"🔗 Node Linked: {node_id}")  
+    print("Type a URL to preview in local web display.")  
+    print("Type 'batch FILE' (or 'batch -' to paste) to run many queries at once.")  
+
+    while True:  
+        query = input("\nEnter search query or URL (or 'exit'): ").strip()  
+  
+        if query.lower() == 'exit':  
+            break  
+
+        if query.lower().startswith("batch "):  
+            try:  
+                lines = _read_batch_lines(query[6:].strip())  
+            except OSError as e:  
+                print(f"❌ Could not read batch file: {e}")  
+                continue  
+            run_search_batch(lines, wallet)  
+            continue  
+
+        if query.startswith("http://") or query.startswith("https://"):  
+            _page_preview().current_url = query  
+            print(f"Opening {query} in local Flask preview...")  
+            webbrowser.open("http://localhost:5000/")  
+            continue  
+
+        capsule_type = random.choice(CUSTOM_REWARDS)  
+        vh_hash = vh_btc_hash_function(capsule_type, str(wallet['rig_hash_power']))  
+        print(f"🔍 Capsule Overlay: {capsule_type}")  
+        print(f"🔑 VH_BTC Hash: {vh_hash[:10]}...")  
+
+        try:  
+            results, page = fetch_bing_results(query)  
+        except Exception as e:  
+            print(f"❌ Search failed: {e}")  
+            continue  
+        if page.from_cache:  
+            print("♻️ Result page served from the search cache (0 MB burned)")  
+        else:  
+            print(f"🔥 MB Burned: {page.bytes_downloaded / (1024 * 1024):.6f} (this session: {MB_USED_TOTAL:.6f})")  
+        print(f"\n💾 Capsule MB Remaining: {format_large_number(wallet['capsule_value_mb'])}")  
+        for i, r in enumerate(results, 1):  
+            print(f"{i}. {r['title']}\n   {r['snippet']}\n   {r['link']}\n")  
+
+        with open(os.path.join(BASEDIR, "query_log.txt"), "a") as f:  
+            f.write(f"{capsule_type} | {vh_hash} | {query}\n")  
+
+        input("Press Enter for new search...")
+
+# --- Receive Info ---
+
+def show_receive_info(wallet):
+    print("\n--- Receive Info ---")
+    print(f"Wallet ID (for receiving resources): {wallet['wallet_id']}")
+    print(f"Node ID (for network interactions): {wallet['node_id']}")
+    print("Share these to receive transfers.")
+    input("Press Enter to continue...")
+
+# --- Device Cache Scanner ---
+
+def _device_cache_scanner():
+    # Started on first use, not in configure(): a mining-only session never walks the SD card, and
+    # once started it refreshes on request and otherwise only while no mining runs (rig_idle)
+    global DEVICE_CACHE_SCANNER
+    if DEVICE_CACHE_SCANNER is None:
+        DEVICE_CACHE_SCANNER = DeviceCacheScanner(DEVICE_CACHE_ROOT, os.path.join(BASEDIR, "device_cache_index.json"),
+                                                  idle=rig_idle).start()
+    return DEVICE_CACHE_SCANNER
+
+def scan_device_cache_mb():
+    """Last known size of the user folders (instant); the walk itself runs on the scanner thread."""
+    scanner = _device_cache_scanner()
+    scanner.request_refresh()
+    return scanner.total_mb(), scanner.last_rescanned
+
+# --- Rig Info Export (Option 12) ---
+
+def show_rig_download_info(wallet):
+    rig_info = {
+        "wallet_id": wallet['wallet_id'],
+        "rig_id": wallet.get('rig_id', wallet['wallet_id']),
+        "node_id": wallet.get('node_id', 'N/A'),
+        "capsule_MB": float(wallet.get('capsule_value_mb', Decimal("0"))),
+        "cache_MB": float(wallet.get('cache_value_mb', Decimal("0"))),
+        "real_kWh": float(wallet.get('real_kwh', Decimal("0"))),
+        "bandwidth_MBps": float(wallet.get('bandwidth_MBps', Decimal("0"))),
+        "torrent_MB": float(wallet.get('torrent_value_mb', Decimal("0"))),
+        "rig_hash_power": float(wallet.get('rig_hash_power', BASE_HASH_POWER)),
+        CURRENCY.debt_paid_key: float(wallet.get(CURRENCY.debt_paid_key, Decimal("0"))),
+        f"total_{CURRENCY.code.lower()}_value": float(calculate_total_value(wallet)),
+        **{key: float(wallet.get(key, default)) if isinstance(default, Decimal) else wallet.get(key, default)
+           for key, default in WALLET_FIELDS.items()},
+        "timestamp": time.time(),
+        "emissions": _emission_summary(wallet['wallet_id']),
+        "overlay_constants": {
+            "TEЛ²": str(TEPI2),
+            "E²Л": str(E2PI),
+            "block_header": BLOCK_HEADER
+        }
+    }
+    file_name = f"rig_info_{wallet['wallet_id']}.json"
+    path = os.path.join(BASEDIR, file_name)
+    with open(path, "w") as f:
+        json.dump(rig_info, f, indent=4)
+    print(f"✅ Rig info exported to {path}")
+
+def _write_jsonbin(path, json_string):
+    """Writes JSON NUL-padded up to a whole number of JSONBIN blocks."""
+    content_size = len(json_string.encode('utf-8'))
+    num_blocks = math.ceil(content_size / JSONBIN_BLOCK_BYTES)
+    required_bytes = num_blocks * JSONBIN_BLOCK_BYTES
+    with open(path, "w") as f:
+        f.write(json_string + '\0' * (required_bytes - content_size))
+    print(f"📦 JSONBIN padded to {num_blocks} blocks ({required_bytes} bytes)")
+
+def export_sha_hashpower_capsule(wallet):
+    try:
+        declared_hs_str = input("\nEnter declared SHA256d hashpower in H/s (e.g., 1000000000000 for 1 TH/s): ").strip()
+        declared_hs = int(Decimal(declared_hs_str))
+        if declared_hs <= 0:
+            print("⚠️ Must be greater than zero.")
+            return
+    except:
+        print("❌ Invalid number format.")
+        return
+
+    print("\nChoose capsule file format:")
+    print("  1. Capsule JSON (.json)")
+    print("  2. Capsule BIN (.bin)")
+    print("  3. .jsonbin (padded JSON for block boundary)")
+    fmt_choice = input("Enter format option: ").strip()
+    file_ext = {"1": "json", "2": "bin", "3": "jsonbin"}.get(fmt_choice)
+    if not file_ext:
+        print("⚠️ Invalid format.")
+        return
+
+    capsule = {
+        "version": "1.0",
+        "type": "vhBTC",
+        "capsule_id": f"vhbtc-{wallet['wallet_id']}-{int(time.time())}",
+        "algorithm": "sha256d",
+        "hashrate": {"value": declared_hs, "unit": "H/s"},
+        "duration": {"value": 24, "unit": "hours"},
+        "pool": {
+            "url": "stratum+tcp://pool.example.com:3333",
+            "username": "user.worker",
+            "password": "x"
+        },
+        "execution": {
+            "start_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "stop_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time()+86400)),
+            "throttle": 1.0,
+            "devices": ["asic:all"]
+        },
+        "overlay": {
+            "symbol": "vhBTC",
+            "amplifier": "golden-ratio",
+            "constants": {"ϕ": 1.6180339887, "π": 3.1415926535}
+        },
+        "market": {
+            "resale_rights": "transferable",
+            "remix_rights": "allowed",
+            "price_usd": 12.50,
+            "license": "HashPower-24h-Slice"
+        },
+        "audit": {
+            "expected_shares": 250000,
+            "share_difficulty": "pool",
+            "proofpolicy": ["sharelog", "poolreceipt", "capsulesignature"]
+        },
+        "signature": {
+            "algo": "ed25519",
+            "publickey": "BASE58PUBKEY",
+            "signature": "BASE64SIGOFCANONICALJSON"
+        }
+    }
+
+    path = os.path.join(BASEDIR, f"{wallet['wallet_id']}_sha_capsule_{declared_hs}.{file_ext}")
+    try:
+        if file_ext == "json":
+            with open(path, "w") as f:
+                f.write(json.dumps(capsule, indent=4))
+        elif file_ext == "jsonbin":
+            _write_jsonbin(path, json.dumps(capsule, indent=4))
+        else:  # bin
+            import struct
+            signature = b""           # add Ed25519 bytes if signing later
+            payload = (
+                b"VHSHPOW" +                        # header
+                b"\x01\x00" +                       # version 1.0
+                b"\x01" +                           # sha256d
+                struct.pack("<Q", declared_hs) +    # uint64 H/s
+                struct.pack("<I", 24 * 3600) +      # uint32 duration seconds
+                struct.pack("<Q", int(time.time())) +  # uint64 start unix time
+                struct.pack("<f", 1.0) +            # float32 throttle
+                b"\x00" * 16 +                      # reserved
+                struct.pack("<H", len(signature)) +
+                signature
+            )
+            with open(path, "wb") as f:
+                f.write(payload)
+        print(f"\n✅ SHA hashpower capsule exported to: {path}")
+    except Exception as e:
+        print(f"❌ Error writing file: {e}")
+
+def enhanced_download_resource_menu(wallet):
+    resource_map = {  
+        "1": "capsule_value_mb",  
+        "2": "cache_value_mb",  
+        "3": "real_kwh",  
+        "4": "bandwidth_MBps",  
+        "5": "torrent_value_mb",  
+        "6": CURRENCY.value_key  
+    }  
+    for resource_key in EXPORT_RESOURCES:  
+        resource_map[str(len(resource_map) + 1)] = resource_key  
+    sha_option = str(len(resource_map) + 1) if SHA_CAPSULE_EXPORT else None  
+    cancel_option = str(len(resource_map) + 1 + bool(SHA_CAPSULE_EXPORT))  
+
+    print("\n📥 Enhanced Resource Export")
+    print("Select resource to export:")
+    print("  1. Capsule MB")
+    print("  2. Cache MB")
+    print("  3. Real kWh")
+    print("  4. Bandwidth MBps")
+    print("  5. Torrent MB")
+    print(f"  6. Watts {CURRENCY.code} (calculated)")
+    for i, resource_key in enumerate(EXPORT_RESOURCES, 7):
+        print(f"  {i}. {resource_key.replace('_', ' ').title()}")
+    if sha_option:
+        print(f"  {sha_option}. SHA hashpower capsule (declare and download)")
+    print(f"  {cancel_option}. Cancel")
+    choice = input("Enter option: ").strip()
+
+    if choice == cancel_option:  
+        print("🛑 Cancelled.")  
+        return  
+    if choice == sha_option:  
+        export_sha_hashpower_capsule(wallet)  
+        return  
+
+    resource_key = resource_map.get(choice)  
+    if not resource_key:  
+        print("⚠️ Invalid selection.")  
+        return  
+
+    # Ask how much to export  
+    try:  
+        amt_str = input(f"\nEnter amount of {resource_key.replace('_',' ')} to export: ").strip()  
+        amt = Decimal(amt_str)  
+        if amt <= 0:  
+            print("⚠️ Must be greater than zero.")  
+            return  
+    except:  
+        print("❌ Invalid number format.")  
+        return  
+
+    # Check balance  
+    if resource_key == CURRENCY.value_key:  
+        available = calculate_total_value(wallet)  
+    else:  
+        available = wallet.get(resource_key, Decimal("0"))  
+
+    if amt > available:  
+        print(f"⚠️ Not enough balance. Max available: {format_large_number(available)}")  
+        return  
+
+    # Ask file format  
+    print("\nChoose file format:")  
+    format_map = {}  
+    for i, fmt in enumerate(EXPORT_FORMATS, 1):  
+        print(f"  {i}. .{fmt}")  
+        format_map[str(i)] = fmt  
+    format_choice = input("Enter format option: ").strip()  
+
+    file_ext = format_map.get(format_choice)  
+    if not file_ext:  
+        print("⚠️ Invalid format.")  
+        return  
+
+    # Prepare export data  
+    export_data = {  
+        "wallet_id": wallet['wallet_id'],  
+        "rig_id": wallet.get('rig_id', wallet['wallet_id']),  
+        "node_id": wallet.get('node_id', 'N/A'),  
+        "resource": resource_key,  
+        "amount": float(amt),  
+        "timestamp": time.time(),  
+        "overlay_constants": {  
+            "TEЛ²": TEPI2,  
+            "E²Л": E2PI,  
+            "block_header": BLOCK_HEADER  
+        } 
+    }  
+    if CURRENCY is not USD:  
+        export_data["capsule_settlement"] = {  
+            "plant_name": PLANT_NAME,  
+            "currency": CURRENCY.code,  
+            f"{CURRENCY.code.lower()}_rate": float(CURRENCY.usd_rate)  
+        }  
+
+    filename = f"{wallet['wallet_id']}_{resource_key}_{amt}_{file_ext}.{file_ext}"  
+    path = os.path.join(BASEDIR, filename)  
+
+    # Write file  
+    try:  
+        if file_ext == "json":  
+            with open(path, "w") as f:  
+                json.dump(export_data, f, indent=4)  
+        elif file_ext == "txt":  
+            with open(path, "w") as f:  
+                for k, v in export_data.items():  
+                    f.write(f"{k}: {v}\n")  
+        elif file_ext == "jsonbin":  
+            _write_jsonbin(path, json.dumps(export_data, indent=4))  
+        else:  
+            with open(path, "w") as f:  
+                f.write(json.dumps(export_data))  
+
+        print(f"\n✅ Exported {resource_key.replace('_',' ')} to:")  
+        print(f"   {path}")  
+    except Exception as e:  
+        print(f"❌ Error writing file: {e}")
+
+# --- World Debt Payment Plan (Option 15) ---
+
+def show_world_debt_payment_menu(wallet):
+    print("\n🌎 World Debt Payment Plan 🌎")
+    print(f"Your Wallet ID: {wallet['wallet_id']}")
+    print(f"Your Node ID: {wallet['node_id']}")
+    print(f"Debt Date: {WORLD_DEBT_DATE}")
+    print("-" * 40)
+
+    total_value = calculate_total_value(wallet)  
+    paid = wallet.get(CURRENCY.debt_paid_key, Decimal("0"))  
+    remaining = INITIAL_WORLD_DEBT - paid  
+
+    print(f"💰 Your Total {CURRENCY.code} Value: {CURRENCY.label(format_large_number(total_value))}")  
+    print(f"🌍 Your Debt Paid:       {CURRENCY.label(format_large_number(paid))}")  
+    print(f"🌍 Remaining Global Debt: {CURRENCY.label(format_large_number(remaining))}")  
+    print(f"🌐 All Rigs' Debt Paid:  {CURRENCY.label(format_large_number(all_wallets_debt_paid()))}")  
+    print(f"🌐 All Rigs' {CURRENCY.code} Value: {CURRENCY.label(format_large_number(all_wallets_value()))}")  
+    print("-" * 40)  
+
+    print(f"Would you like to contribute Watts {CURRENCY.code} to the World Debt Wallet?")  
+    print("This will symbolically reduce global debt and log your node as a contributor.")  
+    choice = input("Type YES to proceed, or press Enter to cancel: ").strip()  
+
+    if choice != "YES":  
+        print("🛑 Cancelled.")  
+        return  
+
+    print("💡 Enter amount like 10.0 or 42.50 — no commas, no currency symbol.")  
+    try:  
+        amt_str = input("Amount to contribute: ").strip()  
+        if "$" in amt_str or "," in amt_str or CURRENCY.code in amt_str:  
+            print("⚠️ Please enter a clean number like 10.0 — no currency symbol or commas.")  
+            return  
+        amt = Decimal(amt_str)  
+    except:  
+        print("❌ Invalid number format.")  
+        return  
+
+    def apply(wallets):
+        payer, debt_wallet = wallets[wallet['wallet_id']], wallets[WORLD_DEBT_WALLET_ID]
+        if payer is None:
+            raise TransferError(f"Wallet '{wallet['wallet_id']}' not found.")
+        available = calculate_total_value(payer)  
+        if amt > available:  
+            raise TransferError(f"Not enough {CURRENCY.code}-backed balance. Max: {CURRENCY.label(format_large_number(available))}")  
+
+        proportion = amt / available  
+        payer['capsule_value_mb'] -= payer['capsule_value_mb'] * proportion  
+        payer['cache_value_mb'] -= payer['cache_value_mb'] * proportion  
+        payer['real_kwh'] -= payer['real_kwh'] * proportion  
+        payer['bandwidth_MBps'] -= payer['bandwidth_MBps'] * proportion  
+        payer['torrent_value_mb'] -= payer['torrent_value_mb'] * proportion  
+        payer[CURRENCY.debt_paid_key] += amt  
+
+        if debt_wallet:  
+            debt_wallet['capsule_value_mb'] += amt / MB_RATE  
+            debt_wallet['torrent_value_mb'] += amt / MB_RATE  
+
+    try:  
+        TRANSFERS.run([wallet['wallet_id'], WORLD_DEBT_WALLET_ID], apply)  
+    except TransferError as e:  
+        print(f"⚠️ {e}")  
+        return  
+    print(f"✅ Contributed {CURRENCY.label(format_large_number(amt))} to World Debt Wallet.")  
+    print("🌍 Your node has been logged as a symbolic contributor to planetary debt reduction.")
+
+def wallet_transaction_menu(wallet):
+    while True:
+        wallet = load_wallet(wallet['wallet_id'])
+        if not wallet:
+            break
+
+        show_rig_dashboard(wallet)  
+        
+        print("\n--- Wallet Actions ---")  
+        print("  1. Send Capsule MB")  
+        print("  2. Send Cache MB")  
+        print("  3. Send kWh")  
+        print("  4. Send Bandwidth")  
+        print(f"  5. Send Watts {CURRENCY.code}")  
+        print("  6. Send Torrent MB")  
+        print("  ----------------------------------------")  
+        print("  7. Donate Capsule MB to Creator (Gain Hash Power)")  
+        print("  8. Donate Cache MB to Creator (Gain Hash Power)")  
+        print("  9. Donate kWh to Creator (Gain Hash Power)")  
+        print(" 10. Donate Bandwidth to Creator (Gain Hash Power)")  
+        print(" 11. Donate Torrent MB to Creator (Gain Hash Power)")  
+        print("  ----------------------------------------")  
+        print(" 12. View Receive Info (Wallet/Node IDs)")  
+        print(" 13. Download Resource to File")  
+        print(" 14. Everything About the Rig (Download Info)")  
+        print(" 15. World Debt Payment Plan 🌎")  
+        print(" 16. Back to Main Menu")  
+        print(" 17. Access Internet Terminal (Node-Linked)")  
+        print(" 18. Batch Payroll (Pay Many Wallets from a CSV / JSON File)")  
+        for i, (label, _) in enumerate(WALLET_ACTIONS, 19):  
+            print(f" {i}. {label}")  
+        print("  ----------------------------------------")  
+
+        option = input("Enter option: ").strip()  
+
+        if option == "1":  
+            send_resource(wallet, "capsule_value_mb")  
+        elif option == "2":  
+            send_resource(wallet, "cache_value_mb")  
+        elif option == "3":  
+            send_resource(wallet, "real_kwh")  
+        elif option == "4":  
+            send_resource(wallet, "bandwidth_MBps")  
+        elif option == "5":  
+            send_resource(wallet, CURRENCY.value_key)  
+        elif option == "6":  
+            send_resource(wallet, "torrent_value_mb")  
+        elif option == "7":  
+            donate_for_hash(wallet, "capsule_value_mb")  
+        elif option == "8":  
+            donate_for_hash(wallet, "cache_value_mb")  
+        elif option == "9":  
+            donate_for_hash(wallet, "real_kwh")  
+        elif option == "10":  
+            donate_for_hash(wallet, "bandwidth_MBps")  
+        elif option == "11":  
+            donate_for_hash(wallet, "torrent_value_mb")  
+        elif option == "12":  
+            show_receive_info(wallet)  
+        elif option == "13":  
+            enhanced_download_resource_menu(wallet)  
+        elif option == "14":  
+            show_rig_download_info(wallet)  
+        elif option == "15":  
+            if wallet['wallet_id'] in [DONATION_WALLET_ID, WORLD_DEBT_WALLET_ID]:  
+                print("🛑 Cannot access the World Debt Payment Plan menu from a system wallet.")  
+            else:  
+                show_world_debt_payment_menu(wallet)  
+        elif option == "16": 
+            break  
+        elif option == "17":  
+            print(f"🌐 Launching Internet Terminal for Node: {wallet['node_id']}")  
+            run_internet_terminal(wallet)  
+        elif option == "18":  
+            payroll_menu(wallet)  
+        elif option.isdigit() and 19 <= int(option) < 19 + len(WALLET_ACTIONS):  
+            WALLET_ACTIONS[int(option) - 19][1](wallet)  
+        else:  
+            print("⚠️ Invalid option.")
+
+# --- Mining Start ---
+
+def start_mining(mining_type):
+    wallet = select_wallet_for_mining()
+    if wallet:
+        print(f"Starting {mining_type.upper()} Mining for wallet {wallet['wallet_id']}...")
+        unified_mining_loop(wallet, mining_type)
+
+# --- Wallet View Menu ---
+
+def view_wallets_rigs_menu():
+    wallet = select_wallet_or_rig()
+    if wallet:
+        wallet_transaction_menu(wallet)
+
+# --- Leaderboard ---
+
+def _leaderboard_seeded():
+    # Wallets nobody saved yet this session are read once; after that save_wallet keeps the board current
+    if not LEADERBOARD.seeded:
+        LEADERBOARD.seed(WALLET_STORE.wallet_ids(), load_wallet)
+    return LEADERBOARD
+
+def start_leaderboard_server(port=None, background=True):
+    """Serves the leaderboard as JSON on LEADERBOARD_HOST (one server per process); None if the port is taken."""
+    global LEADERBOARD_SERVER
+    if LEADERBOARD_SERVER is None:
+        server = LeaderboardServer(_leaderboard_seeded(), LEADERBOARD_HOST, port or LEADERBOARD_PORT)
+        try:
+            if not background:
+                print(f"🌐 Leaderboard JSON at {server.url}/leaderboard (Ctrl+C to stop)")
+            LEADERBOARD_SERVER = server.start(background)
+        except OSError as e:
+            print(f"⚠️ Could not serve the leaderboard on {server.url}: {e}")
+            return None
+        except KeyboardInterrupt:
+            server.close()
+            return None
+        atexit.register(LEADERBOARD_SERVER.close)
+    return LEADERBOARD_SERVER
+
+def leaderboard_menu():
+    board = _leaderboard_seeded()
+    totals = board.totals()
+    debt_key = CURRENCY.debt_paid_key
+
+    print("\n🏆 Manierism Megabytes Leaderboard 🏆")
+    print(f"⛏️ Rigs: {board.rig_count()}")
+    print(f"⚡ Total Hash Power: {format_large_number(totals['rig_hash_power'])} H/s")
+    print(f"📦 Total Capsule Value: {format_large_number(totals['capsule_value_mb'])} MB")
+    print(f"💰 Total {CURRENCY.code} Value: {CURRENCY.label(format_large_number(totals['total_value']))}")
+    print(f"🌍 Total Debt Paid: {CURRENCY.label(format_large_number(totals[debt_key]))}")
+
+    views = [("rig_hash_power", "⚡ Top Hash Power", lambda value: f"{format_large_number(value)} H/s"),
+             ("total_value", f"💰 Top {CURRENCY.code} Value", lambda value: CURRENCY.label(format_large_number(value))),
+             (debt_key, "🌍 Top Debt Payers", lambda value: CURRENCY.label(format_large_number(value)))]
+    for metric, title, show in views:
+        print("-" * 40)
+        print(title)
+        leaders = board.top(metric)
+        if not leaders:
+            print("  (no rigs yet)")
+        for rank, (wallet_id, rig_id, value) in enumerate(leaders, 1):
+            print(f"  {rank:>2}. {rig_id} ({wallet_id}): {show(value)}")
+    print("-" * 40)
+
+    if LEADERBOARD_SERVER is not None:
+        print(f"🌐 Serving JSON at {LEADERBOARD_SERVER.url}/leaderboard")
+        return
+    choice = input(f"Type S to serve this as JSON on http://{LEADERBOARD_HOST}:{LEADERBOARD_PORT}, or press Enter to go back: ").strip().upper()
+    if choice == "S":
+        server = start_leaderboard_server()
+        if server:
+            print(f"🌐 Serving JSON at {server.url}/leaderboard, {server.url}/leaderboard/<metric> and {server.url}/stats")
+
+# --- Main Menu ---
+
+def main_menu():
+    _initialize_special_wallets()
+    world_debt_node_value_generation()
+
+    while True:  
+        print(f"\n=== Manierism Megabytes Mining Menu{f' ({PLANT_NAME})' if PLANT_NAME else ''} ===")  
+        print(f"1. Start {MINING_LABEL} Mining (Select Rig)")  
+        print("2. Start Wi-Fi Mining (Select Rig)")  
+        print("3. Start SHA Capsule Mining (Select Rig)")  
+        print("4. Start Cache Mining (Select Rig)")  
+        print("5. Play Blackjack (Bet Files)🃏") 
+        print("6. Create New Rig / Wallet")  
+        print("7. View Wallets & Rigs / Wallet Actions")  
+        print("8. Exit")  
+        print("9. Multi-Rig Supervisor (Mine Several Rigs at Once)")  
+        print("10. Leaderboard & Network Totals 🏆")  
+        for i, (label, _) in enumerate(MENU_ACTIONS, 11):  
+            print(f"{i}. {label}")  
+        choice = input(f"Enter option (1-{10 + len(MENU_ACTIONS)}): ").strip()  
+
+        world_debt_node_value_generation()  
+
+        if choice == "1":  
+            start_mining(MINING_TYPES[0])  
+        elif choice == "2":  
+            start_mining("wifi")  
+        elif choice == "3":  
+            start_mining("sha")  
+        elif choice == "4":  
+            start_mining("cache")  
+        elif choice == "5": # New Blackjack option
+            # Need to select a wallet/rig to use for betting
+            rig_id = input("Enter Rig ID (Wallet Name) to use for betting: ").strip()  
+            # Attempt to load the wallet by ID or by the file path pattern
+            wallet_to_use = load_wallet(rig_id) or load_wallet(f"{rig_id}")
+            if not wallet_to_use:
+                print(f"⚠️ Wallet/Rig '{rig_id}' not found.")
+            else:
+                blackjack_game(wallet_to_use) # Call the game with the selected wallet
+        elif choice == "6":  
+            rig_id = input("Enter Rig ID or Wallet Name: ").strip()  
+            wallet_id = input("Enter Wallet ID: ").strip()  
+            new_wallet = create_wallet(wallet_id, rig_id)  
+            if new_wallet:  
+                print(f"✅ Created new wallet/rig: {rig_id} ({wallet_id}) with Node ID: {new_wallet['node_id']}")  
+                if ON_WALLET_CREATED is not None:  
+                    ON_WALLET_CREATED(new_wallet)  
+        elif choice == "7":  
+            view_wallets_rigs_menu()
+        elif choice == "8":
+            print("Exiting... 👋 See you later F&F ❤️")
+            if actuator_stats():
+                print(format_actuator_stats(actuator_stats()))
+            break
+        elif choice == "9":
+            start_supervisor_menu()
+        elif choice == "10":
+            leaderboard_menu()
+        elif choice.isdigit() and 11 <= int(choice) < 11 + len(MENU_ACTIONS):
+            MENU_ACTIONS[int(choice) - 11][1]()
+        else:
+            print("⚠️ Invalid selection.")
+
+# --- Runtime Launch ---
+
+def main(argv=None):
+    """
+    Entry point of every rig script: the main menu, `--supervise WALLET_ID[:type] ...`,
+    `--search-batch FILE|- [--wallet WALLET_ID] [--concurrency N]`, `--payroll FILE --wallet WALLET_ID`,
+    `--leaderboard-server [--port N]` or `--check-valuation`.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--check-valuation"]:
+        sys.exit(1 if check_valuation() else 0)
+    elif argv[:1] == ["--leaderboard-server"]:
+        options = dict(zip(argv[1::2], argv[2::2]))
+        start_leaderboard_server(int(options.get("--port", LEADERBOARD_PORT)), background=False)
+    elif argv[:1] == ["--payroll"] and len(argv) > 1:
+        options = dict(zip(argv[2::2], argv[3::2]))
+        wallet = load_wallet(options.get("--wallet", ""))
+        if wallet is None:
+            print(f"⚠️ Wallet '{options.get('--wallet', '')}' not found (--payroll FILE --wallet WALLET_ID).")
+            return
+        report = run_payroll(wallet, read_payroll(argv[1]))
+        sys.exit(0 if report and all(error is None for *_, error in report) else 1)
+    elif argv[:1] == ["--search-batch"] and len(argv) > 1:
+        options = dict(zip(argv[2::2], argv[3::2]))
+        wallet = load_wallet(options["--wallet"]) if "--wallet" in options else None
+        if "--wallet" in options and wallet is None:
+            print(f"⚠️ Wallet '{options['--wallet']}' not found.")
+            return
+        run_search_batch(_read_batch_lines(argv[1]), wallet, int(options.get("--concurrency", SEARCH_CONCURRENCY)))
+    elif argv[:1] == ["--supervise"]:
+        mining_types = {t.lower(): t for t in MINING_TYPES}
+        if not argv[1:]:
+            print(f"Usage: --supervise WALLET_ID[:{'|'.join(mining_types)}] ...")
+            sys.exit(2)
+        supervised_rigs = []
+        for arg in argv[1:]:
+            wallet_id, _, mining_type = arg.partition(":")
+            mining_type = mining_type or MINING_TYPES[0]
+            if mining_type.lower() not in mining_types:
+                print(f"⚠️ Unknown mining type '{mining_type}' for {wallet_id} (use {', '.join(MINING_TYPES)}).")
+                sys.exit(2)
+            supervised_rigs.append((wallet_id, mining_types[mining_type.lower()]))
+        _initialize_special_wallets()
+        run_supervisor(supervised_rigs)
+    else:
+        main_menu()
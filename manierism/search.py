@@ -0,0 +1,561 @@
+"""
+Internet terminal search client
+- One requests.Session per process with a keep-alive connection pool, so repeated searches and
+  page previews reuse their TCP / TLS connections; every request has a timeout
+- Search result pages are cached on disk (SQLite, search_cache.db) keyed by the normalized query
+  ("  Solar   PANELS " and "solar panels" share an entry), expire after `ttl` seconds and the
+  least recently used pages are evicted past `max_entries`
+- fetch() reports the bytes actually downloaded by that request (0 for a cache hit), so a
+  caller can burn MB per request instead of re-burning a running total
+- search() streams the page into an html.parser event handler (ResultExtractor) that keeps only
+  the li.b_algo title / snippet / link and stops parsing once max_results entries are in; the
+  rest of the body is still read so the page can be cached and the connection reused
+- search_many() runs a batch of queries on a thread pool with at most `concurrency` requests in
+  flight; repeated queries in a batch are fetched once
+- The search URL is configurable, so the client runs against a local stub server
+- Self-check against a stub server: python -m manierism.search --check
+- Parse time / peak memory against the BeautifulSoup path, over saved result pages (.html files
+  or a search_cache.db) or generated Bing-sized pages:
+  python -m manierism.search --bench [page.html | search_cache.db ...]
+"""
+
+import os
+import sys
+import time
+import codecs
+import sqlite3
+import threading
+from html.parser import HTMLParser
+
+BING_SEARCH_URL = "https://www.bing.com/search"
+CACHE_NAME = "search_cache.db"
+STREAM_CHUNK_SIZE = 16 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_pages (
+    query TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    html TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_search_pages_last_used ON search_pages (last_used);
+"""
+
+
+def normalize_query(query):
+    return " ".join(query.lower().split())
+
+
+class SearchPage:
+    def __init__(self, query, url, html, bytes_downloaded, from_cache):
+        self.query = query
+        self.url = url
+        self.html = html
+        self.bytes_downloaded = bytes_downloaded
+        self.from_cache = from_cache
+
+
+class SearchCache:
+    def __init__(self, db_path, ttl=3600.0, max_entries=256):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def get(self, key, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute("SELECT url, fetched_at, html FROM search_pages WHERE query = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE search_pages SET last_used = ? WHERE query = ?", (now, key))
+            self.hits += 1
+            return row[0], row[2]
+
+    def put(self, key, url, html, now=None):
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_pages (query, url, fetched_at, last_used, html) VALUES (?, ?, ?, ?, ?)",
+                (key, url, now, now, html)
+            )
+            # Expired pages go first, then the least recently used beyond max_entries
+            self._conn.execute("DELETE FROM search_pages WHERE fetched_at < ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM search_pages WHERE query NOT IN "
+                "(SELECT query FROM search_pages ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM search_pages").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SearchClient:
+    def __init__(self, cache_path=None, search_url=BING_SEARCH_URL, ttl=3600.0, max_entries=256,
+                 timeout=(5, 20), pool_size=4):
+        self.search_url = search_url
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.cache = SearchCache(cache_path, ttl, max_entries) if cache_path else None
+        self.requests_made = 0
+        self.bytes_downloaded = 0
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def get(self, url, **kwargs):
+        """A pooled GET with the client's timeout (page previews go through here too)."""
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.get(url, **kwargs)
+        with self._lock:
+            self.requests_made += 1
+            self.bytes_downloaded += len(response.content)
+        return response
+
+    def fetch(self, query, extractor=None):
+        """The result page for query; an extractor is fed the page while it streams in."""
+        key = normalize_query(query)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                if extractor is not None:
+                    extractor.feed(cached[1])
+                return SearchPage(key, cached[0], cached[1], 0, True)
+
+        response = self.session.get(self.search_url, params={"q": key}, timeout=self.timeout, stream=True)
+        try:
+            decoder = _incremental_decoder(response.encoding)
+            pieces, size = [], 0
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                size += len(chunk)
+                text = decoder.decode(chunk)
+                pieces.append(text)
+                if extractor is not None and not extractor.done:
+                    extractor.feed(text)
+            pieces.append(decoder.decode(b"", final=True))
+            if extractor is not None and not extractor.done:
+                extractor.feed(pieces[-1])
+        finally:
+            response.close()
+        with self._lock:
+            self.requests_made += 1
+            self.bytes_downloaded += size
+
+        page = SearchPage(key, response.url, "".join(pieces), size, False)
+        if self.cache is not None and response.status_code == 200:
+            self.cache.put(key, page.url, page.html)
+        return page
+
+    def search(self, query, max_results=5):
+        """(results, page): up to max_results {'title', 'snippet', 'link'} from the result page."""
+        extractor = ResultExtractor(max_results)
+        page = self.fetch(query, extractor)
+        extractor.close()
+        return extractor.results, page
+
+    def search_many(self, queries, max_results=5, concurrency=4):
+        """[(results, page, error)] per query, in order; requests run on `concurrency` threads."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        def search_one(query):
+            try:
+                results, page = self.search(query, max_results)
+                return results, page, None
+            except Exception as e:
+                return [], None, e
+
+        unique = list(dict.fromkeys(normalize_query(q) for q in queries))
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            outcomes = dict(zip(unique, executor.map(search_one, unique)))
+
+        batch, fetched = [], set()
+        for query in queries:
+            key = normalize_query(query)
+            results, page, error = outcomes[key]
+            if page is not None and key in fetched:
+                # Same page again in this batch: nothing more was downloaded for it
+                page = SearchPage(page.query, page.url, page.html, 0, True)
+            fetched.add(key)
+            batch.append((results, page, error))
+        return batch
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+def parse_batch_lines(lines):
+    """[(wallet_id or None, query)] from 'WALLET_ID | query' or plain 'query' lines; blanks and # comments skipped."""
+    jobs = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        wallet_id, separator, query = line.partition("|")
+        if separator:
+            jobs.append((wallet_id.strip() or None, query.strip()))
+        else:
+            jobs.append((None, line))
+    return [(wallet_id, query) for wallet_id, query in jobs if query]
+
+
+def _incremental_decoder(encoding):
+    try:
+        return codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+# --- Result extraction ---
+
+def parse_results(html, max_results=5):
+    """The original BeautifulSoup path: builds the whole tree, then takes the first results."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    results = []
+    for li in soup.find_all('li', {'class': 'b_algo'})[:max_results]:
+        title_tag = li.find('h2')
+        snippet_tag = li.find('p')
+        link_tag = title_tag.find('a') if title_tag else None
+        if title_tag:
+            title = title_tag.get_text(strip=True)
+            snippet = snippet_tag.get_text(strip=True) if snippet_tag else "No snippet available."
+            link = link_tag['href'] if link_tag else "No link"
+            results.append({'title': title, 'snippet': snippet, 'link': link})
+    return results
+
+
+class ResultExtractor(HTMLParser):
+    """
+    Same results as parse_results, from html.parser events: only the text of the first h2 and
+    p of each li.b_algo is kept, and everything after the max_results-th entry is ignored.
+    Feed it the page in pieces as they arrive; `done` turns True once it needs no more input.
+    """
+
+    def __init__(self, max_results=5):
+        super().__init__(convert_charrefs=True)
+        self.max_results = max_results
+        self.results = []
+        self.entries_seen = 0
+        self.done = max_results <= 0
+        self._li_depth = 0
+        self._entry = None
+        self._field = None
+        self._field_depth = 0
+        self._parts = []
+        self._text = []
+
+    def feed(self, data):
+        if not self.done:
+            super().feed(data)
+
+    def close(self):
+        if not self.done:
+            super().close()
+            if self._entry is not None:
+                self._end_entry()
+
+    def _flush_text(self):
+        # get_text(strip=True): every text node stripped on its own, empty ones dropped
+        if self._text:
+            text = "".join(self._text).strip()
+            if text:
+                self._parts.append(text)
+            self._text = []
+
+    def _end_field(self):
+        self._flush_text()
+        self._entry[self._field] = "".join(self._parts)
+        self._field = None
+
+    def _end_entry(self):
+        if self._field:
+            self._end_field()
+        entry, self._entry = self._entry, None
+        self._li_depth = 0
+        self.entries_seen += 1
+        if entry["h2"] is not None:
+            self.results.append({
+                'title': entry["h2"],
+                'snippet': entry["p"] if entry["p"] is not None else "No snippet available.",
+                'link': entry["link"] if entry["link"] is not None else "No link"
+            })
+        if self.entries_seen >= self.max_results:
+            self.done = True
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self._field:
+            self._flush_text()
+        if tag == "li":
+            if self._entry is not None:
+                self._li_depth += 1
+            elif "b_algo" in (dict(attrs).get("class") or "").split():
+                self._entry = {"h2": None, "p": None, "link": None}
+                self._li_depth = 1
+            return
+        if self._entry is None:
+            return
+        if self._field:
+            if tag == self._field:
+                self._field_depth += 1
+            elif tag == "a" and self._field == "h2" and self._entry["link"] is None:
+                self._entry["link"] = dict(attrs).get("href") or "No link"
+        elif tag in ("h2", "p") and self._entry[tag] is None:
+            self._field, self._field_depth, self._parts = tag, 1, []
+
+    def handle_endtag(self, tag):
+        if self.done or self._entry is None:
+            return
+        if self._field:
+            self._flush_text()
+            if tag == self._field:
+                self._field_depth -= 1
+                if self._field_depth == 0:
+                    self._end_field()
+                return
+        if tag == "li":
+            self._li_depth -= 1
+            if self._li_depth == 0:
+                self._end_entry()
+
+    def handle_data(self, data):
+        if self._field and not self.done:
+            self._text.append(data)
+
+    def handle_comment(self, data):
+        if self._field:
+            self._flush_text()
+
+
+def extract_results(chunks, max_results=5):
+    """Results from an iterable of HTML text pieces, reading no further than needed."""
+    extractor = ResultExtractor(max_results)
+    for chunk in chunks:
+        extractor.feed(chunk)
+        if extractor.done:
+            break
+    extractor.close()
+    return extractor.results
+
+
+# --- Stub server self-check ---
+
+def stub_result_page(query, results=8, padding=0):
+    items = "".join(
+        f'<li class="b_algo"><h2><a href="https://example.com/{i}">{query} result {i}</a></h2>'
+        f'<p>Snippet {i} for {query}</p></li>'
+        for i in range(1, results + 1)
+    )
+    return f'<html><body><ol id="b_results">{items}</ol>{"x" * padding}</body></html>'
+
+
+def start_stub_server(padding=0, delay=0.0):
+    """Bing-shaped result pages on 127.0.0.1, each after `delay` seconds; returns (server, search_url, stats)."""
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from urllib.parse import urlparse, parse_qs
+
+    stats = {"requests": 0, "connections": set(), "in_flight": 0, "max_in_flight": 0}
+    stats_lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query).get("q", [""])[0]
+            body = stub_result_page(query, padding=padding).encode()
+            with stats_lock:
+                stats["requests"] += 1
+                stats["connections"].add(self.client_address)
+                stats["in_flight"] += 1
+                stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+            time.sleep(delay)
+            with stats_lock:
+                stats["in_flight"] -= 1
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/search", stats
+
+
+def self_check():
+    import tempfile
+    server, url, stats = start_stub_server(padding=100_000)
+    ok = True
+
+    def check(label, passed):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = SearchClient(os.path.join(tmp, CACHE_NAME), search_url=url, ttl=60, max_entries=3)
+        results, page = client.search("Solar  Panels", max_results=5)
+        check(f"Parsed {len(results)} results from the stub page", len(results) == 5 and results[0]["link"] == "https://example.com/1")
+        check(f"First fetch downloaded {page.bytes_downloaded:,} bytes", page.bytes_downloaded == len(stub_result_page("solar panels", padding=100_000)))
+
+        _, page = client.search("solar panels")
+        check("Normalized repeat query served from cache with 0 bytes", page.from_cache and page.bytes_downloaded == 0)
+
+        burned = []
+        for i in range(5):
+            burned.append(client.fetch(f"query {i}").bytes_downloaded)
+        check("Per-request bytes stay flat (no running-total re-burn)", max(burned) - min(burned) <= 2)
+        check(f"Cache capped at max_entries ({len(client.cache)} pages)", len(client.cache) == 3)
+        check("Least recently used page evicted", client.fetch("solar panels").from_cache is False)
+        check(f"{stats['requests']} requests over {len(stats['connections'])} keep-alive connection(s)", len(stats["connections"]) == 1)
+
+        client.cache.ttl = 0
+        time.sleep(0.01)
+        check("Expired page fetched again", client.fetch("query 4").from_cache is False)
+        client.close()
+    server.shutdown()
+
+    server, url, stats = start_stub_server(delay=0.2)
+    client = SearchClient(search_url=url, pool_size=4)
+    queries = [f"batch query {i}" for i in range(12)] + ["Batch  Query 3"]
+    start = time.perf_counter()
+    batch = client.search_many(queries, concurrency=4)
+    elapsed = time.perf_counter() - start
+    check(f"Batch of {len(queries)} queries in {elapsed:.2f} s at concurrency 4 (serial: {12 * 0.2:.1f} s)",
+          all(error is None and len(results) == 5 for results, _, error in batch) and elapsed < 12 * 0.2 / 2)
+    check(f"At most 4 requests in flight (saw {stats['max_in_flight']})", stats["max_in_flight"] <= 4)
+    check("Repeated query fetched once and burns nothing the second time",
+          stats["requests"] == 12 and batch[-1][1].bytes_downloaded == 0 and batch[3][1].bytes_downloaded > 0)
+    check("Batch lines parsed", parse_batch_lines(["WM-1 | solar panels", "wind", "# note", " | x", ""]) ==
+          [("WM-1", "solar panels"), (None, "wind"), (None, "x")])
+    client.close()
+    server.shutdown()
+    return ok
+
+
+# --- Parser benchmark ---
+
+def synthetic_result_page(query, results=10, seed=0):
+    """A Bing-sized page: ~150 KB of inline CSS / JS up front, ads, deep links and a long footer."""
+    import random
+    rng = random.Random(seed)
+    css = "".join(f".b_c{i}{{margin:{i % 9}px;color:#{rng.randrange(16 ** 6):06x}}}" for i in range(1500))
+    js = "".join(f"var v{i}=function(a,b){{return a<b?'<li class=\\'x\\'>':b}};" for i in range(2000))
+    nav = "".join(f'<li><a href="/nav/{i}">Nav {i}</a></li>' for i in range(60))
+    items = []
+    for i in range(1, results + 1):
+        if i % 4 == 0:
+            items.append(f'<li class="b_ad"><h2><a href="https://ads.example/{i}">Sponsored {query}</a></h2><p>Ad copy</p></li>')
+        deep = "".join(f'<li><a href="https://site{i}.example/{query}/{d}">Deep link {d}</a></li>' for d in range(4))
+        items.append(
+            f'<li class="b_algo" data-bm="{i}"><div class="b_tpcn"><a class="tilk" href="https://site{i}.example/">'
+            f'<div class="tptt">site{i}.example</div></a></div>'
+            f'<h2><a href="https://site{i}.example/{query.replace(" ", "-")}" h="ID=SERP,{i}">{query.title()} '
+            f'<strong>guide</strong> &amp; tips #{i}</a></h2>'
+            f'<div class="b_caption"><p class="b_lineclamp2">Everything about <strong>{query}</strong>, '
+            f'part {i} <!-- c --> of the series &mdash; {"lorem ipsum " * rng.randint(5, 30)}</p>'
+            f'<ul class="b_vList">{deep}</ul></div></li>'
+        )
+    footer = "".join(f'<a href="/footer/{i}">Footer link {i}</a> ' for i in range(3000))
+    return (f'<!DOCTYPE html><html><head><title>{query} - Search</title><style>{css}</style>'
+            f'<script>{js}</script></head><body><header><ul>{nav}</ul></header>'
+            f'<main><ol id="b_results">{"".join(items)}</ol></main><footer>{footer}</footer></body></html>')
+
+
+def load_saved_pages(paths):
+    """[(name, html)] from saved .html files and search_cache.db files."""
+    pages = []
+    for path in paths:
+        if path.endswith(".db"):
+            conn = sqlite3.connect(path)
+            pages.extend(conn.execute("SELECT query, html FROM search_pages ORDER BY last_used DESC"))
+            conn.close()
+        else:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def _measure(fn, repeats):
+    import tracemalloc
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, min(timings), peak
+
+
+def benchmark_parsers(pages, max_results=5, repeats=5):
+    rows = []
+    for name, html in pages:
+        chunks = [html[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(html), STREAM_CHUNK_SIZE)]
+        expected, soup_seconds, soup_peak = _measure(lambda: parse_results(html, max_results), repeats)
+        streamed, stream_seconds, stream_peak = _measure(lambda: extract_results(chunks, max_results), repeats)
+        rows.append({
+            "page": name, "kb": len(html.encode("utf-8")) / 1024, "results": len(streamed),
+            "match": streamed == expected,
+            "soup_ms": soup_seconds * 1000, "soup_peak_kb": soup_peak / 1024,
+            "stream_ms": stream_seconds * 1000, "stream_peak_kb": stream_peak / 1024,
+        })
+    return rows
+
+
+def print_benchmark(rows):
+    for row in rows:
+        print(f"📄 {row['page'][:30]:<30} {row['kb']:8.1f} KB  {row['results']} results  "
+              f"{'✅ same results' if row['match'] else '❌ results differ'}")
+        print(f"   BeautifulSoup {row['soup_ms']:8.2f} ms  peak {row['soup_peak_kb']:9.1f} KB")
+        print(f"   streaming     {row['stream_ms']:8.2f} ms  peak {row['stream_peak_kb']:9.1f} KB  "
+              f"({row['soup_ms'] / row['stream_ms']:.1f}x faster, {row['soup_peak_kb'] / max(row['stream_peak_kb'], 1):.1f}x less memory)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--check" in args:
+        sys.exit(0 if self_check() else 1)
+    if "--bench" in args:
+        paths = [a for a in args if a != "--bench"]
+        pages = load_saved_pages(paths) if paths else [(q, synthetic_result_page(q, seed=n)) for n, q in enumerate(["solar panels", "wind turbine kits"])]
+        rows = benchmark_parsers(pages)
+        print_benchmark(rows)
+        sys.exit(0 if all(row["match"] for row in rows) else 1)
+    print("Usage: python -m manierism.search --check | --bench [page.html | search_cache.db ...]")
@@ -0,0 +1,304 @@
+"""
+Headless mining simulator
+- Replays a rig script's mining_tick rules for N ticks with no sleeps, prints, GPIO emission or
+  wallet writes: --rig runs the script up to its rig.configure() call and takes the RewardPolicy
+  (HalvingPolicy / EpochDecayPolicy, Eginma and fixed 12V rolls included), currency, mining types
+  and tick pause it hands over, without opening the rig's folder or stores
+- Rolls come from the policy's own base_roll and multiplier, and CUSTOM_REWARDS, the torrent
+  capsules, hash growth and resource rates from manierism.rig, so the replay follows the live rules
+- Seedable: draws from random.Random in the same order as the real loop, including the
+  randint(*tick_seconds) sleep, which becomes simulated elapsed seconds
+- Every quantity is tracked as log10 so cache / SHA rigs never overflow, whatever the runtime
+- Writes a compact CSV time series (one row every `every` ticks)
+- Self-check against rig.mining_tick on the same seed, every mining type of the rig:
+  python -m manierism.simulator --rig vodka.py --check
+
+Usage: python -m manierism.simulator --rig vodka.py --ticks 1000000 --type cache --seed 1 --out series.csv
+"""
+
+import os
+import sys
+import math
+import time
+import runpy
+import random
+import inspect
+import argparse
+from decimal import Decimal
+
+from manierism import rig
+
+LOG10 = math.log10
+NEG_INF = float("-inf")
+
+DEFAULT_RIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "run.py")
+
+BASE_HASH_POWER = float(rig.BASE_HASH_POWER)
+HASH_GROWTH_RATE = float(rig.HASH_GROWTH_RATE)
+OVERLAY_FACTOR = float(rig.overlay_formula(Decimal("1")))
+USD_RATES = {key: float(rate) for key, rate in rig.USD_RATES.items()}
+CUSTOM_REWARDS = rig.CUSTOM_REWARDS
+TORRENT_CAPSULES = rig.TORRENT_CAPSULES
+
+SERIES_KEYS = ["rig_hash_power", "capsule_value_mb", "cache_value_mb", "real_kwh", "bandwidth_MBps", "torrent_value_mb"]
+
+
+class _Configured(Exception):
+    pass
+
+
+def load_rig(script=DEFAULT_RIG):
+    """The arguments a rig script passes to rig.configure(), defaults filled in; the script stops there."""
+    signature = inspect.signature(rig.configure)
+    captured = {}
+
+    def capture(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        captured.update(arguments.arguments)
+        raise _Configured
+
+    configure, rig.configure = rig.configure, capture
+    try:
+        runpy.run_path(script, run_name="__simulator__")
+    except _Configured:
+        pass
+    finally:
+        rig.configure = configure
+    if not captured:
+        raise ValueError(f"{script} never calls rig.configure()")
+    captured["mining_types"] = rig.rig_mining_types(captured["primary_mining"])
+    return captured
+
+
+def log_add(a, b):
+    """log10(10^a + 10^b) without leaving log space."""
+    if a < b:
+        a, b = b, a
+    if b == NEG_INF:
+        return a
+    d = b - a
+    if d < -17:
+        return a
+    return a + LOG10(1 + 10 ** d)
+
+
+def to_log(value):
+    value = float(value)
+    return LOG10(value) if value > 0 else NEG_INF
+
+
+def format_log(log_value):
+    """Arbitrary-magnitude scientific notation for a log10 value."""
+    if log_value == NEG_INF:
+        return "0"
+    exponent = math.floor(log_value)
+    return f"{10 ** (log_value - exponent):.6f}e{exponent}"
+
+
+def total_value_log(state, rates=USD_RATES):
+    total = NEG_INF
+    for key, rate in rates.items():
+        total = log_add(total, state[key] + LOG10(rate))
+    return total
+
+
+class MiningSimulator:
+    def __init__(self, policy, mining_type="cpu", seed=None, wallet=None, debug_sha_boost=rig.DEBUG_SHA_BOOST,
+                 tick_seconds=(5, 150), currency=rig.USD):
+        self.policy = policy
+        self.mining_type = mining_type
+        self.rng = random.Random(seed)
+        self.debug_sha_boost = debug_sha_boost
+        self.tick_seconds = tuple(tick_seconds)
+        self.currency = currency
+        self.rates = {key: float(currency.convert(rate)) for key, rate in rig.USD_RATES.items()}
+        wallet = wallet or {}
+        self.state = {key: to_log(wallet.get(key, 0)) for key in SERIES_KEYS}
+        if self.state["rig_hash_power"] == NEG_INF:
+            self.state["rig_hash_power"] = LOG10(BASE_HASH_POWER)
+        # What the policy keeps on the wallet between ticks (blocks_mined for epoch rigs)
+        self.wallet = {"wallet_id": wallet.get("wallet_id", "SIMULATOR")}
+        if "blocks_mined" in wallet:
+            self.wallet["blocks_mined"] = Decimal(str(wallet["blocks_mined"]))
+        self.tick_count = 0
+        self.elapsed_seconds = 0
+
+    def step(self, ticks):
+        # Hoisted lookups: this loop is the whole point of the module
+        rng = self.rng
+        choice, randint = rng.choice, rng.randint
+        policy, wallet, state = self.policy, self.wallet, self.state
+        base_roll, multiplier = policy.base_roll, policy.multiplier
+        log_of = {}  # Decimal roll / multiplier -> log10; both take a handful of values
+        log_base = LOG10(BASE_HASH_POWER)
+        log_growth = LOG10(1 + HASH_GROWTH_RATE)
+        log_sha = LOG10(1.25)
+        log_overlay = LOG10(OVERLAY_FACTOR)
+        log_half = LOG10(0.5)
+        log_rolls = [NEG_INF] + [LOG10(r) for r in range(1, 16)]
+        is_cache = self.mining_type == "cache"
+        is_sha = self.mining_type == "sha"
+        sleep_seconds = self.tick_seconds
+
+        for _ in range(ticks):
+            policy.prepare(wallet)
+            if self.tick_count == 0:
+                policy.start_session(wallet)
+            capsule_type = choice(CUSTOM_REWARDS)
+            if self.debug_sha_boost and self.tick_count == 0 and is_sha:
+                capsule_type = "SHA"
+            block_multiplier = multiplier(wallet)
+            log_multiplier = log_of.get(block_multiplier)
+            if log_multiplier is None:
+                log_multiplier = log_of[block_multiplier] = to_log(block_multiplier)
+
+            # effective = permanent x (1 + cache / 1000)
+            log_hash = state["rig_hash_power"]
+            bonus = state["cache_value_mb"] - 3
+            log_effective = log_hash + (bonus if bonus > 17 else LOG10(1 + 10 ** bonus))
+            log_scaling = log_effective - log_base + log_multiplier
+
+            if is_sha and capsule_type == "SHA":
+                log_hash += log_sha
+
+            roll = base_roll(capsule_type, rng)
+            log_roll = log_of.get(roll)
+            if log_roll is None:
+                log_roll = log_of[roll] = to_log(roll)
+            log_reward = log_roll + log_scaling
+            log_bandwidth = log_rolls[randint(1, 15)] + log_scaling
+
+            state["rig_hash_power"] = log_hash + log_growth
+            if is_cache:
+                state["cache_value_mb"] = log_add(state["cache_value_mb"], log_reward)
+            state["capsule_value_mb"] = log_add(state["capsule_value_mb"], log_reward)
+            state["real_kwh"] = log_add(state["real_kwh"], log_reward + log_overlay)
+            state["bandwidth_MBps"] = log_add(state["bandwidth_MBps"], log_bandwidth)
+            if capsule_type.lower() in TORRENT_CAPSULES:
+                state["torrent_value_mb"] = log_add(state["torrent_value_mb"], log_reward + log_half)
+
+            policy.after_tick(wallet)
+            self.tick_count += 1
+            self.elapsed_seconds += randint(*sleep_seconds)
+
+    def snapshot(self):
+        row = {"tick": self.tick_count, "elapsed_hours": self.elapsed_seconds / 3600}
+        for key in SERIES_KEYS:
+            row[key] = format_log(self.state[key])
+        row["total_value"] = format_log(total_value_log(self.state, self.rates))
+        return row
+
+
+def simulate(rig_config, ticks=None, mining_type=None, seed=None, wallet=None, every=1000, out_path=None):
+    """Runs the simulator on load_rig()'s settings and returns the sampled time series (also written as CSV if out_path is set)."""
+    policy = rig_config["policy"]
+    sim = MiningSimulator(policy, mining_type or rig_config["mining_types"][0], seed, wallet,
+                          tick_seconds=rig_config["tick_seconds"], currency=rig_config["currency"])
+    if ticks is None:
+        ticks = policy.total_years * 365
+    series = [sim.snapshot()]
+    while sim.tick_count < ticks:
+        sim.step(min(every, ticks - sim.tick_count))
+        series.append(sim.snapshot())
+
+    if out_path:
+        columns = list(series[0].keys())
+        with open(out_path, "w") as f:
+            f.write(",".join(columns) + "\n")
+            for row in series:
+                f.write(",".join(str(row[c]) if c != "elapsed_hours" else f"{row[c]:.3f}" for c in columns) + "\n")
+    return series
+
+
+# --- Self-check ---
+
+def _decimal_log(value):
+    # Decimal.log10 keeps the live wallet's cache values comparable past float range
+    value = Decimal(str(value))
+    return float(value.log10()) if value > 0 else NEG_INF
+
+
+def self_check(script=DEFAULT_RIG, ticks=10, seed=7, rel_tol=1e-9):
+    """Replays `ticks` ticks of every mining type through rig.mining_tick and the simulator on one seed."""
+    import shutil
+    import tempfile
+
+    ok = True
+
+    def check(label, passed):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    rig_config = load_rig(script)
+    options = {key: value for key, value in rig_config.items() if key != "mining_types"}
+    basedir = tempfile.mkdtemp(prefix="simulator_check_")
+    try:
+        rig.configure(**dict(options, basedir=basedir))
+        for mining_type in rig_config["mining_types"]:
+            wallet = rig.create_wallet(f"SIM-{mining_type}")
+            random.seed(seed)
+            elapsed = 0
+            for tick in range(ticks):
+                rig.mining_tick(wallet, mining_type, tick, verbose=False)
+                elapsed += random.randint(*rig.TICK_SECONDS)
+
+            sim = MiningSimulator(rig_config["policy"], mining_type, seed, tick_seconds=rig_config["tick_seconds"],
+                                  currency=rig_config["currency"])
+            sim.step(ticks)
+            worst = max(
+                abs(sim.state[key] - _decimal_log(wallet.get(key, 0))) if wallet.get(key, 0) else abs(sim.state[key] - NEG_INF)
+                for key in SERIES_KEYS
+            )
+            # log10 difference d means a relative error of about d * ln(10)
+            check(f"{mining_type:<8} {ticks} ticks match rig.mining_tick (max relative error {worst * math.log(10):.2e})",
+                  worst * math.log(10) <= rel_tol and sim.elapsed_seconds == elapsed)
+    finally:
+        rig.TRANSFERS.close()
+        rig.EMISSION_LOG.flush(timeout=5)
+        rig.WALLET_STORE.close()
+        shutil.rmtree(basedir, ignore_errors=True)
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Manierism mining simulator")
+    parser.add_argument("--rig", default=DEFAULT_RIG, help="rig script whose reward rules to replay (default: run.py)")
+    parser.add_argument("--ticks", type=int, default=None, help="ticks to simulate (default: the policy's full lifespan)")
+    parser.add_argument("--type", default=None, help="one of the rig's mining types (default: its primary type)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--every", type=int, default=1000, help="ticks between time series rows")
+    parser.add_argument("--wallet", default=None, help="start from an exported {wallet_id}_wallet.json")
+    parser.add_argument("--out", default=None, help="CSV output path")
+    parser.add_argument("--check", action="store_true", help="compare against rig.mining_tick and exit")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        sys.exit(0 if self_check(args.rig) else 1)
+
+    rig_config = load_rig(args.rig)
+    if args.type is not None and args.type not in rig_config["mining_types"]:
+        parser.error(f"--type must be one of {', '.join(rig_config['mining_types'])} for {os.path.basename(args.rig)}")
+
+    wallet = None
+    if args.wallet:
+        import json
+        with open(args.wallet) as f:
+            wallet = json.load(f)
+
+    start = time.perf_counter()
+    series = simulate(rig_config, args.ticks, args.type, args.seed, wallet, args.every, args.out)
+    elapsed = time.perf_counter() - start
+    final = series[-1]
+    currency = rig_config["currency"]
+    print(f"✅ Simulated {final['tick']:,} ticks ({final['elapsed_hours']:,.1f} rig hours) in {elapsed:.2f} seconds "
+          f"— {final['tick'] / elapsed * 60:,.0f} ticks/minute")
+    print(f"🌠 H/s (Permanent): {final['rig_hash_power']}")
+    print(f"💰 Total {currency.code} Value: {currency.label(final['total_value'])}")
+    if args.out:
+        print(f"📈 Time series written to {args.out}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
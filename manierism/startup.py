@@ -0,0 +1,152 @@
+"""
+Rig cold-start benchmark
+- Runs each rig script in a fresh interpreter under -X importtime, times how long it takes for
+  the main menu prompt to appear, then answers the menu's Exit option
+- Reports the median / best time-to-menu over a few runs, the import time, the slowest top-level
+  imports and whether the web stack (requests, bs4, flask) or RPi.GPIO was imported or probed
+  before the menu (-X importtime also lists imports that failed, such as RPi.GPIO off the Pi)
+- The scripts start for real: they open their rigs folder and initialize the special wallets
+  exactly like a user launching them
+
+Usage: python -m manierism.startup [--runs 3] [--json startup.json] [script ...]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (script, main menu Exit option)
+DEFAULT_SCRIPTS = [
+    ("run.py", "8"), ("run_windows.py", "8"), ("vodka.py", "8"), ("vodak_windows.py", "8"),
+    ("Vodak_jsonbin.py", "8"), ("uv.py", "8"), ("uv_windows.py", "8"),
+    ("Free_flowing_energy_andriod.py", "8"), ("Minea12voltbattery_andriod.py", "8"),
+    ("sun_egp.py", "8"), ("sunlight_egp.py", "8"),
+    ("Freehomes USD payment token rig.py", "8"), ("Trading card rig.py", "8"),
+    ("Manierism megabyte xmrig", "10"),
+]
+EXIT_OPTIONS = dict(DEFAULT_SCRIPTS)
+
+MENU_PROMPT = b"Enter option"
+DEFERRED_MODULES = ["requests", "bs4", "flask", "RPi.GPIO"]
+
+
+def parse_importtime(stderr_text):
+    """-X importtime lines -> [(module, self_us, cumulative_us, depth)]"""
+    imports = []
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            name = name[1:]
+            depth = (len(name) - len(name.lstrip(" "))) // 2
+            imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+        except ValueError:
+            continue
+    return imports
+
+
+def time_to_menu(script, exit_option="8", timeout=120.0):
+    """One cold start: (seconds until the menu prompt or None, parsed importtime records)"""
+    path = os.path.join(REPO_DIR, script) if not os.path.isabs(script) else script
+    with tempfile.TemporaryFile() as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "-X", "importtime", "-u", path],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=err,
+                                cwd=os.path.dirname(path))
+        watchdog = threading.Timer(timeout, proc.kill)
+        watchdog.start()
+        try:
+            seen, menu_seconds = b"", None
+            while True:
+                chunk = os.read(proc.stdout.fileno(), 65536)
+                if not chunk:
+                    break
+                seen += chunk
+                if MENU_PROMPT in seen:
+                    menu_seconds = time.perf_counter() - start
+                    break
+            try:
+                if menu_seconds is not None:
+                    proc.stdin.write(f"{exit_option}\n".encode())
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            proc.stdout.read()
+            proc.wait()
+        finally:
+            watchdog.cancel()
+        err.seek(0)
+        imports = parse_importtime(err.read().decode("utf-8", errors="replace"))
+    return menu_seconds, imports
+
+
+def benchmark(script, exit_option="8", runs=3, top=5):
+    timings, imports = [], []
+    for _ in range(runs):
+        seconds, imports = time_to_menu(script, exit_option)
+        if seconds is None:
+            return {"script": script, "error": "exited before the main menu"}
+        timings.append(seconds)
+    top_level = sorted((i for i in imports if i[3] == 0), key=lambda i: i[2], reverse=True)
+    loaded = {i[0] for i in imports}
+    return {
+        "script": script,
+        "runs": runs,
+        "menu_ms_median": statistics.median(timings) * 1000,
+        "menu_ms_best": min(timings) * 1000,
+        "import_ms": sum(i[2] for i in top_level) / 1000,
+        "slowest_imports": [(name, cumulative / 1000) for name, _, cumulative, _ in top_level[:top]],
+        "deferred_imported": [m for m in DEFERRED_MODULES if m in loaded],
+    }
+
+
+def print_result(result):
+    if "error" in result:
+        print(f"❌ {result['script']}: {result['error']}")
+        return
+    print(f"⏱️ {result['script']:<36} menu in {result['menu_ms_median']:7.1f} ms "
+          f"(best {result['menu_ms_best']:.1f}, {result['runs']} runs), imports {result['import_ms']:6.1f} ms")
+    print("   slowest: " + ", ".join(f"{name} {ms:.1f} ms" for name, ms in result["slowest_imports"]))
+    if result["deferred_imported"]:
+        print(f"   ⚠️ imported or probed before the menu: {', '.join(result['deferred_imported'])}")
+    else:
+        print(f"   ✅ {' / '.join(DEFERRED_MODULES)} not imported or probed before the menu")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start time of each rig script's main menu")
+    parser.add_argument("scripts", nargs="*", help="rig scripts (default: every rig script in the repo)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5, help="slowest top-level imports to show")
+    parser.add_argument("--exit-option", default=None, help="main menu Exit option for the given scripts")
+    parser.add_argument("--json", default=None, help="append the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    scripts = [(s, args.exit_option or EXIT_OPTIONS.get(os.path.basename(s), "8")) for s in args.scripts] or DEFAULT_SCRIPTS
+    results = []
+    for script, exit_option in scripts:
+        result = benchmark(script, exit_option, args.runs, args.top)
+        print_result(result)
+        results.append(result)
+
+    if args.json:
+        history = []
+        if os.path.exists(args.json):
+            with open(args.json, "r") as f:
+                history = json.load(f)
+        history.append({"timestamp": time.time(), "python": sys.version.split()[0], "results": results})
+        with open(args.json, "w") as f:
+            json.dump(history, f, indent=4)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,207 @@
+"""
+Multi-rig mining supervisor
+- Mines many wallets from one process, one worker thread per rig, all sharing the rig
+  script's wallet store and emission log writer (threads, not processes: the resident
+  wallet store allows one writer process per rigs folder)
+- Every rig has its own mining_type
+- The rig script supplies tick(wallet_id, mining_type, tick_index) -> {"hash_power", "total_usd"}
+- A rig whose tick raises is retried with a backoff and retired after `max_failures` in a row;
+  the other rigs keep mining
+- SIGINT / SIGTERM set a stop event: every worker finishes its current tick (the wallet is
+  saved) and exits instead of being interrupted mid-save
+- status() gives live aggregate H/s and USD throughput
+- Self-check: a tick mined on a worker thread saves the same wallet as one on the main thread,
+  down to the last of 200 digits: python -m manierism.supervisor --check
+"""
+
+import sys
+import time
+import random
+import signal
+import threading
+from decimal import Decimal, Context, localcontext
+
+
+class RigStats:
+    def __init__(self, wallet_id, mining_type):
+        self.wallet_id = wallet_id
+        self.mining_type = mining_type
+        self.ticks = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error = None
+        self.state = "starting"
+        self.hash_power = Decimal("0")
+        self.start_usd = None
+        self.total_usd = Decimal("0")
+
+
+class MiningSupervisor:
+    def __init__(self, tick, rigs, max_ticks=75 * 365, sleep_range=(5, 150), max_failures=5, retry_delay=30.0):
+        """rigs: [(wallet_id, mining_type), ...]"""
+        self.tick = tick
+        self.max_ticks = max_ticks
+        self.sleep_range = sleep_range
+        self.max_failures = max_failures
+        self.retry_delay = retry_delay
+        self.stop_event = threading.Event()
+        self.rigs = {wallet_id: RigStats(wallet_id, mining_type) for wallet_id, mining_type in rigs}
+        self._threads = []
+        self._started_at = None
+
+    # --- Workers ---
+
+    def _run_rig(self, stats):
+        stats.state = "mining"
+        while not self.stop_event.is_set() and stats.ticks < self.max_ticks:
+            try:
+                result = self.tick(stats.wallet_id, stats.mining_type, stats.ticks)
+            except Exception as e:
+                stats.failures += 1
+                stats.consecutive_failures += 1
+                stats.last_error = f"{type(e).__name__}: {e}"
+                if stats.consecutive_failures >= self.max_failures:
+                    stats.state = "failed"
+                    print(f"❌ Rig {stats.wallet_id} retired after {stats.consecutive_failures} failed ticks: {stats.last_error}")
+                    return
+                stats.state = "retrying"
+                self.stop_event.wait(self.retry_delay * stats.consecutive_failures)
+                continue
+            if result is None:
+                stats.state = "stopped"
+                print(f"⚠️ Rig {stats.wallet_id}: wallet disappeared, stopping this rig.")
+                return
+            stats.consecutive_failures = 0
+            stats.state = "mining"
+            stats.ticks += 1
+            stats.hash_power = result["hash_power"]
+            stats.total_usd = result["total_usd"]
+            if stats.start_usd is None:
+                stats.start_usd = result["total_usd"]
+            self.stop_event.wait(random.randint(*self.sleep_range))
+        stats.state = "done" if stats.ticks >= self.max_ticks else "stopped"
+
+    def start(self):
+        self._started_at = time.monotonic()
+        for stats in self.rigs.values():
+            thread = threading.Thread(target=self._run_rig, args=(stats,), name=f"rig-{stats.wallet_id}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self.stop_event.set()
+
+    def join(self, timeout=None):
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    # --- Live stats ---
+
+    def status(self):
+        rigs = list(self.rigs.values())
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        gained = sum((r.total_usd - r.start_usd for r in rigs if r.start_usd is not None), Decimal("0"))
+        return {
+            "rigs": len(rigs),
+            "mining": sum(r.state == "mining" for r in rigs),
+            "failed": sum(r.state == "failed" for r in rigs),
+            "ticks": sum(r.ticks for r in rigs),
+            "hash_power": sum((r.hash_power for r in rigs), Decimal("0")),
+            "total_usd": sum((r.total_usd for r in rigs), Decimal("0")),
+            "usd_per_minute": gained / Decimal(elapsed / 60) if elapsed > 0 else Decimal("0"),
+            "elapsed": elapsed,
+        }
+
+    # --- Foreground run ---
+
+    def run(self, status_interval=30.0, on_status=None):
+        """Starts the rigs and blocks until they finish or SIGINT / SIGTERM arrives."""
+        handlers = {}
+
+        def request_stop(signum, frame):
+            if not self.stop_event.is_set():
+                print(f"\n⛔ {signal.Signals(signum).name} received — finishing current ticks...")
+            self.stop_event.set()
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                handlers[signum] = signal.signal(signum, request_stop)
+            except ValueError:  # not the main thread
+                pass
+        try:
+            self.start()
+            next_status = time.monotonic() + status_interval
+            while self.running() and not self.stop_event.is_set():
+                self.stop_event.wait(1.0)
+                if on_status and time.monotonic() >= next_status:
+                    on_status(self)
+                    next_status += status_interval
+            self.join()
+            if on_status:
+                on_status(self)
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+        return self.status()
+
+
+# --- Self-check ---
+
+def self_check():
+    import shutil
+    import tempfile
+    from manierism import rig
+    from manierism.ledger import to_units, from_units
+    from manierism.policies import HalvingPolicy
+
+    ok = True
+
+    def check(label, passed):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    big = Decimal("123456789012345678901234567890.123456")
+    with localcontext(Context(prec=28)):
+        check("Ledger conversions are exact at Python's default 28 digits", from_units(to_units(big)) == big)
+
+    basedir = tempfile.mkdtemp(prefix="supervisor_check_")
+    try:
+        rig.configure(HalvingPolicy(), basedir=basedir)
+        rig._initialize_special_wallets()
+        for wallet_id in ("MAIN", "WORKER"):
+            wallet = rig.create_wallet(wallet_id, wallet_id)
+            wallet["capsule_value_mb"] = big
+            rig.save_wallet(wallet)
+
+        def seeded_tick(wallet_id, mining_type, tick_index):
+            random.seed(2025)
+            return rig._supervised_tick(wallet_id, mining_type, tick_index)
+
+        seeded_tick("MAIN", "cpu", 0)
+        supervisor = MiningSupervisor(seeded_tick, [("WORKER", "cpu")], max_ticks=1, sleep_range=(0, 0))
+        supervisor.start()
+        supervisor.join(60)
+        check("Worker thread finished its tick", supervisor.rigs["WORKER"].ticks == 1)
+
+        main, worker = rig.load_wallet("MAIN"), rig.load_wallet("WORKER")
+        differing = [key for key, value in main.items() if isinstance(value, Decimal) and worker.get(key) != value]
+        check(f"Worker tick saved the same wallet as the main-thread tick ({main['capsule_value_mb']})", not differing)
+        if differing:
+            for key in differing:
+                print(f"   {key}: main {main[key]} / worker {worker[key]}")
+    finally:
+        rig.TRANSFERS.close()
+        rig.EMISSION_LOG.flush(timeout=5)
+        rig.WALLET_STORE.close()
+        shutil.rmtree(basedir, ignore_errors=True)
+    return ok
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        sys.exit(0 if self_check() else 1)
+    print("Usage: python -m manierism.supervisor --check")
@@ -0,0 +1,414 @@
+"""
+Atomic wallet transfers (send, donate, world debt payments)
+- Every wallet has a lock; a transfer takes the locks of all its wallets in one deterministic
+  order (ordinary wallets by ID, then the `lock_last` system wallets in that order), so transfers
+  and mining ticks never deadlock and nobody saves a stale copy of a wallet in between
+- Write-ahead journal (transfers.journal): the new value of every key a transfer touches is
+  appended and fsynced before any wallet is saved, and a commit mark follows the saves; on open,
+  transfers without a commit mark are re-applied, so a crash half-way neither duplicates nor
+  destroys value; the wallet store is synced before the commit mark, so a mark never outlives
+  the saves it vouches for
+- run_batch() commits many transfers under one set of locks, one journal record and one save
+  per wallet; a transfer whose apply raises TransferError is rolled back on its own, or with
+  atomic=True the whole batch is
+- read_payroll() reads payout rows (wallet_id, resource, amount) from a CSV or JSON file
+- One engine per rigs folder, like the resident wallet store
+- python -m manierism.transfers --check | --bench [--transfers 5000] [--wallets 100] [--batch 500]
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import random
+import tempfile
+import threading
+from decimal import Decimal
+from contextlib import contextmanager
+
+JOURNAL_NAME = "transfers.journal"
+JOURNAL_MAX_BYTES = 1024 * 1024
+
+
+class TransferError(Exception):
+    """Raised by an apply function to reject its transfer; nothing of it is written."""
+
+
+def _changed_keys(before, after):
+    change = {"set": {}, "dec": {}}
+    for key, value in after.items():
+        if before is None or key not in before or before[key] != value or type(before[key]) is not type(value):
+            if isinstance(value, Decimal):
+                change["dec"][key] = str(value)
+            else:
+                change["set"][key] = value
+    removed = [key for key in (before or {}) if key not in after]
+    if removed:
+        change["del"] = removed
+    return change if change["set"] or change["dec"] or removed else None
+
+
+def _apply_change(wallet, change):
+    wallet.update(change.get("set", {}))
+    wallet.update({key: Decimal(value) for key, value in change.get("dec", {}).items()})
+    for key in change.get("del", []):
+        wallet.pop(key, None)
+    return wallet
+
+
+class TransferEngine:
+    def __init__(self, store, directory, load=None, save=None, lock_last=(), journal=True, fsync=True):
+        """
+        store: the rig's wallet store; load / save default to its own (the rig passes load_wallet /
+        save_wallet). lock_last: system wallet IDs locked after every ordinary wallet.
+        """
+        self.store = store
+        self.load = load or store.load
+        self.save = save or store.save
+        self.lock_last = list(lock_last)
+        self.fsync = fsync
+        self.committed = 0
+        self.rejected = 0
+        self.batches = 0
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._journal_lock = threading.Lock()
+        self._in_flight = 0
+        self._next_tx = 1
+        self._journal = None
+        if journal:
+            self._journal_path = os.path.join(directory, JOURNAL_NAME)
+            self.recover()
+            self._journal = open(self._journal_path, "a")
+
+    # --- Locks ---
+
+    def _lock_order(self, wallet_id):
+        rank = self.lock_last.index(wallet_id) + 1 if wallet_id in self.lock_last else 0
+        return (rank, wallet_id)
+
+    def wallet_lock(self, wallet_id):
+        with self._locks_guard:
+            lock = self._locks.get(wallet_id)
+            if lock is None:
+                lock = self._locks[wallet_id] = threading.RLock()
+            return lock
+
+    @contextmanager
+    def locked(self, *wallet_ids):
+        """Holds the locks of wallet_ids (taken in the engine's order) for a read-modify-write."""
+        locks = [self.wallet_lock(wallet_id) for wallet_id in sorted(set(wallet_ids), key=self._lock_order)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    # --- Transfers ---
+
+    def run(self, wallet_ids, apply):
+        """
+        One transfer: apply({wallet_id: wallet copy or None}) changes the wallets in place and
+        returns anything; raises the TransferError apply raised.
+        """
+        ok, result = self.run_batch([(wallet_ids, apply)])[0]
+        if not ok:
+            raise result
+        return result
+
+    def run_batch(self, transfers, atomic=False):
+        """
+        [(wallet_ids, apply), ...] -> [(True, apply's result) or (False, TransferError), ...];
+        atomic: one rejected transfer rejects the batch and nothing is written.
+        """
+        wallet_ids = set()
+        for ids, _ in transfers:
+            wallet_ids.update(ids)
+        with self.locked(*wallet_ids):
+            loaded = {wallet_id: self.load(wallet_id) for wallet_id in wallet_ids}
+            state = {wallet_id: (wallet.copy() if wallet is not None else None) for wallet_id, wallet in loaded.items()}
+            results = []
+            for ids, apply in transfers:
+                work = {wallet_id: (state[wallet_id].copy() if state[wallet_id] is not None else None) for wallet_id in ids}
+                try:
+                    result = apply(work)
+                except TransferError as e:
+                    self.rejected += 1
+                    results.append((False, e))
+                    if atomic:
+                        rolled_back = TransferError(f"rolled back with the batch: {e}")
+                        return [(False, e if result is e else rolled_back) for _, result in results] + \
+                               [(False, rolled_back)] * (len(transfers) - len(results))
+                    continue
+                state.update(work)
+                results.append((True, result))
+
+            changes = {}
+            for wallet_id, wallet in state.items():
+                change = _changed_keys(loaded[wallet_id], wallet) if wallet is not None else None
+                if change:
+                    changes[wallet_id] = change
+            if changes:
+                tx = self._prepare(changes)
+                for wallet_id in sorted(changes, key=self._lock_order):
+                    self.save(state[wallet_id])
+                self._commit(tx)
+            self.committed += sum(1 for ok, _ in results if ok)
+            self.batches += 1
+        return results
+
+    # --- Journal ---
+
+    def _write(self, entry):
+        self._journal.write(json.dumps(entry) + "\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def _prepare(self, changes):
+        if self._journal is None:
+            return None
+        with self._journal_lock:
+            tx = self._next_tx
+            self._next_tx += 1
+            self._in_flight += 1
+            self._write({"tx": tx, "wallets": changes})
+        return tx
+
+    def _commit(self, tx):
+        if self._journal is None:
+            return
+        if self.fsync:
+            self.store.sync()
+        with self._journal_lock:
+            self._write({"tx": tx, "ok": True})
+            self._in_flight -= 1
+            # Committed records are never replayed, so the file can restart once nothing is in flight
+            if self._in_flight == 0 and self._journal.tell() > JOURNAL_MAX_BYTES:
+                self._journal.truncate(0)
+                self._journal.seek(0)
+
+    def recover(self):
+        """Re-applies the transfers a crash left without a commit mark, then starts a new journal."""
+        if not os.path.exists(self._journal_path):
+            return 0
+        prepared, committed = {}, set()
+        with open(self._journal_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn tail: that transfer never reached its saves
+                if "wallets" in entry:
+                    prepared[entry["tx"]] = entry["wallets"]
+                elif entry.get("ok"):
+                    committed.add(entry["tx"])
+        interrupted = [tx for tx in prepared if tx not in committed]
+        for tx in interrupted:
+            for wallet_id, change in prepared[tx].items():
+                wallet = self.load(wallet_id) or {"wallet_id": wallet_id}
+                self.save(_apply_change(wallet, change))
+        if interrupted:
+            self.store.flush()
+            print(f"🧾 Recovered {len(interrupted)} interrupted transfers from {JOURNAL_NAME}")
+        os.remove(self._journal_path)
+        return len(interrupted)
+
+    def stats(self):
+        return {"committed": self.committed, "rejected": self.rejected, "batches": self.batches}
+
+    def close(self):
+        with self._journal_lock:
+            if self._journal is None or self._journal.closed:
+                return
+            self._journal.close()
+            if self._in_flight == 0:
+                os.remove(self._journal_path)
+
+
+# --- Payroll files ---
+
+PAYROLL_COLUMNS = ["wallet_id", "resource", "amount"]
+
+
+def read_payroll(path):
+    """
+    Payout rows from a CSV file (wallet_id,resource,amount; the header row is optional) or a JSON
+    list of {"wallet_id", "resource", "amount"} objects or [wallet_id, resource, amount] lists.
+    Returns [(row number, wallet_id, resource, amount text), ...]; amounts are left for the caller to parse.
+    """
+    with open(path, "r", encoding="utf-8-sig") as f:
+        if path.lower().endswith(".json"):
+            entries = json.load(f)
+            if isinstance(entries, dict):
+                entries = entries.get("payments", [])
+            records = [[entry.get(column, "") for column in PAYROLL_COLUMNS] if isinstance(entry, dict) else list(entry)
+                       for entry in entries]
+        else:
+            records = [record for record in csv.reader(f) if record and not record[0].lstrip().startswith("#")]
+            if records and [cell.strip().lower() for cell in records[0][:3]] == PAYROLL_COLUMNS:
+                records = records[1:]
+    rows = []
+    for number, record in enumerate(records, 1):
+        record = (list(record) + ["", "", ""])[:3]
+        rows.append((number, str(record[0]).strip(), str(record[1]).strip(), str(record[2]).strip()))
+    return rows
+
+
+# --- Self-check and benchmark ---
+
+def _move(source_id, target_id, amount, key="capsule_value_mb"):
+    def apply(wallets):
+        source, target = wallets[source_id], wallets[target_id]
+        if source[key] < amount:
+            raise TransferError(f"{source_id}: not enough {key}")
+        source[key] -= amount
+        target[key] += amount
+    return apply
+
+
+def _open_test_engine(directory, wallets=0, balance=Decimal("1000"), fsync=True):
+    from manierism.wallet_store import ResidentWalletStore
+    store = ResidentWalletStore(directory, checkpoint_every=10_000, checkpoint_interval=3600)
+    for i in range(wallets):
+        store.save({"wallet_id": f"W{i:04d}", "capsule_value_mb": balance})
+    return store, TransferEngine(store, directory, lock_last=["WD"], fsync=fsync)
+
+
+def _total(store, count, key="capsule_value_mb"):
+    return sum((store.load(f"W{i:04d}")[key] for i in range(count)), Decimal("0"))
+
+
+def self_check():
+    ok = True
+
+    def check(label, passed):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        store, engine = _open_test_engine(directory, wallets=8)
+        results = engine.run_batch([(["W0000", "W0001"], _move("W0000", "W0001", Decimal("600"))),
+                                    (["W0000", "W0002"], _move("W0000", "W0002", Decimal("600"))),
+                                    (["W0001", "W0002"], _move("W0001", "W0002", Decimal("1")))])
+        check("Batch: overdraft rejected on its own, the rest committed",
+              [ok for ok, _ in results] == [True, False, True] and store.load("W0000")["capsule_value_mb"] == Decimal("400"))
+
+        # Transfers between random pairs race a "mining" thread that credits W0000 under its lock
+        def sender(seed):
+            rng = random.Random(seed)
+            for _ in range(200):
+                a, b = rng.sample(range(8), 2)
+                try:
+                    engine.run([f"W{a:04d}", f"W{b:04d}"], _move(f"W{a:04d}", f"W{b:04d}", Decimal(rng.randint(1, 50))))
+                except TransferError:
+                    pass
+
+        def miner():
+            for _ in range(200):
+                with engine.locked("W0000", "WD"):
+                    wallet = store.load("W0000")
+                    wallet["mined"] = wallet.get("mined", 0) + 1
+                    wallet["capsule_value_mb"] += 1
+                    store.save(wallet)
+
+        threads = [threading.Thread(target=sender, args=(seed,)) for seed in range(4)] + [threading.Thread(target=miner)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        check(f"4 transfer threads + a mining thread: value conserved ({_total(store, 8)} = 8200 MB)",
+              _total(store, 8) == Decimal("8200") and store.load("W0000")["mined"] == 200)
+
+        # The change log is fsynced while the transfer still has no commit mark
+        marks_at_sync = []
+        store_sync = store.sync
+
+        def watched_sync():
+            with open(engine._journal_path, "r") as f:
+                marks_at_sync.append(sum(1 for line in f if '"ok"' in line))
+            store_sync()
+
+        store.sync = watched_sync
+        engine.run(["W0005", "W0006"], _move("W0005", "W0006", Decimal("1")))
+        engine.run(["W0006", "W0005"], _move("W0006", "W0005", Decimal("1")))
+        del store.sync
+        with open(engine._journal_path, "r") as f:
+            marks = sum(1 for line in f if '"ok"' in line)
+        check(f"Store synced before each commit mark ({marks_at_sync} marks at sync, {marks} after)",
+              len(marks_at_sync) == 2 and marks_at_sync[1] == marks_at_sync[0] + 1 == marks - 1)
+
+        # Crash after the journal record and the first save: the reopened engine finishes the transfer
+        saves = []
+
+        def crashing_save(wallet):
+            if saves:
+                raise OSError("simulated crash")
+            saves.append(wallet["wallet_id"])
+            store.save(wallet)
+
+        engine.save = crashing_save
+        try:
+            engine.run(["W0003", "W0004"], _move("W0003", "W0004", Decimal("100")))
+        except OSError:
+            pass
+        half_done = store.load("W0003")["capsule_value_mb"] + store.load("W0004")["capsule_value_mb"]
+        engine.close()
+        store.close()
+        store, engine = _open_test_engine(directory)
+        check(f"Crash between the two saves: {half_done} MB on disk, the journal restores the transfer",
+              _total(store, 8) == Decimal("8200"))
+        engine.close()
+        store.close()
+    return ok
+
+
+def benchmark(transfers=5000, wallets=100, batch=500):
+    amounts = [(random.sample(range(wallets), 2), Decimal(random.randint(1, 5))) for _ in range(transfers)]
+    rows = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        store, engine = _open_test_engine(directory, wallets)
+        started = time.perf_counter()
+        for (a, b), amount in amounts:
+            # The old send_resource: two loads, two separate saves, no lock and no journal
+            source, target = store.load(f"W{a:04d}"), store.load(f"W{b:04d}")
+            source["capsule_value_mb"] -= amount
+            target["capsule_value_mb"] += amount
+            store.save(source)
+            store.save(target)
+        rows.append(("Unlocked load / save x2 (old)", time.perf_counter() - started, _total(store, wallets)))
+        engine.close()
+        store.close()
+
+    for label, fsync, size in [("Engine, one transfer per commit", True, 1),
+                               ("Engine, one transfer per commit, no fsync", False, 1),
+                               (f"Engine, {batch} transfers per commit", True, batch)]:
+        with tempfile.TemporaryDirectory() as directory:
+            store, engine = _open_test_engine(directory, wallets, fsync=fsync)
+            started = time.perf_counter()
+            for i in range(0, transfers, size):
+                engine.run_batch([([f"W{a:04d}", f"W{b:04d}"], _move(f"W{a:04d}", f"W{b:04d}", amount))
+                                  for (a, b), amount in amounts[i:i + size]])
+            rows.append((label, time.perf_counter() - started, _total(store, wallets)))
+            engine.close()
+            store.close()
+
+    expected = Decimal("1000") * wallets
+    for label, seconds, total in rows:
+        print(f"⏱️ {label:<44} {transfers / seconds:10,.0f} transfers/s  {'✅' if total == expected else '❌'} total {total} MB")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = dict(zip(args[1::2], args[2::2]))
+    if args[:1] == ["--check"]:
+        sys.exit(0 if self_check() else 1)
+    elif args[:1] == ["--bench"]:
+        benchmark(int(options.get("--transfers", 5000)), int(options.get("--wallets", 100)), int(options.get("--batch", 500)))
+    else:
+        print("Usage: python -m manierism.transfers --check | --bench [--transfers 5000] [--wallets 100] [--batch 500]")
@@ -0,0 +1,274 @@
+"""
+Incremental Watts-backed valuation of wallets
+- Every wallet's five value terms (balance x rate) are kept with the balance objects they came
+  from; calculate_total_value only re-multiplies the balances that changed since, so a dashboard
+  or menu asking twice about the same wallet costs five identity checks and a sum
+- save_wallet feeds each saved wallet to track(): the per-wallet total and the totals across all
+  wallets (value and `sum_keys` such as the world debt paid) move by that save's delta, so
+  grand_total() / key_total() are O(1) once seeded
+- Ledger mode keeps the terms as exact 10^18-scaled ints; the cross-wallet totals are always
+  kept in those units (each wallet's value to 18 decimals), so adding and removing a wallet's
+  old total never rounds; check() recomputes every wallet from scratch and reports any drift
+- python -m manierism.valuation --check | --bench [--wallets 1000]
+"""
+
+import sys
+import time
+import random
+import operator
+import threading
+from decimal import Decimal, getcontext
+
+from manierism.ledger import SCALE, to_units, from_units, usd_rate_units, total_usd_units, wallet_units, USD_RATE_KEYS
+
+ZERO = Decimal("0")
+
+
+class _Entry:
+    __slots__ = ("values", "terms", "value", "units", "sums")
+
+    def __init__(self, values, terms, value, units, sums):
+        self.values = values
+        self.terms = terms
+        self.value = value
+        self.units = units
+        self.sums = sums
+
+
+class ValuationCache:
+    def __init__(self, rates, exact=True, sum_keys=()):
+        """rates: {resource key: Decimal rate}; exact: ledger (int units) arithmetic, else Decimal."""
+        self.rates = dict(rates)
+        self.keys = tuple(self.rates)
+        self.exact = exact
+        unit_rates = usd_rate_units(self.rates)
+        self._rates = tuple(unit_rates[key] if exact else self.rates[key] for key in self.keys)
+        self._zero = 0 if exact else ZERO
+        self.sum_keys = list(sum_keys)
+        self.seeded = False
+        self.hits = 0
+        self.recomputed_terms = 0
+        self._entries = {}
+        self._grand_total = 0
+        self._key_totals = {key: 0 for key in self.sum_keys}
+        self._lock = threading.Lock()
+
+    # --- Per wallet ---
+
+    def _valuate(self, values, entry):
+        """(terms, value) for the balances; only balances that differ from entry's are re-multiplied."""
+        exact = self.exact
+        if entry is None:
+            terms = [None] * len(values)
+            old_values = (object(),) * len(values)
+        else:
+            terms = list(entry.terms)
+            old_values = entry.values
+        for i, value in enumerate(values):
+            old = old_values[i]
+            if value is old or (old is not None and value == old and terms[i] is not None):
+                continue
+            self.recomputed_terms += 1
+            if value is None:
+                terms[i] = self._zero
+            else:
+                terms[i] = to_units(value) * self._rates[i] if exact else value * self._rates[i]
+        if exact:
+            return terms, from_units(sum(terms) // SCALE)
+        return terms, sum(terms, ZERO)
+
+    def value(self, wallet):
+        """Watts-backed value of a wallet dict, saved or not (nothing is stored)."""
+        entry = self._entries.get(wallet.get("wallet_id"))
+        values = tuple(map(wallet.get, self.keys))
+        if entry is not None and all(map(operator.is_, values, entry.values)):
+            self.hits += 1
+            return entry.value
+        return self._valuate(values, entry)[1]
+
+    def track(self, wallet):
+        """Records a saved wallet; the cross-wallet totals move by the difference to its last save."""
+        wallet_id = wallet["wallet_id"]
+        values = tuple(map(wallet.get, self.keys))
+        with self._lock:
+            entry = self._entries.get(wallet_id)
+            terms, value = self._valuate(values, entry)
+            units = to_units(value)
+            sums = [to_units(wallet.get(key) or 0) for key in self.sum_keys]
+            if entry is not None:
+                self._grand_total -= entry.units
+                for key, old in zip(self.sum_keys, entry.sums):
+                    self._key_totals[key] -= old
+            self._grand_total += units
+            for key, key_units in zip(self.sum_keys, sums):
+                self._key_totals[key] += key_units
+            self._entries[wallet_id] = _Entry(values, terms, value, units, sums)
+
+    def forget(self, wallet_id):
+        with self._lock:
+            entry = self._entries.pop(wallet_id, None)
+            if entry is not None:
+                self._grand_total -= entry.units
+                for key, old in zip(self.sum_keys, entry.sums):
+                    self._key_totals[key] -= old
+
+    # --- Across wallets ---
+
+    def seed(self, wallet_ids, load):
+        """Tracks every wallet not saved yet this session (load: wallet_id -> wallet); runs once."""
+        with self._lock:
+            untracked = [wallet_id for wallet_id in wallet_ids if wallet_id not in self._entries]
+        for wallet_id in untracked:
+            wallet = load(wallet_id)
+            # A wallet saved while seeding is already tracked with newer balances
+            if wallet is not None and wallet_id not in self._entries:
+                self.track(wallet)
+        self.seeded = True
+
+    def total(self, wallet_id):
+        entry = self._entries.get(wallet_id)
+        return entry.value if entry is not None else None
+
+    def grand_total(self):
+        return from_units(self._grand_total)
+
+    def key_total(self, key):
+        return from_units(self._key_totals[key])
+
+    def wallet_totals(self):
+        """{wallet_id: value} of every tracked wallet."""
+        with self._lock:
+            return {wallet_id: entry.value for wallet_id, entry in self._entries.items()}
+
+    def check(self, wallets, recompute):
+        """
+        Recomputes every tracked wallet (wallets: {wallet_id: wallet}, recompute: wallet -> value)
+        and the cross-wallet totals; returns [(name, cached, actual), ...] for everything that drifted.
+        """
+        drift = []
+        with self._lock:
+            entries = dict(self._entries)
+            grand_total = self._grand_total
+            key_totals = dict(self._key_totals)
+        actual_grand = 0
+        actual_keys = dict.fromkeys(self.sum_keys, 0)
+        for wallet_id, entry in entries.items():
+            wallet = wallets.get(wallet_id)
+            if wallet is None:
+                drift.append((wallet_id, entry.value, None))
+                continue
+            actual = recompute(wallet)
+            actual_grand += to_units(actual)
+            for key in self.sum_keys:
+                actual_keys[key] += to_units(wallet.get(key) or 0)
+            if entry.value != actual:
+                drift.append((wallet_id, entry.value, actual))
+        if grand_total != actual_grand:
+            drift.append(("(all wallets)", from_units(grand_total), from_units(actual_grand)))
+        for key in self.sum_keys:
+            if key_totals[key] != actual_keys[key]:
+                drift.append((f"(all wallets) {key}", from_units(key_totals[key]), from_units(actual_keys[key])))
+        return drift
+
+    def stats(self):
+        return {"wallets": len(self._entries), "hits": self.hits, "recomputed_terms": self.recomputed_terms}
+
+
+# --- Self-check and benchmark ---
+
+RATES = {"capsule_value_mb": Decimal("5.00"), "cache_value_mb": Decimal("0.42"), "real_kwh": Decimal("0.17"),
+         "bandwidth_MBps": Decimal("0.42"), "torrent_value_mb": Decimal("5.00")}
+
+
+def _recompute(exact):
+    rate_units = usd_rate_units(RATES)
+    if exact:
+        return lambda wallet: from_units(total_usd_units(wallet_units(wallet, USD_RATE_KEYS), rate_units))
+    return lambda wallet: sum((wallet.get(key, ZERO) * rate for key, rate in RATES.items()), ZERO)
+
+
+def _random_wallets(count, rng):
+    getcontext().prec = 200
+    wallets = {}
+    for i in range(count):
+        wallet = {"wallet_id": f"W{i:05d}", "world_debt_paid_usd": ZERO}
+        for key in RATES:
+            wallet[key] = Decimal(rng.randint(0, 10 ** 12)) / Decimal(7) ** rng.randint(1, 30)
+        wallets[wallet["wallet_id"]] = wallet
+    return wallets
+
+
+def _tick(wallet, rng):
+    wallet = wallet.copy()
+    for key in ["capsule_value_mb", "real_kwh", "bandwidth_MBps"]:
+        wallet[key] += Decimal(rng.randint(1, 10 ** 6)) / Decimal(3)
+    wallet["world_debt_paid_usd"] += Decimal(rng.randint(0, 5))
+    return wallet
+
+
+def self_check():
+    ok = True
+
+    def check(label, passed):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    rng = random.Random(5)
+    for exact in (True, False):
+        mode = "ledger" if exact else "Decimal"
+        recompute = _recompute(exact)
+        wallets = _random_wallets(200, rng)
+        cache = ValuationCache(RATES, exact, sum_keys=["world_debt_paid_usd"])
+        cache.seed(list(wallets), wallets.get)
+        for _ in range(5000):
+            wallet_id = rng.choice(list(wallets))
+            wallets[wallet_id] = _tick(wallets[wallet_id], rng)
+            cache.track(wallets[wallet_id])
+        same = all(cache.value(wallet) == recompute(wallet) for wallet in wallets.values())
+        unsaved = _tick(wallets["W00000"], rng)
+        check(f"{mode}: 5,000 tracked saves, every wallet value equals a full recompute", same and cache.value(unsaved) == recompute(unsaved))
+        drift = cache.check(wallets, recompute)
+        check(f"{mode}: no drift in the all-wallet totals ({cache.grand_total():.2f})", not drift)
+        grand = from_units(sum(to_units(recompute(wallet)) for wallet in wallets.values()))
+        check(f"{mode}: O(1) grand total equals the sum of 200 recomputes", cache.grand_total() == grand)
+        wallets["W00001"] = _tick(wallets["W00001"], rng)  # saved behind the cache's back
+        check(f"{mode}: check() flags a wallet changed without track()", [name for name, _, _ in cache.check(wallets, recompute)][:1] == ["W00001"])
+    return ok
+
+
+def benchmark(count=1000):
+    rng = random.Random(9)
+    wallets = _random_wallets(count, rng)
+    recompute = _recompute(True)
+    cache = ValuationCache(RATES, True)
+    cache.seed(list(wallets), wallets.get)
+    sample = list(wallets.values())[:200]
+
+    def timed(label, fn, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        seconds = (time.perf_counter() - start) / repeat
+        print(f"⏱️ {label:<50} {seconds * 1e6:10.1f} µs")
+        return seconds
+
+    full = timed("Full recompute, 200 unchanged wallets", lambda: [recompute(w) for w in sample], 20)
+    cached = timed("Cached value, 200 unchanged wallets", lambda: [cache.value(w) for w in sample], 20)
+    ticked = [_tick(w, rng) for w in sample]
+    full_tick = timed("Full recompute after a tick, 200 wallets", lambda: [recompute(w) for w in ticked], 20)
+    cached_tick = timed("Incremental value after a tick, 200 wallets", lambda: [cache.value(w) for w in ticked], 20)
+    grand = timed(f"Sum over all {count} wallets, full recompute", lambda: sum((recompute(w) for w in wallets.values()), ZERO), 3)
+    grand_cached = timed(f"Sum over all {count} wallets, cached grand_total()", cache.grand_total, 1000)
+    print(f"📈 unchanged {full / cached:.1f}x, after a tick {full_tick / cached_tick:.1f}x, all-wallet total {grand / grand_cached:,.0f}x")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = dict(zip(args[1::2], args[2::2]))
+    if args[:1] == ["--check"]:
+        sys.exit(0 if self_check() else 1)
+    elif args[:1] == ["--bench"]:
+        benchmark(int(options.get("--wallets", 1000)))
+    else:
+        print("Usage: python -m manierism.valuation --check | --bench [--wallets 1000]")
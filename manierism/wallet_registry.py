@@ -0,0 +1,160 @@
+"""
+SQLite wallet registry
+- One row per wallet: wallet_id, rig_id, node_id, indexed for the selection menus and transfers
+- Kept in sync by save_wallet (only writes when rig_id / node_id change)
+- sync() picks up wallet files dropped into the rigs folder by name, without parsing the others
+- One-shot importer: python -m manierism.wallet_registry /path/to/rigs
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import threading
+
+from manierism.wallet_store import WALLET_SUFFIX
+
+REGISTRY_NAME = "wallet_registry.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wallets (
+    wallet_id TEXT PRIMARY KEY,
+    rig_id TEXT,
+    node_id TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_wallets_rig_id ON wallets (rig_id);
+CREATE INDEX IF NOT EXISTS idx_wallets_node_id ON wallets (node_id);
+"""
+
+
+class WalletRegistry:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._known = {
+            wallet_id: (rig_id, node_id)
+            for wallet_id, rig_id, node_id in self._conn.execute("SELECT wallet_id, rig_id, node_id FROM wallets")
+        }
+
+    def __len__(self):
+        return len(self._known)
+
+    def __contains__(self, wallet_id):
+        return wallet_id in self._known
+
+    # --- Writes ---
+
+    def track(self, wallet):
+        """Upserts a wallet row if its indexed fields changed since the last call."""
+        wallet_id = wallet["wallet_id"]
+        row = (wallet.get("rig_id", wallet_id), wallet.get("node_id"))
+        if self._known.get(wallet_id) == row:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO wallets (wallet_id, rig_id, node_id, updated_at) VALUES (?, ?, ?, ?)",
+                (wallet_id, row[0], row[1], time.time())
+            )
+            self._conn.commit()
+            self._known[wallet_id] = row
+
+    def remove(self, wallet_ids):
+        with self._lock:
+            self._conn.executemany("DELETE FROM wallets WHERE wallet_id = ?", [(w,) for w in wallet_ids])
+            self._conn.commit()
+            for wallet_id in wallet_ids:
+                self._known.pop(wallet_id, None)
+
+    def import_wallet_files(self, directory, wallet_ids):
+        """Reads only rig_id / node_id from the given wallet files and inserts them in one transaction."""
+        rows = []
+        for wallet_id in wallet_ids:
+            path = os.path.join(directory, f"{wallet_id}{WALLET_SUFFIX}")
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Skipped {wallet_id}: {e}")
+                continue
+            rows.append((wallet_id, data.get("rig_id", wallet_id), data.get("node_id"), time.time()))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO wallets (wallet_id, rig_id, node_id, updated_at) VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+            for wallet_id, rig_id, node_id, _ in rows:
+                self._known[wallet_id] = (rig_id, node_id)
+        return len(rows)
+
+    def sync(self, directory, wallet_ids):
+        """Reconciles the registry with the wallet ids the store knows about."""
+        wallet_ids = set(wallet_ids)
+        missing = sorted(wallet_ids - set(self._known))
+        stale = sorted(set(self._known) - wallet_ids)
+        imported = self.import_wallet_files(directory, missing) if missing else 0
+        if stale:
+            self.remove(stale)
+        return imported, len(stale)
+
+    # --- Queries ---
+
+    def list_wallets(self, exclude=()):
+        """Returns [(wallet_id, rig_id), ...] sorted by wallet_id."""
+        with self._lock:
+            rows = self._conn.execute("SELECT wallet_id, rig_id FROM wallets ORDER BY wallet_id").fetchall()
+        return [row for row in rows if row[0] not in exclude]
+
+    def rig_id(self, wallet_id):
+        row = self._known.get(wallet_id)
+        return row[0] if row else None
+
+    def find_by_node(self, node_id):
+        with self._lock:
+            row = self._conn.execute("SELECT wallet_id FROM wallets WHERE node_id = ?", (node_id,)).fetchone()
+        return row[0] if row else None
+
+    def find_by_rig(self, rig_id):
+        with self._lock:
+            rows = self._conn.execute("SELECT wallet_id FROM wallets WHERE rig_id = ? ORDER BY wallet_id", (rig_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def resolve(self, wallet_or_node_id):
+        """Maps a typed Wallet ID or Node ID to a known Wallet ID, or None."""
+        if wallet_or_node_id in self._known:
+            return wallet_or_node_id
+        return self.find_by_node(wallet_or_node_id)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_wallet_registry(directory):
+    """Opens the registry in the rigs folder; returns None if SQLite is unusable here."""
+    try:
+        return WalletRegistry(os.path.join(directory, REGISTRY_NAME))
+    except sqlite3.Error as e:
+        print(f"⚠️ Wallet registry unavailable ({e}) — menus will scan the rigs folder.")
+        return None
+
+
+def import_rigs_directory(directory):
+    """One-shot importer for an existing rigs folder."""
+    registry = WalletRegistry(os.path.join(directory, REGISTRY_NAME))
+    wallet_ids = [f[:-len(WALLET_SUFFIX)] for f in os.listdir(directory) if f.endswith(WALLET_SUFFIX)]
+    start = time.time()
+    imported = registry.import_wallet_files(directory, wallet_ids)
+    registry.close()
+    print(f"✅ Imported {imported} wallets into {REGISTRY_NAME} in {time.time() - start:.2f} seconds")
+    return imported
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m manierism.wallet_registry /path/to/rigs")
+        sys.exit(1)
+    import_rigs_directory(sys.argv[1])
@@ -0,0 +1,520 @@
+"""
+Wallet storage engines
+- "json": write-through, every save rewrites {wallet_id}_wallet.json (the original behaviour)
+- "resident": wallets stay in memory, every save appends only the changed keys to
+  wallet_changes.log and dirty wallets are checkpointed to their JSON files in batches
+- The {wallet_id}_wallet.json layout is unchanged, so existing rigs folders load as-is
+- One resident process per rigs folder (flock, or msvcrt.locking on Windows); a second process
+  falls back to the "json" engine
+- The resident owner notices files written by anyone else (a json fallback process, --payroll or
+  --search-batch next to an open menu, a fork script) by their mtime / size / inode on load and
+  before each checkpoint: the file is re-read, and balances the owner changed since are merged on
+  top (Decimal keys add both sides' deltas, other keys keep the owner's value)
+- The json engine does the same on save: a wallet file that changed since this process loaded it
+  is merged instead of overwritten; that check and the owner's checkpoint writes both run under
+  the short .wallet_write.lock, so neither side can write in between
+- sync() makes every save so far durable (the change log, and the wallet files written since the
+  last sync, are fsynced); the transfer engine calls it before a transfer's commit mark, and a
+  checkpoint fsyncs the wallet files it wrote before it empties the change log
+- exact_ledger=True also writes a "ledger_units" block (10^18-scaled ints) so balances survive
+  the float export without losing digits
+- Self-check (lock, fallback, merges): python -m manierism.wallet_store --check
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import tempfile
+import threading
+from decimal import Decimal
+from contextlib import contextmanager
+
+from manierism.ledger import to_units, from_units, units_to_str, units_from_str
+
+try:
+    import fcntl
+except ImportError:  # Windows rigs
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+WALLET_SUFFIX = "_wallet.json"
+CHANGE_LOG_NAME = "wallet_changes.log"
+LOCK_NAME = ".wallet_store.lock"
+WRITE_LOCK_NAME = ".wallet_write.lock"
+LEDGER_UNITS_KEY = "ledger_units"
+
+# Keys load_wallet has always re-parsed as Decimal
+DECIMAL_KEYS = [
+    "capsule_value_mb", "cache_value_mb", "rig_hash_power", "real_kwh",
+    "bandwidth_MBps", "world_debt_paid_usd", "torrent_value_mb", "world_debt_paid_egp", "watts_token"
+]
+
+# Runtime-only flags that never reach disk
+TRANSIENT_KEYS = ["sha_boost_active"]
+
+
+def wallet_path(directory, wallet_id):
+    return os.path.join(directory, f"{wallet_id}{WALLET_SUFFIX}")
+
+
+def file_signature(path):
+    """(mtime_ns, size, inode) of a wallet file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def read_wallet_file(path):
+    """Reads one exported wallet file and re-parses the Decimal keys."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        data = json.load(f)
+    ledger_units = data.pop(LEDGER_UNITS_KEY, {})
+    for key in DECIMAL_KEYS:
+        if key in data and not isinstance(data[key], Decimal):
+            exact = ledger_units.get(key)
+            # Only trust the exact value if nobody hand-edited the exported float since
+            if exact is not None and float(from_units(units_from_str(exact))) == data[key]:
+                data[key] = from_units(units_from_str(exact))
+            else:
+                data[key] = Decimal(str(data[key]))
+    return data
+
+
+def write_wallet_file(path, wallet, exact_ledger=False):
+    """Writes a wallet in the export layout (floats, indent=4) via an atomic replace; returns its file_signature."""
+    wallet_copy = wallet.copy()
+    for key in TRANSIENT_KEYS:
+        wallet_copy.pop(key, None)
+    ledger_units = {}
+    for key, value in wallet_copy.items():
+        if isinstance(value, Decimal):
+            wallet_copy[key] = float(value)
+            if exact_ledger and key in DECIMAL_KEYS:
+                ledger_units[key] = units_to_str(to_units(value))
+    if ledger_units:
+        wallet_copy[LEDGER_UNITS_KEY] = ledger_units
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(wallet_copy, f, indent=4)
+        f.flush()
+        # Taken before the replace, so a write by another process right after it still shows up as a change
+        st = os.fstat(f.fileno())
+    os.replace(tmp_path, path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def merge_outside_write(base, mine, disk):
+    """
+    Wallet that keeps another process's write (disk) and this one's unsaved changes (mine, both
+    since base): Decimal keys get both deltas, other changed keys keep mine.
+    """
+    merged = dict(disk)
+    for key in set(mine) | set(base):
+        if key in TRANSIENT_KEYS:
+            continue
+        if key in mine and key in base and mine[key] == base[key] and type(mine[key]) is type(base[key]):
+            continue  # untouched here: the other process's value stands
+        if key not in mine:
+            merged.pop(key, None)
+        elif all(isinstance(side.get(key), Decimal) for side in (mine, base, disk)):
+            merged[key] = disk[key] + (mine[key] - base[key])
+        else:
+            merged[key] = mine[key]
+    return merged
+
+
+@contextmanager
+def _write_lock(directory):
+    """Held across a check-then-write of wallet files; blocking, and only ever held briefly."""
+    with open(os.path.join(directory, WRITE_LOCK_NAME), "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class JSONWalletStore:
+    """Write-through engine: one full file rewrite per save."""
+
+    engine = "json"
+
+    def __init__(self, directory, exact_ledger=False):
+        self.directory = directory
+        self.exact_ledger = exact_ledger
+        self._unsynced = set()  # wallet files written since the last sync()
+        # wallet_id -> (file_signature, wallet) as last loaded or saved here; the rig's wallet
+        # locks keep one load-to-save per wallet at a time within the process
+        self._loaded = {}
+        self.merges = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, wallet_id):
+        path = wallet_path(self.directory, wallet_id)
+        signature = file_signature(path)
+        data = read_wallet_file(path)
+        if data is not None:
+            self._loaded[wallet_id] = (signature, copy.deepcopy(data))
+        return data
+
+    def save(self, wallet):
+        """Returns the wallet as written: `wallet`, or a merge with a write made since it was loaded."""
+        wallet_id = wallet["wallet_id"]
+        path = wallet_path(self.directory, wallet_id)
+        with _write_lock(self.directory):
+            loaded = self._loaded.get(wallet_id)
+            if loaded is not None and file_signature(path) not in (None, loaded[0]):
+                # Another process (or the resident owner's checkpoint) wrote it since our load
+                wallet = merge_outside_write(loaded[1], wallet, read_wallet_file(path))
+                self.merges += 1
+            signature = write_wallet_file(path, wallet, self.exact_ledger)
+        self._loaded[wallet_id] = (signature, copy.deepcopy(wallet))
+        self._unsynced.add(path)
+        return wallet
+
+    def wallet_ids(self):
+        return [f[:-len(WALLET_SUFFIX)] for f in os.listdir(self.directory) if f.endswith(WALLET_SUFFIX)]
+
+    def _sync_files(self):
+        while self._unsynced:
+            try:
+                path = self._unsynced.pop()  # other threads may keep saving meanwhile
+            except KeyError:
+                break
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue  # replaced or removed by another process since
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def sync(self):
+        """fsyncs the wallet files saved since the last sync."""
+        self._sync_files()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ResidentWalletStore(JSONWalletStore):
+    """In-memory engine with an append-only change log and batched checkpoints."""
+
+    engine = "resident"
+
+    def __init__(self, directory, checkpoint_every=64, checkpoint_interval=30.0, exact_ledger=False):
+        super().__init__(directory, exact_ledger)
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self._lock = threading.RLock()
+        self._wallets = {}
+        self._dirty = set()
+        self._signatures = {}  # wallet_id -> file_signature as last read or written here
+        self._base = {}  # wallet_id -> the wallet as it was on disk at that point
+        self.outside_writes = 0
+        self.merges = 0
+        self.on_outside_write = None  # called with a copy of each wallet picked up from another process
+        self._pending = 0
+        self._last_checkpoint = time.monotonic()
+        self._log_path = os.path.join(directory, CHANGE_LOG_NAME)
+        self._replay_change_log()
+        self._log = open(self._log_path, "a")
+
+    # --- Resident cache ---
+
+    def _read_disk(self, wallet_id):
+        path = wallet_path(self.directory, wallet_id)
+        signature = file_signature(path)
+        data = read_wallet_file(path)
+        if data is not None:
+            for key in TRANSIENT_KEYS:
+                data.pop(key, None)
+        return signature, data
+
+    def _synced(self, wallet_id, signature, data):
+        self._signatures[wallet_id] = signature
+        self._base[wallet_id] = copy.deepcopy(data)
+
+    def _resident(self, wallet_id):
+        if wallet_id not in self._wallets:
+            signature, data = self._read_disk(wallet_id)
+            if data is None:
+                return None
+            self._wallets[wallet_id] = data
+            self._synced(wallet_id, signature, data)
+        else:
+            self._pick_up_outside_write(wallet_id)
+        return self._wallets.get(wallet_id)
+
+    def _pick_up_outside_write(self, wallet_id):
+        if file_signature(wallet_path(self.directory, wallet_id)) == self._signatures.get(wallet_id):
+            return
+        signature, disk = self._read_disk(wallet_id)
+        if disk is None:
+            if wallet_id not in self._dirty:  # deleted by hand: forget it
+                self._wallets.pop(wallet_id, None)
+                self._signatures.pop(wallet_id, None)
+                self._base.pop(wallet_id, None)
+            return
+        self.outside_writes += 1
+        if wallet_id in self._dirty:
+            self._wallets[wallet_id] = merge_outside_write(self._base.get(wallet_id, {}), self._wallets[wallet_id], disk)
+            self.merges += 1
+            print(f"🔄 {wallet_id} was saved by another process — merged with this session's unsaved changes")
+        else:
+            self._wallets[wallet_id] = disk
+        self._synced(wallet_id, signature, disk)
+        if self.on_outside_write is not None:
+            self.on_outside_write(self._wallets[wallet_id].copy())
+
+    def load(self, wallet_id):
+        with self._lock:
+            data = self._resident(wallet_id)
+            return data.copy() if data is not None else None
+
+    def save(self, wallet):
+        """Returns the wallet as stored: `wallet`, or a merge with another process's write."""
+        wallet_id = wallet["wallet_id"]
+        with self._lock:
+            before = self._wallets.get(wallet_id)
+            current = self._resident(wallet_id)
+            if before is not None and current is not None and current is not before:
+                # Loaded before another process's write: keep it, apply only what the caller changed
+                wallet = merge_outside_write(before, wallet, current)
+            is_new = current is None
+            current = current or {}
+            changed = {}
+            for key, value in wallet.items():
+                if key in TRANSIENT_KEYS:
+                    continue
+                if key not in current or current[key] != value or type(current[key]) is not type(value):
+                    changed[key] = value
+            removed = [k for k in current if k not in wallet and k not in TRANSIENT_KEYS]
+            if not changed and not removed:
+                return wallet
+
+            self._append_change(wallet_id, changed, removed)
+            for key in removed:
+                current.pop(key)
+            current.update(changed)
+            self._wallets[wallet_id] = current
+            self._dirty.add(wallet_id)
+            self._pending += 1
+
+            # New wallets are written through so other tools see them straight away
+            if is_new or self._pending >= self.checkpoint_every or \
+                    time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+                self.checkpoint()
+            return wallet
+
+    def wallet_ids(self):
+        with self._lock:
+            ids = set(super().wallet_ids())
+            ids.update(self._wallets)
+            return sorted(ids)
+
+    # --- Change log ---
+
+    def _append_change(self, wallet_id, changed, removed):
+        entry = {"w": wallet_id, "set": {}, "dec": {}}
+        for key, value in changed.items():
+            if isinstance(value, Decimal):
+                entry["dec"][key] = str(value)
+            else:
+                entry["set"][key] = value
+        if removed:
+            entry["del"] = removed
+        self._log.write(json.dumps(entry) + "\n")
+        self._log.flush()
+
+    def _replay_change_log(self):
+        if not os.path.exists(self._log_path):
+            return
+        replayed = 0
+        with open(self._log_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn tail from a crash mid-append
+                current = self._resident(entry["w"]) or {}
+                current.update(entry.get("set", {}))
+                current.update({k: Decimal(v) for k, v in entry.get("dec", {}).items()})
+                for key in entry.get("del", []):
+                    current.pop(key, None)
+                self._wallets[entry["w"]] = current
+                self._dirty.add(entry["w"])
+                replayed += 1
+        if replayed:
+            print(f"🧾 Replayed {replayed} wallet changes from {CHANGE_LOG_NAME}")
+        self._write_dirty()
+        self._sync_files()
+        os.remove(self._log_path)
+
+    # --- Checkpoints ---
+
+    def _write_dirty(self):
+        with _write_lock(self.directory):
+            for wallet_id in sorted(self._dirty):
+                self._pick_up_outside_write(wallet_id)
+                wallet = self._wallets[wallet_id]
+                path = wallet_path(self.directory, wallet_id)
+                signature = write_wallet_file(path, wallet, self.exact_ledger)
+                self._synced(wallet_id, signature, wallet)
+                self._unsynced.add(path)
+        self._dirty.clear()
+
+    def checkpoint(self):
+        with self._lock:
+            self._write_dirty()
+            # The files must be on disk before the log that could replay them is emptied
+            self._sync_files()
+            self._log.truncate(0)
+            self._log.seek(0)
+            self._pending = 0
+            self._last_checkpoint = time.monotonic()
+
+    def sync(self):
+        """fsyncs the change log and the wallet files checkpoints wrote since the last sync."""
+        with self._lock:
+            if self._log.closed:
+                return
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._sync_files()
+
+    def flush(self):
+        self.checkpoint()
+
+    def close(self):
+        with self._lock:
+            if self._log.closed:
+                return
+            self.checkpoint()
+            self._log.close()
+            os.remove(self._log_path)
+
+
+def _acquire_writer_lock(directory):
+    """Returns an open lock file if this process may be the single writer, else None."""
+    lock_file = open(os.path.join(directory, LOCK_NAME), "a+")
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            # Windows: lock the first byte; released when the process exits or the file is closed
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def open_wallet_store(directory, engine="resident", **options):
+    """Opens the requested engine, falling back to "json" when another process owns the folder."""
+    if engine == "json":
+        return JSONWalletStore(directory, options.get("exact_ledger", False))
+    if engine != "resident":
+        raise ValueError(f"Unknown wallet store engine: {engine}")
+    os.makedirs(directory, exist_ok=True)
+    writer_lock = _acquire_writer_lock(directory)
+    if writer_lock is None:
+        print("⚠️ Another rig process owns this rigs folder — this one saves wallets straight to their files; "
+              "the other session merges them on its next load or checkpoint.")
+        return JSONWalletStore(directory, options.get("exact_ledger", False))
+    store = ResidentWalletStore(directory, **options)
+    store.writer_lock = writer_lock
+    return store
+
+
+# --- Self-check ---
+
+def self_check():
+    ok = True
+
+    def check(label, passed):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {label}")
+
+    directory = tempfile.mkdtemp(prefix="wallet_store_check_")
+    owner = open_wallet_store(directory, checkpoint_every=1000, checkpoint_interval=3600)
+    other = open_wallet_store(directory)
+    try:
+        check("First process owns the folder, a second one falls back to json", owner.engine == "resident" and other.engine == "json")
+        owner.save({"wallet_id": "W1", "rig_id": "Rig 1", "capsule_value_mb": Decimal("100")})
+
+        def credit(store, amount, **changes):
+            wallet = store.load("W1")
+            wallet["capsule_value_mb"] += Decimal(amount)
+            wallet.update(changes)
+            store.save(wallet)
+
+        credit(owner, 5)
+        credit(other, 7, rig_id="Renamed")
+        wallet = owner.load("W1")
+        check(f"Owner's unsaved +5 and the fallback's +7 both kept on load ({wallet['capsule_value_mb']})",
+              wallet["capsule_value_mb"] == Decimal("112") and wallet["rig_id"] == "Renamed")
+
+        stale = owner.load("W1")
+        credit(other, 10)
+        stale["capsule_value_mb"] += Decimal("1")
+        owner.save(stale)
+        check(f"A save from a copy loaded before the outside write keeps it ({owner.load('W1')['capsule_value_mb']})",
+              owner.load("W1")["capsule_value_mb"] == Decimal("123"))
+
+        credit(owner, 2)
+        credit(other, 3)
+        owner.checkpoint()
+        on_disk = read_wallet_file(wallet_path(directory, "W1"))["capsule_value_mb"]
+        check(f"Checkpoint merges instead of overwriting the outside write ({on_disk})", on_disk == Decimal("128"))
+
+        credit(other, 4)
+        check("Owner without unsaved changes simply re-reads", owner.load("W1")["capsule_value_mb"] == Decimal("132"))
+        check(f"Outside writes picked up: {owner.outside_writes}, merged: {owner.merges}", owner.outside_writes == 4 and owner.merges == 3)
+
+        # The fallback loads, the owner checkpoints a change, then the fallback saves its stale copy
+        stale = other.load("W1")
+        credit(owner, 6)
+        owner.checkpoint()
+        stale["capsule_value_mb"] += Decimal("8")
+        other.save(stale)
+        on_disk = read_wallet_file(wallet_path(directory, "W1"))["capsule_value_mb"]
+        check(f"Fallback save merges with the owner's checkpoint instead of overwriting it ({on_disk})",
+              on_disk == Decimal("146") and owner.load("W1")["capsule_value_mb"] == Decimal("146") and other.merges == 1)
+    finally:
+        owner.close()
+        owner.writer_lock.close()
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    return ok
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        sys.exit(0 if self_check() else 1)
+    print("Usage: python -m manierism.wallet_store --check")
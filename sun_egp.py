@@ -1,1347 +1,30 @@
 #!/usr/bin/env python3
-import os, time, json, random, uuid, hashlib, threading, requests, webbrowser
-from bs4 import BeautifulSoup
-from flask import Flask, render_template_string
-from decimal import Decimal, getcontext
-import math
 
-getcontext().prec = 200
+# Sun rig (Manierism Electrism): 1000-year epoch decay, Eginma 10^12, paid in EGP at 30.90
+# The runtime itself (wallets, mining loop, menus) lives in manierism/rig.py
 
-try:
-    import RPi.GPIO as GPIO
-    GPIO.setmode(GPIO.BCM)
-    MOTOR_PIN = 18
-    RESISTOR_PIN = 23
-    CAPACITOR_PIN = 24
-    GPIO.setup(MOTOR_PIN, GPIO.OUT)
-    GPIO.setup(RESISTOR_PIN, GPIO.OUT)
-    GPIO.setup(CAPACITOR_PIN, GPIO.OUT)
-    GPIO_AVAILABLE = True
-except (ImportError, RuntimeError):
-    GPIO_AVAILABLE = False
+from decimal import Decimal
 
-# -------------------------
-# Directories & IDs
-# -------------------------
-USER_DOWNLOADS = os.path.join(os.path.expanduser("~"), "Downloads")
-BASEDIR = os.path.join(USER_DOWNLOADS, "manierismmegabytes")
-TARGETDIR = os.path.join(BASEDIR, "rigs")
+from manierism import rig
+from manierism.policies import EpochDecayPolicy, EGP
 
-# Create directories if they don't exist
-os.makedirs(TARGETDIR, exist_ok=True)
+rig.configure(
+    EpochDecayPolicy(eginma_multiplier=Decimal("1000000000000")),
+    currency=EGP,
+    basedir=rig.USER_DOWNLOADS_BASEDIR,
+    scale_exponent=3003,
+    primary_mining=("UV", "UV"),
+    simulation="right_atom",
+    plant_name="Manierism Electrism",
+)
+
+from manierism.rig import *
 
 print(f"📂 Base Directory: {BASEDIR}")
 print(f"📂 Target Rigs Directory: {TARGETDIR}")
 
-
-
-DONATION_WALLET_ID = "WM-CPH0O7J3"
-WORLD_DEBT_WALLET_ID = "WD-P4Y29G7B"
-WORLD_DEBT_NODE_ID = "9efae649-eb1f-4ef0-ac97-ed4df6d2942f"
-
-# -------------------------
-# Economic constants (EGP only)
-# -------------------------
-# 1 USD ~= 30.90 EGP (example conversion). We keep original USD base rates and convert them to EGP.
-EGP_RATE = Decimal("30.90")  # set the current exchange if you want to update later
-
-# Original USD unit rates (kept as source numbers, but not used directly). Converted to EGP below.
-_MB_USD_RATE = Decimal("5.00")
-_CACHE_USD_RATE = Decimal("0.42")
-_KWH_USD_RATE = Decimal("0.17")
-_BANDWIDTH_USD_RATE = Decimal("0.42")
-_TORRENT_USD_RATE = _MB_USD_RATE
-
-# Converted EGP rates (used through the system)
-MB_EGP_RATE = (_MB_USD_RATE * EGP_RATE).quantize(Decimal("0.000001"))
-CACHE_EGP_RATE = (_CACHE_USD_RATE * EGP_RATE).quantize(Decimal("0.000001"))
-KWH_EGP_RATE = (_KWH_USD_RATE * EGP_RATE).quantize(Decimal("0.000001"))
-BANDWIDTH_EGP_RATE = (_BANDWIDTH_USD_RATE * EGP_RATE).quantize(Decimal("0.000001"))
-TORRENT_EGP_RATE = MB_EGP_RATE
-
-# World debt initial amount in EGP (converted from previously used USD constant)
-INITIAL_WORLD_DEBT_USD = Decimal("31300000000000.00")
-INITIAL_WORLD_DEBT_EGP = (INITIAL_WORLD_DEBT_USD * EGP_RATE).quantize(Decimal("0"))
-
-WORLD_DEBT_DATE = "October 4th, 2025"
-DEBT_NODE_PASSIVE_USD_VALUE = Decimal("0.0001")
-DEBT_NODE_PASSIVE_EGP_VALUE = (DEBT_NODE_PASSIVE_USD_VALUE * EGP_RATE).quantize(Decimal("0.000001"))
-
-# -------------------------
-# Mining / Reward constants
-# -------------------------
-BASE_HASH_POWER = Decimal("10000")
-HASH_GROWTH_RATE = Decimal("0.001")
-
-TOTAL_YEARS = 1000
-BLOCKS_PER_YEAR = Decimal(365.25 * 24 * 4)  # 4 blocks per hour
-EPOCH_YEARS = 50
-BLOCKS_PER_EPOCH = BLOCKS_PER_YEAR * EPOCH_YEARS
-DECAY_RATE = Decimal("0.8")
-INITIAL_BLOCK_REWARD = Decimal("1e78")
-# MODIFIED EGINMA_MULTIPLIER: New rate of (1.e+^4)^3 = 10^12
-EGINMA_MULTIPLIER = Decimal("1e12")
-
-DEBUG_SHA_BOOST = True
-
-TEPI2_VALUE = Decimal(str(1 * 9e16 * (math.pi**2)))
-TEPI2 = f"TEЛ²_CONST_{TEPI2_VALUE:.2e}"
-E2PI_VALUE = Decimal(str((9e16)**2 * math.pi))
-E2PI = f"E²Л_CONST_{E2PI_VALUE:.2e}"
-BLOCK_HEADER = "MM_BLOCK_HEADER_2025"
-
-# -------------------------
-# Helpers
-# -------------------------
-def format_large_number(n):
-    """
-    Formats a large Decimal number into readable strings using
-    extended number names up to Millinillion (10^3003).
-    """
-    try:
-        n_float = float(n)
-    except Exception:
-        return str(n)
-        
-    if n_float == 0:
-        return "0.000000"
-    if abs(n_float) < 1e12:
-        # keep up to 6 decimals for readability for smaller numbers
-        if isinstance(n, Decimal):
-            return f"{n:,.6f}"
-        else:
-            return f"{n:,.6f}"
-
-    powers = {
-        1e3: "Thousand", 1e6: "Million", 1e9: "Billion", 1e12: "Trillion",
-        1e15: "Quadrillion", 1e18: "Quintillion", 1e21: "Sextillion", 
-        1e24: "Septillion", 1e27: "Octillion", 1e30: "Nonillion", 
-        1e33: "Decillion", 1e36: "Undecillion", 1e39: "Duodecillion", 
-        1e42: "Tredecillion", 1e45: "Quattuordecillion", 1e48: "Quindecillion", 
-        1e51: "Sexdecillion", 1e54: "Septendecillion", 1e57: "Octodecillion", 
-        1e60: "Novemdecillion", 1e63: "Vigintillion", 1e66: "Unvigintillion", 
-        1e69: "Duovigintillion", 1e72: "Trevigintillion", 1e75: "Quattuorvigintillion", 
-        1e78: "Quinvigintillion", 1e81: "Sexvigintillion", 1e84: "Septenvigintillion", 
-        1e87: "Octovigintillion", 1e90: "Novemvigintillion", 1e93: "Trigintillion", 
-        1e96: "Untrigintillion", 1e99: "Duotrigintillion", 1e102: "Trestrigintillion", 
-        1e105: "Quattuortrigintillion", 1e108: "Quintrigintillion", 1e111: "Sextrigintillion", 
-        1e114: "Septentrigintillion", 1e117: "Octotrigintillion", 1e120: "Novemtrigintillion", 
-        1e123: "Quadragintillion", 1e153: "Quinquagintillion", 1e183: "Sexagintillion", 
-        1e213: "Septuagintillion", 1e243: "Octogintillion", 1e273: "Nonagintillion", 
-        1e303: "Centillion", # 10^303
-        1e603: "Ducentillion", 1e903: "Trecentillion", 1e1203: "Quadringentillion",
-        1e1503: "Quingentillion", 1e1803: "Sescentillion", 1e2103: "Septingentillion",
-        1e2403: "Octingentillion", 1e2703: "Nongentillion", 1e3003: "Millinillion" # 10^3003
-    }
-    
-    scale = 1
-    unit = ""
-    
-    # Iterate through powers in descending order for correct scaling
-    for p, u in sorted(powers.items(), reverse=True):
-        if abs(n_float) >= p:
-            scale = p
-            unit = u
-            break
-            
-    scaled_n = Decimal(n) / Decimal(scale)
-    # Use scientific notation for numbers beyond the largest defined unit (Millinillion)
-    if unit == "" and abs(n_float) > 1e3003:
-         return f"{n_float:.3e}"
-         
-    return f"{scaled_n:,.3f} {unit}"
-
-def overlay_formula(MB, entropy=Decimal("0.85"), resonance=Decimal("1.2"), resistance=Decimal("0.5")):
-    return (MB * entropy * resonance) / resistance
-
-def spin_coil(speed_percent):
-    if GPIO_AVAILABLE:
-        pwm = GPIO.PWM(MOTOR_PIN, 1000)
-        pwm.start(speed_percent)
-        time.sleep(5)
-        pwm.stop()
-    else:
-        print(f"🌀 Simulated Right Atom Coil Spin (Potato Power) at {speed_percent:.2f}%")
-
-def heat_resistor(duration):
-    if GPIO_AVAILABLE:
-        GPIO.output(RESISTOR_PIN, GPIO.HIGH)
-        time.sleep(duration)
-        GPIO.output(RESISTOR_PIN, GPIO.LOW)
-    else:
-        print(f"🔥 Simulated Right Atom Resistor Heat for {duration:.2f} seconds")
-
-def discharge_capacitor():
-    if GPIO_AVAILABLE:
-        GPIO.output(CAPACITOR_PIN, GPIO.HIGH)
-        time.sleep(0.1)
-        GPIO.output(CAPACITOR_PIN, GPIO.LOW)
-    else:
-        print("⚡ Simulated Right Atom Capacitor Discharge")
-
-def emit_real_electricity(kWh):
-    spin_coil(float(kWh) * 100)
-    heat_resistor(float(kWh))
-    discharge_capacitor()
-
-def log_real_emission(wallet_id, MB, kWh, overlay):
-    entry = {
-        "wallet_id": wallet_id,
-        "timestamp": time.time(),
-        "capsule_MB": float(MB),
-        "capsule_kWh": float(kWh),
-        "overlay": overlay,
-        "simulated": not GPIO_AVAILABLE
-    }
-    with open(os.path.join(TARGETDIR, "capsule_emission_log.json"), "a") as f:
-        f.write(json.dumps(entry) + "\n")
-
-# -------------------------
-# Blackjack constants
-# -------------------------
-CARD_SYMBOLS = {
-    'Spades': '♠', 'Hearts': '♥', 'Diamonds': '♦', 'Clubs': '♣'
-}
-CARD_RANKS = {
-    '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
-    'T': 10, 'J': 10, 'Q': 10, 'K': 10, 'A': 11
-}
-
-CURRENCIES = {
-    '1': ('Torrents Payloads (MB)', 'torrent_value_mb'),
-    '2': ('Capsule Megabytes', 'capsule_value_mb'),
-    '3': ('Kilowatts (real_kwh)', 'real_kwh'),
-    '4': ('Cache Megabytes', 'cache_value_mb'),
-    '5': ('Bandwidth MB/s', 'bandwidth_MBps'),
-}
-
-def create_deck():
-    deck = []
-    suits = list(CARD_SYMBOLS.keys())
-    ranks = list(CARD_RANKS.keys())
-    for suit in suits:
-        for rank in ranks:
-            deck.append((rank, suit))
-    random.shuffle(deck)
-    return deck
-
-def get_hand_value(hand):
-    value = sum(CARD_RANKS[card[0]] for card in hand)
-    num_aces = sum(1 for card in hand if card[0] == 'A')
-    while value > 21 and num_aces > 0:
-        value -= 10
-        num_aces -= 1
-    return value
-
-def get_card_art(card, face_down=False):
-    rank, suit_name = card
-    suit_symbol = CARD_SYMBOLS.get(suit_name, ' ')
-    if face_down:
-        lines = [
-            "┌───────┐",
-            "│░░░░░░░│",
-            "│░░░░░░░│",
-            "│░░░░░░░│",
-            "│░░░░░░░│",
-            "│░░░░░░░│",
-            "└───────┘"
-        ]
-    else:
-        lines = [
-            "┌───────┐",
-            f"│ {rank:<2}    │",
-            "│       │",
-            f"│   {suit_symbol}   │",
-            "│       │",
-            f"│    {rank:>2} │",
-            "└───────┘"
-        ]
-    return lines
-
-def display_hands(player_hand, dealer_hand, hide_dealer_card=True):
-    dealer_display = []
-    if hide_dealer_card:
-        dealer_cards = [dealer_hand[0], ('?', 'Down')] + dealer_hand[2:]
-    else:
-        dealer_cards = dealer_hand
-
-    player_art = [get_card_art(c, False) for c in player_hand]
-    dealer_art = [get_card_art(c, c[0] == '?') for c in dealer_cards]
-
-    print("\n" + "="*50)
-    print("DEALER'S HAND:")
-    for i in range(len(dealer_art[0])):
-        line = "    ".join(card[i] for card in dealer_art)
-        print(line)
-    if not hide_dealer_card:
-        print(f"Value: {get_hand_value(dealer_hand)}")
-    print("\n" + "-"*50)
-    print("YOUR HAND:")
-    for i in range(len(player_art[0])):
-        line = "    ".join(card[i] for card in player_art)
-        print(line)
-    print(f"Value: {get_hand_value(player_hand)}")
-    print("="*50)
-
-def blackjack_game(wallet):
-    wallet = load_wallet(wallet['wallet_id'])
-    print(f"\n⚡ Blackjack - Choose Your Betting Currency ⚡")
-    print("1. Torrents Payloads (MB)")
-    print("2. Capsule Megabytes")
-    print("3. Kilowatts (real_kwh)")
-    print("4. Cache Megabytes")
-    print("5. Bandwidth MB/s")
-
-    while True:
-        choice = input("Enter choice (1-5): ").strip()
-        if choice in CURRENCIES:
-            currency_name, currency_key = CURRENCIES[choice]
-            break
-        else:
-            print("Invalid choice. Please enter 1, 2, 3, 4, or 5.")
-
-    current_balance = wallet.get(currency_key, Decimal("0"))
-    if current_balance <= 0:
-        print(f"❌ You have no {currency_name} to bet! Go mining to earn some.")
-        return
-
-    print(f"Current Balance in {currency_name}: {format_large_number(current_balance)}")
-
-    while True:
-        bet_input = input(f"Enter your bet in {currency_name}: ").strip()
-        try:
-            bet = Decimal(bet_input)
-            if bet <= 0:
-                print("Bet must be a positive number.")
-            elif bet > current_balance:
-                print(f"You can't bet more than your current balance of {format_large_number(current_balance)}.")
-            else:
-                break
-        except:
-            print("Invalid input. Please enter a number.")
-
-    wallet[currency_key] -= bet
-    save_wallet(wallet)
-    print(f"Bet placed: {format_large_number(bet)} {currency_name}. New balance: {format_large_number(wallet[currency_key])} {currency_name}.")
-
-    deck = create_deck()
-    player_hand = [deck.pop(), deck.pop()]
-    dealer_hand = [deck.pop(), deck.pop()]
-
-    player_blackjack = get_hand_value(player_hand) == 21
-    player_busted = False
-    if not player_blackjack:
-        while True:
-            display_hands(player_hand, dealer_hand, hide_dealer_card=True)
-            p_value = get_hand_value(player_hand)
-            has_enough_for_double = bet <= wallet.get(currency_key, Decimal("0"))
-            if len(player_hand) == 2 and has_enough_for_double:
-                 action = input("Action (H)it, (S)tand, (D)ouble Down: ").strip().lower()
-            else:
-                 action = input("Action (H)it or (S)tand: ").strip().lower()
-
-            if action == 'h':
-                player_hand.append(deck.pop())
-                p_value = get_hand_value(player_hand)
-                if p_value > 21:
-                    player_busted = True
-                    display_hands(player_hand, dealer_hand, hide_dealer_card=True)
-                    print("BUST! You went over 21. Funds were already deducted.")
-                    break
-            elif action == 's':
-                break
-            elif action == 'd' and len(player_hand) == 2 and has_enough_for_double:
-                wallet[currency_key] -= bet
-                bet *= 2
-                save_wallet(wallet)
-                print(f"Double Down! New total bet: {format_large_number(bet)} {currency_name}.")
-                player_hand.append(deck.pop())
-                p_value = get_hand_value(player_hand)
-                if p_value > 21:
-                    player_busted = True
-                    display_hands(player_hand, dealer_hand, hide_dealer_card=True)
-                    print("BUST on Double Down! Funds were already deducted.")
-                break
-            else:
-                print("Invalid action.")
-
-    d_value = get_hand_value(dealer_hand)
-    dealer_blackjack = d_value == 21 and len(dealer_hand) == 2
-    d_busted = False
-
-    if not player_busted and not (player_blackjack and dealer_blackjack):
-        print("\n--- Dealer's Turn ---")
-        display_hands(player_hand, dealer_hand, hide_dealer_card=False)
-        while d_value < 17:
-            print("Dealer hits...")
-            time.sleep(1)
-            dealer_hand.append(deck.pop())
-            d_value = get_hand_value(dealer_hand)
-            display_hands(player_hand, dealer_hand, hide_dealer_card=False)
-        if d_value > 21:
-            print("DEALER BUSTS!")
-            d_busted = True
-        else:
-            print("Dealer stands.")
-
-    print("\n=== Game Result ===")
-    display_hands(player_hand, dealer_hand, hide_dealer_card=False)
-
-    p_value = get_hand_value(player_hand)
-    d_value = get_hand_value(dealer_hand)
-
-    payout = Decimal("0")
-
-    if player_busted:
-        print(f"You lose {format_large_number(bet)} {currency_name}.")
-    elif player_blackjack and not dealer_blackjack:
-        payout = bet * Decimal("2.5")
-        print(f"👑 BLACKJACK! You win 1.5 times your bet! Total return (Bet + Reward): {format_large_number(payout)} {currency_name}.")
-    elif d_busted:
-        payout = bet * Decimal("2")
-        print(f"🎉 Dealer Busts! You win 1 time your bet! Total return (Bet + Reward): {format_large_number(payout)} {currency_name}.")
-    elif p_value > d_value:
-        payout = bet * Decimal("2")
-        print(f"✅ You Win! Your {p_value} beats the dealer's {d_value}. Total return (Bet + Reward): {format_large_number(payout)} {currency_name}.")
-    elif p_value == d_value:
-        payout = bet
-        print(f"🤝 Push. It's a tie, your bet of {format_large_number(payout)} {currency_name} is returned.")
-    else:
-        print(f"❌ You Lose. Dealer's {d_value} beats your {p_value}.")
-
-    wallet[currency_key] += payout
-    save_wallet(wallet)
-    print(f"Final Balance in {currency_name}: {format_large_number(wallet[currency_key])}")
-
-# -------------------------
-# Hash / Mining functions
-# -------------------------
-def vh_btc_hash_function(capsule_header, amp_capsule):
-    sha_block = hashlib.sha256(BLOCK_HEADER.encode()).hexdigest()
-    pre_image = f"{capsule_header}{sha_block}{amp_capsule}{TEPI2}{E2PI}"
-    final_hash = hashlib.sha256(pre_image.encode()).hexdigest()
-    return final_hash
-
-def calculate_rig_hash_power(wallet):
-    permanent_hash_power = wallet.get("rig_hash_power", BASE_HASH_POWER)
-    resource_bonus = wallet.get("cache_value_mb", Decimal("0")) / Decimal("1000")
-    effective_hash_power = permanent_hash_power * (Decimal("1") + resource_bonus)
-    return effective_hash_power.quantize(Decimal("0.000001"))
-
-def generate_node_id():
-    return str(uuid.uuid4())
-
-# -------------------------
-# Wallet persistence & utilities
-# -------------------------
-def save_wallet(wallet):
-    wallet_copy = wallet.copy()
-    wallet_copy.pop("sha_boost_active", None)
-    # convert Decimal to float for JSON
-    for key, value in wallet_copy.items():
-        if isinstance(value, Decimal):
-            wallet_copy[key] = float(value)
-    wallet_file = os.path.join(TARGETDIR, f"{wallet['wallet_id']}_wallet.json")
-    with open(wallet_file, "w") as f:
-        json.dump(wallet_copy, f, indent=4)
-
-def _ensure_wallet_has_node(data):
-    if data.get('wallet_id') == WORLD_DEBT_WALLET_ID:
-        if data.get("node_id") != WORLD_DEBT_NODE_ID:
-            data["node_id"] = WORLD_DEBT_NODE_ID
-    elif "node_id" not in data or not data["node_id"]:
-        data["node_id"] = generate_node_id()
-    return data
-
-def load_wallet(wallet_id):
-    wallet_file = os.path.join(TARGETDIR, f"{wallet_id}_wallet.json")
-    if not os.path.exists(wallet_file):
-        return None
-    with open(wallet_file, "r") as f:
-        data = json.load(f)
-
-    # Backwards compatibility: accept old key name world_debt_paid_usd
-    if "world_debt_paid_egp" not in data and "world_debt_paid_usd" in data:
-        try:
-            data["world_debt_paid_egp"] = Decimal(str(data.pop("world_debt_paid_usd"))) * EGP_RATE
-        except:
-            data["world_debt_paid_egp"] = Decimal("0")
-    if "world_debt_paid_egp" not in data:
-        data["world_debt_paid_egp"] = Decimal("0")
-
-    for key in ["capsule_value_mb", "cache_value_mb", "rig_hash_power", "real_kwh", "bandwidth_MBps", "world_debt_paid_egp", "torrent_value_mb"]:
-        if key in data:
-            data[key] = Decimal(str(data[key]))
-
-    data["sha_boost_active"] = False
-    original_node_id = data.get("node_id")
-    data = _ensure_wallet_has_node(data)
-
-    if data.get('wallet_id') == WORLD_DEBT_WALLET_ID and data.get("node_id") == WORLD_DEBT_NODE_ID and original_node_id != WORLD_DEBT_NODE_ID:
-        save_wallet(data)
-
-    return data
-
-def create_wallet(wallet_id, rig_id=None):
-    existing = load_wallet(wallet_id)
-    if existing:
-        return existing
-
-    if wallet_id in [DONATION_WALLET_ID, WORLD_DEBT_WALLET_ID]:
-        display_id = rig_id if rig_id else wallet_id
-        print(f"🛑 Error: Wallet ID '{display_id}' is reserved for special system purposes and cannot be created here.")
-        return None
-
-    node_id = generate_node_id()
-    wallet = {
-        "wallet_id": wallet_id,
-        "rig_id": rig_id or wallet_id,
-        "capsule_value_mb": Decimal("0"),
-        "cache_value_mb": Decimal("0"),
-        "rig_hash_power": BASE_HASH_POWER,
-        "real_kwh": Decimal("0"),
-        "bandwidth_MBps": Decimal("0"),
-        "torrent_value_mb": Decimal("0"),
-        "node_id": node_id,
-        "world_debt_paid_egp": Decimal("0"),
-    }
-    save_wallet(wallet)
-    return wallet
-
-def _initialize_special_wallets():
-    if not load_wallet(DONATION_WALLET_ID):
-        print(f"🛠️ Initializing Donation Wallet: {DONATION_WALLET_ID}")
-        wallet = {
-            "wallet_id": DONATION_WALLET_ID,
-            "rig_id": "donations",
-            "capsule_value_mb": Decimal("0"),
-            "cache_value_mb": Decimal("0"),
-            "rig_hash_power": BASE_HASH_POWER,
-            "real_kwh": Decimal("0"),
-            "bandwidth_MBps": Decimal("0"),
-            "torrent_value_mb": Decimal("0"),
-            "node_id": generate_node_id(),
-            "world_debt_paid_egp": Decimal("0"),
-        }
-        save_wallet(wallet)
-
-    if not load_wallet(WORLD_DEBT_WALLET_ID):
-        print(f"🛠️ Initializing World Debt Wallet: {WORLD_DEBT_WALLET_ID}")
-        wallet = {
-            "wallet_id": WORLD_DEBT_WALLET_ID,
-            "rig_id": "world debt fund",
-            "capsule_value_mb": Decimal("0"),
-            "cache_value_mb": Decimal("0"),
-            "rig_hash_power": BASE_HASH_POWER,
-            "real_kwh": Decimal("0"),
-            "bandwidth_MBps": Decimal("0"),
-            "torrent_value_mb": Decimal("0"),
-            "node_id": WORLD_DEBT_NODE_ID,
-            "world_debt_paid_egp": Decimal("0"),
-        }
-        save_wallet(wallet)
-
-def world_debt_node_value_generation():
-    debt_wallet = load_wallet(WORLD_DEBT_WALLET_ID)
-    if not debt_wallet or debt_wallet.get('node_id') != WORLD_DEBT_NODE_ID:
-        return
-    mb_generated = DEBT_NODE_PASSIVE_EGP_VALUE / MB_EGP_RATE if MB_EGP_RATE > 0 else Decimal("0")
-    debt_wallet['capsule_value_mb'] += mb_generated
-    save_wallet(debt_wallet)
-
-# -------------------------
-# EGP Calculations
-# -------------------------
-def calculate_total_egp(wallet):
-    return (
-        wallet.get('capsule_value_mb', Decimal("0")) * MB_EGP_RATE +
-        wallet.get('cache_value_mb', Decimal("0")) * CACHE_EGP_RATE +
-        wallet.get('real_kwh', Decimal("0")) * KWH_EGP_RATE +
-        wallet.get('bandwidth_MBps', Decimal("0")) * BANDWIDTH_EGP_RATE +
-        wallet.get('torrent_value_mb', Decimal("0")) * TORRENT_EGP_RATE
-    ).quantize(Decimal("0.000001"))
-
-# -------------------------
-# Capsule / Torrent generation
-# -------------------------
-CUSTOM_REWARDS = [
-    "Formula_Power", "Y7K DOLLAR", "bricks dollar", "2piE", "TE", "TE2pi", "Manierism", "Handrichism", "teЛ²", "E²Л",
-    "RAM", "SDRAM", "SHA", "Nuclear", "Onshore",
-    "Gigabyte", "Terabyte", "Petabyte", "PIB", "Electrism",
-    "Pirate", "Torrent", "Bootleg", "Seeder", "Swarm"
-]
-
-def generate_torrent_file(wallet, capsule_type, reward_mb):
-    torrent_data = {
-        "capsule_type": capsule_type,
-        "wallet_id": wallet["wallet_id"],
-        "node_id": wallet.get("node_id", "N/A"),
-        "reward_mb": float(reward_mb),
-        "timestamp": time.time(),
-        "overlay_constants": {
-            "TEЛ²": TEPI2,
-            "E²Л": E2PI,
-            "block_header": BLOCK_HEADER
-        }
-    }
-    filename = f"{wallet['wallet_id']}_{capsule_type}_capsule.torrent"
-    path = os.path.join(BASEDIR, filename)
-    with open(path, "w") as f:
-        json.dump(torrent_data, f, indent=4)
-    print(f"🧲 Torrent file created: {filename}")
-
-# -------------------------
-# Mining Loop
-# -------------------------
-def unified_mining_loop(wallet, mining_type):
-    MAX_TICKS = TOTAL_YEARS * 365
-    current_tick = 0
-
-    last_block_time = wallet.get("last_block_time", time.time())
-    elapsed_time = time.time() - last_block_time
-    blocks_since_start = wallet.get("blocks_mined", Decimal("0"))
-
-    current_epoch = math.floor(float(blocks_since_start) / float(BLOCKS_PER_EPOCH))
-    current_epoch_reward = INITIAL_BLOCK_REWARD * (DECAY_RATE ** current_epoch)
-
-    if current_epoch >= (TOTAL_YEARS / EPOCH_YEARS):
-        current_epoch_reward = Decimal("0")
-
-    try:
-        while current_tick < MAX_TICKS:
-            wallet = load_wallet(wallet['wallet_id'])
-            if not wallet:
-                print("⚠️ Wallet disappeared. Stopping mining.")
-                break
-
-            world_debt_node_value_generation()
-
-            capsule_type = random.choice(CUSTOM_REWARDS)
-            if DEBUG_SHA_BOOST and current_tick == 0 and mining_type == "sha":
-                capsule_type = "SHA"
-
-            effective_hash_power = calculate_rig_hash_power(wallet)
-            sha_boost_amount_added = Decimal("0")
-
-            vh_hash = vh_btc_hash_function(capsule_type, str(effective_hash_power))
-
-            if mining_type == "sha" and capsule_type == "SHA":
-                boost_amount = wallet["rig_hash_power"] / Decimal("4")
-                wallet["rig_hash_power"] += boost_amount
-                sha_boost_amount_added = boost_amount
-                wallet["sha_boost_active"] = True
-                print(f"🌠 SHA Boost PERMANENTLY +{format_large_number(boost_amount)} H/s to Wallet: {wallet['wallet_id']}")
-
-            scaling_factor = effective_hash_power / BASE_HASH_POWER
-
-            if capsule_type == "E^2*Л":
-                power_scale_factor = E2PI_VALUE / Decimal(1e30)
-                base_mb_reward_roll = Decimal(random.randint(1, 15)) * power_scale_factor
-                base_mb_reward_roll *= EGINMA_MULTIPLIER
-            else:
-                base_mb_reward_roll = Decimal(random.randint(1, 15))
-
-            reward_mb = base_mb_reward_roll * scaling_factor * current_epoch_reward
-            reward_kwh = overlay_formula(reward_mb)
-            base_bandwidth_roll = Decimal(random.randint(1, 15))
-            reward_bandwidth = base_bandwidth_roll * scaling_factor * current_epoch_reward
-
-            reward_hash_gain = wallet["rig_hash_power"] * HASH_GROWTH_RATE
-
-            emit_real_electricity(reward_kwh)
-            log_real_emission(wallet["wallet_id"], reward_mb, reward_kwh, capsule_type)
-
-            rewarded_resource = "Capsule MB"
-            if mining_type == "cache":
-                wallet["cache_value_mb"] += reward_mb
-                wallet["capsule_value_mb"] += reward_mb
-                rewarded_resource = "Cache & Capsule MB"
-            else:
-                wallet["capsule_value_mb"] += reward_mb
-
-            wallet["rig_hash_power"] += reward_hash_gain
-            wallet["real_kwh"] += reward_kwh
-            wallet["bandwidth_MBps"] += reward_bandwidth
-
-            wallet["sha_boost_active"] = False
-
-            wallet["blocks_mined"] = blocks_since_start + 1
-            wallet["last_block_time"] = time.time()
-            blocks_since_start += 1
-
-            if capsule_type.lower() in ["pirate", "torrent", "bootleg", "seeder", "swarm"]:
-                torrent_mb = reward_mb / Decimal("2")
-                wallet["torrent_value_mb"] = wallet.get("torrent_value_mb", Decimal("0")) + torrent_mb
-                generate_torrent_file(wallet, capsule_type, torrent_mb)
-                print(f"🏴‍☠️ Torrent Payload Gained: {format_large_number(torrent_mb)} MB")
-
-            save_wallet(wallet)
-
-            display_permanent_hash_power = format_large_number(wallet["rig_hash_power"])
-            total_egp = calculate_total_egp(wallet)
-            display_current_epoch = current_epoch + 1
-
-            print(f"\n--- Capsule Mined: {capsule_type} ({mining_type.upper()}) ---")
-            print(f"⚡ 1000-YR REWARD EPOCH: {display_current_epoch} of 20 (Decay Rate: {DECAY_RATE})")
-            print(f"Hash Found (VH_BTC): {vh_hash[:10]}...")
-            if capsule_type == "E^2*Л":
-                print(f"⚡ ENHANCED REWARD RATE: Eginma Multiplier ({format_large_number(EGINMA_MULTIPLIER)}) APPLIED!")
-            print(f"💾 {rewarded_resource} Gained: {format_large_number(reward_mb)} MB")
-            print(f"⚡ kWh Gained:     {format_large_number(reward_kwh)} kWh")
-            print(f"🛰️ Bandwidth Gained: {format_large_number(reward_bandwidth)} MB/s")
-            print(f"--------------------------")
-            print(f"📈 H/s Gain:       {reward_hash_gain:.6f} (Passive)")
-            print(f"🌠 H/s (Effective):{format_large_number(effective_hash_power)} (Includes Resource Bonus)")
-            print(f"🌠 H/s (Permanent):{display_permanent_hash_power}")
-            print(f"SHA Boost:        {format_large_number(sha_boost_amount_added)} (ADDED PERMANENTLY)")
-            print(f"Balance MB:       {format_large_number(wallet['capsule_value_mb'])}")
-            print(f"Balance Cache MB: {format_large_number(wallet['cache_value_mb'])}")
-            print(f"💰 Total EGP Value (Watts-backed): {format_large_number(total_egp)} EGP")
-
-            current_tick += 1
-            time.sleep(random.randint(5, 150))
-
-        print(f"\n✅ Mining complete after reaching {TOTAL_YEARS} years.")
-
-    except KeyboardInterrupt:
-        print("\n⛔ Mining stopped by user.")
-
-# -------------------------
-# Transfers, Donations & Exports (EGP-aware)
-# -------------------------
-def send_resource(wallet, resource_name):
-    try:
-        target_id = input(f"Enter target Wallet ID to send {resource_name.replace('_',' ')}: ").strip()
-
-        if target_id in [DONATION_WALLET_ID, WORLD_DEBT_WALLET_ID]:
-            print("🛑 Cannot send resources to these reserved wallet IDs using the general send function. Use the Donation or Debt menu.")
-            return
-
-        amt = Decimal(input("Amount to send: ").strip())
-        if amt <= 0:
-            print("⚠️ Enter a positive amount.")
-            return
-
-        if resource_name == "egp_value":
-            total_egp = calculate_total_egp(wallet)
-            if amt > total_egp:
-                print(f"⚠️ Not enough EGP-backed balance. Max: {format_large_number(total_egp)} EGP")
-                return
-            proportion = amt / total_egp if total_egp > 0 else Decimal("0")
-            wallet['capsule_value_mb'] -= wallet['capsule_value_mb'] * proportion
-            wallet['cache_value_mb'] -= wallet['cache_value_mb'] * proportion
-            wallet['real_kwh'] -= wallet['real_kwh'] * proportion
-            wallet['bandwidth_MBps'] -= wallet['bandwidth_MBps'] * proportion
-            wallet['torrent_value_mb'] -= wallet['torrent_value_mb'] * proportion
-        else:
-            if wallet.get(resource_name, Decimal("0")) < amt:
-                print(f"⚠️ Not enough {resource_name.replace('_',' ')} balance.")
-                return
-            wallet[resource_name] -= amt
-
-        target = load_wallet(target_id) or create_wallet(target_id)
-        if not target:
-            return
-
-        if resource_name == "egp_value":
-            total_egp_target = calculate_total_egp(target)
-            if total_egp_target > 0:
-                factor = (total_egp_target + amt) / total_egp_target
-                target['capsule_value_mb'] *= factor
-                target['cache_value_mb'] *= factor
-                target['real_kwh'] *= factor
-                target['bandwidth_MBps'] *= factor
-                target['torrent_value_mb'] *= factor
-            else:
-                # if target had zero, assign as capsule MB proportionally
-                target['capsule_value_mb'] += amt / MB_EGP_RATE if MB_EGP_RATE > 0 else Decimal("0")
-        else:
-            target[resource_name] = target.get(resource_name, Decimal("0")) + amt
-
-        save_wallet(wallet)
-        save_wallet(target)
-        print(f"✅ Sent {format_large_number(amt)} {'EGP' if resource_name == 'egp_value' else resource_name.replace('_',' ')} from {wallet['wallet_id']} to {target_id}")
-
-    except Exception as e:
-        print(f"❌ Error: {e}")
-
-def donate_for_hash(wallet, resource_name):
-    donation_wallet = load_wallet(DONATION_WALLET_ID)
-    if not donation_wallet:
-        print("⚠️ Donation wallet not found.")
-        return
-    try:
-        amt = Decimal(input(f"Amount {resource_name.replace('_',' ')} to donate: ").strip())
-        if amt <= 0:
-            print("⚠️ Enter a positive amount.")
-            return
-
-        if wallet.get(resource_name, Decimal("0")) < amt:
-            print(f"⚠️ Not enough {resource_name.replace('_',' ')} balance.")
-            return
-
-        wallet[resource_name] -= amt
-
-        donation_wallet[resource_name] = donation_wallet.get(resource_name, Decimal("0")) + amt
-
-        hash_power_gain = amt
-        if resource_name == "cache_value_mb":
-            hash_power_gain *= Decimal("79000")
-            print(f"✨ Applied {Decimal('79000')}x amplifier to Hash Power gain for Cache MB donation.")
-
-        wallet["rig_hash_power"] += hash_power_gain
-
-        save_wallet(wallet)
-        save_wallet(donation_wallet)
-        print(f"🙏 Donated {format_large_number(amt)} {resource_name.replace('_',' ')}.")
-        print(f"🚀 Gained {format_large_number(hash_power_gain)} Hash Power!")
-
-    except Exception as e:
-        print(f"❌ Error: {e}")
-
-def _get_all_wallets():
-    files = [f for f in os.listdir(TARGETDIR) if f.endswith("_wallet.json")]
-    wallets_data = {}
-    for f in files:
-        wallet_id = f.replace("_wallet.json", "")
-        wallets_data[wallet_id] = load_wallet(wallet_id)
-    return wallets_data
-
-def select_wallet_or_rig():
-    wallets_data = _get_all_wallets()
-    if not wallets_data:
-        print("⚠️ No wallets/rigs found.")
-        return None
-
-    print("\nSelect a Rig/Wallet or type Wallet ID:")
-    sorted_wallet_ids = sorted(wallets_data.keys(), key=lambda x: (x != WORLD_DEBT_WALLET_ID, x != DONATION_WALLET_ID, x))
-
-    for i, wallet_id in enumerate(sorted(wallets_data.keys(), key=lambda x: (x != WORLD_DEBT_WALLET_ID, x != DONATION_WALLET_ID, x)), 1):
-        rig_id = wallets_data[wallet_id].get('rig_id', wallet_id)
-        print(f"{i}. {rig_id} ({wallet_id})")
-
-    choice = input("Enter number or Wallet ID: ").strip()
-    if choice.isdigit():
-        idx = int(choice)
-        if 1 <= idx <= len(sorted_wallet_ids):
-            wallet_id = sorted_wallet_ids[idx-1]
-            return wallets_data.get(wallet_id)
-
-    return wallets_data.get(choice)
-
-def select_wallet_for_mining():
-    wallets_data = _get_all_wallets()
-    user_wallets_ids = [id for id in wallets_data.keys() if id not in [DONATION_WALLET_ID, WORLD_DEBT_WALLET_ID]]
-
-    if not user_wallets_ids:
-        print("⚠️ No personal wallets/rigs found. Create one first (Option 6 in main menu).")
-        return None
-
-    print("\n--- Select Rig for Mining ---")
-    sorted_user_wallets = sorted(user_wallets_ids)
-    for i, wallet_id in enumerate(sorted_user_wallets, 1):
-        rig_id = wallets_data[wallet_id].get('rig_id', wallet_id)
-        print(f"{i}. {rig_id} ({wallet_id})")
-
-    choice = input("Enter number: ").strip()
-    if choice.isdigit():
-        idx = int(choice)
-        if 1 <= idx <= len(sorted_user_wallets):
-            wallet_id = sorted_user_wallets[idx-1]
-            return wallets_data.get(wallet_id)
-
-    print("⚠️ Invalid selection.")
-    return None
-
-def show_rig_dashboard(wallet):
-    if wallet['wallet_id'] in [WORLD_DEBT_WALLET_ID, DONATION_WALLET_ID]:
-        wallet = load_wallet(wallet['wallet_id'])
-
-    # Placeholder for actual device scanning functionality (omitted for safety/platform)
-    device_cache = Decimal("0.0")
-    if os.name == 'posix': # Simple check if running on a Unix-like system where user folders might be scannable
-        try:
-            device_cache, _ = scan_device_cache_mb()
-        except:
-            device_cache = Decimal("0.0")
-            
-    total_egp = calculate_total_egp(wallet)
-    effective_hash_power = calculate_rig_hash_power(wallet)
-
-    print(f"\n--- Capsule Rig Dashboard — {wallet['rig_id']} (Manierism Electrism) ---")
-    print(f"Wallet ID: {wallet['wallet_id']}")
-    print(f"🌐 Node ID: {wallet.get('node_id','N/A')[:8]}...")
-    print(f"🌠 Hash Power (Permanent): {format_large_number(wallet['rig_hash_power'])}")
-    print(f"🚀 Hash Power (Effective): {format_large_number(effective_hash_power)} (Used for Mining Rate)")
-    if wallet.get("sha_boost_active"):
-        boost_calc = wallet['rig_hash_power'] / Decimal('4')
-        print(f"⚡ SHA Boost ACTIVE: +{format_large_number(boost_calc)} H/s ")
-    print(f"💾 Capsule MB: {format_large_number(wallet['capsule_value_mb'])}")
-    print(f"📦 Cache MB: {format_large_number(wallet['cache_value_mb'])}")
-    print(f"📥 Device Cache (User Folders): {format_large_number(device_cache)} MB")
-    print(f"⚡ Real kWh: {format_large_number(wallet['real_kwh'])}")
-    print(f"📡 Bandwidth: {format_large_number(wallet['bandwidth_MBps'])} MB/s")
-    print(f"🧲 Torrent Payloads: {format_large_number(wallet.get('torrent_value_mb', Decimal('0')))} MB")
-    print(f"💵 Total EGP Value: {format_large_number(total_egp)} EGP")
-    print("-" * 40)
-
-    if wallet['wallet_id'] == WORLD_DEBT_WALLET_ID:
-        total_debt_paid_egp = calculate_total_egp(wallet)
-        print(f"🌎 Total Debt Paid: {format_large_number(total_debt_paid_egp)} EGP (This Wallet's EGP Value)")
-    elif wallet['wallet_id'] != DONATION_WALLET_ID:
-        print(f"🌎 World Debt Contributed: {format_large_number(wallet.get('world_debt_paid_egp', Decimal('0')))} EGP")
-    print("-" * 40)
-
-def run_internet_terminal(wallet):
-    node_id = wallet.get("node_id")
-    flask_thread_started = False
-    MB_USED_TOTAL = 0.0
-    current_url = None
-
-    app = Flask(__name__)
-
-    @app.route('/')
-    def render_page():
-        nonlocal current_url
-        if current_url:
-            try:
-                r = requests.get(current_url)
-                content = r.text
-            except Exception as e:
-                content = f"<p>Could not fetch URL: {e}</p>"
-        else:
-            content = "<p>No URL selected. Enter a URL in the terminal search.</p>"
-
-        template = """
-        <!DOCTYPE html>
-        <html lang="en">
-        <head><meta charset="UTF-8"><title>Local Page Preview</title></head>
-        <body>{{ content|safe }}</body>
-        </html>
-        """
-        return render_template_string(template, content=content)
-
-    def start_flask():
-        app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False)
-
-    def fetch_bing_results(query, max_results=5):
-        nonlocal MB_USED_TOTAL
-        url = f"https://www.bing.com/search?q={query.replace(' ', '+')}"
-        response = requests.get(url)
-        MB_USED_TOTAL += len(response.content) / (1024 * 1024)
-        burned_MB = Decimal(MB_USED_TOTAL)
-        wallet['capsule_value_mb'] -= burned_MB
-        if wallet['capsule_value_mb'] < 0:
-            wallet['capsule_value_mb'] = Decimal("0")
-
-        reward_kwh = overlay_formula(burned_MB)
-        wallet['real_kwh'] += reward_kwh
-        emit_real_electricity(reward_kwh)
-        log_real_emission(wallet['wallet_id'], burned_MB, reward_kwh, "InternetSearch")
-        save_wallet(wallet)
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        results = []
-        for li in soup.find_all('li', {'class': 'b_algo'})[:max_results]:
-            title_tag = li.find('h2')
-            snippet_tag = li.find('p')
-            link_tag = title_tag.find('a') if title_tag else None
-            if title_tag:
-                title = title_tag.get_text(strip=True)
-                snippet = snippet_tag.get_text(strip=True) if snippet_tag else "No snippet available."
-                link = link_tag['href'] if link_tag else "No link"
-                results.append({'title': title, 'snippet': snippet, 'link': link})
-        return results
-
-    print(f"\n🍫 Willy Wonka Internet Terminal 🍫")
-    print(f"🔗 Node Linked: {node_id}")
-    print("Type a URL to preview in local web display.")
-
-    while True:
-        query = input("\nEnter search query or URL (or 'exit'): ").strip()
-
-        if query.lower() == 'exit':
-            break
-
-        if query.startswith("http://") or query.startswith("https://"):
-            current_url = query
-            if not flask_thread_started:
-                threading.Thread(target=start_flask, daemon=True).start()
-                flask_thread_started = True
-            print(f"Opening {query} in local Flask preview...")
-            webbrowser.open("http://localhost:5000/")
-            continue
-
-        capsule_type = random.choice(CUSTOM_REWARDS)
-        vh_hash = vh_btc_hash_function(capsule_type, str(wallet['rig_hash_power']))
-        print(f"🔍 Capsule Overlay: {capsule_type}")
-        print(f"🔑 VH_BTC Hash: {vh_hash[:10]}...")
-
-        results = fetch_bing_results(query)
-        print(f"\n💾 Capsule MB Remaining: {format_large_number(wallet['capsule_value_mb'])}")
-        for i, r in enumerate(results, 1):
-            print(f"{i}. {r['title']}\n   {r['snippet']}\n   {r['link']}\n")
-
-        with open(os.path.join(BASEDIR, "query_log.txt"), "a") as f:
-            f.write(f"{capsule_type} | {vh_hash} | {query}\n")
-
-        input("Press Enter for new search...")
-
-def show_receive_info(wallet):
-    print("\n--- Receive Info ---")
-    print(f"Wallet ID (for receiving resources): {wallet['wallet_id']}")
-    print(f"Node ID (for network interactions): {wallet['node_id']}")
-    print("Share these to receive transfers.")
-    input("Press Enter to continue...")
-
-def scan_device_cache_mb():
-    # Note: This path is specific to Android and may not work on other OSs.
-    # It is kept as a symbolic function for the game's mechanics.
-    total_mb = Decimal("0.0")
-    scanned_paths = []
-    # If not on Android-like environment, this will not execute but still be imported.
-    if os.name == 'posix' and os.path.isdir("/storage/emulated/0/"): 
-        for root, dirs, files in os.walk("/storage/emulated/0/"):
-            for name in files:
-                try:
-                    path = os.path.join(root, name)
-                    size_bytes = os.path.getsize(path)
-                    size_mb = Decimal(size_bytes) / Decimal(1024 * 1024)
-                    total_mb += size_mb
-                    scanned_paths.append(path)
-                except:
-                    continue
-    return total_mb.quantize(Decimal("0.000001")), scanned_paths
-
-def show_rig_download_info(wallet):
-    rig_info = {
-        "wallet_id": wallet['wallet_id'],
-        "rig_id": wallet.get('rig_id', wallet['wallet_id']),
-        "node_id": wallet.get('node_id', 'N/A'),
-        "capsule_MB": float(wallet.get('capsule_value_mb', Decimal("0"))),
-        "cache_MB": float(wallet.get('cache_value_mb', Decimal("0"))),
-        "real_kWh": float(wallet.get('real_kwh', Decimal("0"))),
-        "bandwidth_MBps": float(wallet.get('bandwidth_MBps', Decimal("0"))),
-        "torrent_MB": float(wallet.get('torrent_value_mb', Decimal("0"))),
-        "rig_hash_power": float(wallet.get('rig_hash_power', BASE_HASH_POWER)),
-        "world_debt_paid_egp": float(wallet.get('world_debt_paid_egp', Decimal("0"))),
-        "total_egp_value": float(calculate_total_egp(wallet)),
-        "timestamp": time.time(),
-        "overlay_constants": {
-            "TEЛ²": str(TEPI2),
-            "E²Л": str(E2PI),
-            "block_header": BLOCK_HEADER
-        }
-    }
-    file_name = f"rig_info_{wallet['wallet_id']}.json"
-    path = os.path.join(BASEDIR, file_name)
-    with open(path, "w") as f:
-        json.dump(rig_info, f, indent=4)
-    print(f"✅ Rig info exported to {path}")
-
-def enhanced_download_resource_menu(wallet):
-    print("\n📥 Enhanced Resource Export")
-    print("Select resource to export:")
-    print("  1. Capsule MB")
-    print("  2. Cache MB")
-    print("  3. Real kWh")
-    print("  4. Bandwidth MBps")
-    print("  5. Torrent MB")
-    print("  6. EGP Value (calculated)")
-    print("  7. Cancel")
-    choice = input("Enter option: ").strip()
-
-    resource_map = {
-        "1": "capsule_value_mb",
-        "2": "cache_value_mb",
-        "3": "real_kwh",
-        "4": "bandwidth_MBps",
-        "5": "torrent_value_mb",
-        "6": "egp_value"
-    }
-
-    if choice == "7":
-        print("🛑 Cancelled.")
-        return
-
-    resource_key = resource_map.get(choice)
-    if not resource_key:
-        print("⚠️ Invalid selection.")
-        return
-
-    try:
-        amt_str = input(f"\nEnter amount of {resource_key.replace('_',' ')} to export: ").strip()
-        amt = Decimal(amt_str)
-        if amt <= 0:
-            print("⚠️ Must be greater than zero.")
-            return
-    except:
-        print("❌ Invalid number format.")
-        return
-
-    if resource_key == "egp_value":
-        available = calculate_total_egp(wallet)
-    else:
-        available = wallet.get(resource_key, Decimal("0"))
-
-    if amt > available:
-        print(f"⚠️ Not enough balance. Max available: {format_large_number(available)}")
-        return
-
-    print("\nChoose file format:")
-    print("  1. .json")
-    print("  2. .txt")
-    print("  3. .torrent")
-    print("  4. .capsule")
-    format_choice = input("Enter format option: ").strip()
-
-    format_map = {
-        "1": "json",
-        "2": "txt",
-        "3": "torrent",
-        "4": "capsule"
-    }
-
-    file_ext = format_map.get(format_choice)
-    if not file_ext:
-        print("⚠️ Invalid format.")
-        return
-
-    export_data = {
-        "wallet_id": wallet['wallet_id'],
-        "rig_id": wallet.get('rig_id', wallet['wallet_id']),
-        "node_id": wallet.get('node_id', 'N/A'),
-        "resource": resource_key,
-        "amount": float(amt),
-        "timestamp": time.time(),
-        "overlay_constants": {
-            "TEЛ²": TEPI2,
-            "E²Л": E2PI,
-            "block_header": BLOCK_HEADER
-        },
-        # Add Manierism Electrism capsule settlement context
-        "capsule_settlement": {
-            "plant_name": "Manierism Electrism",
-            "currency": "EGP",
-            "egp_rate": float(EGP_RATE)
-        }
-    }
-
-    filename = f"{wallet['wallet_id']}_{resource_key}_{amt}_{file_ext}.{file_ext}"
-    path = os.path.join(BASEDIR, filename)
-
-    try:
-        if file_ext == "json":
-            with open(path, "w") as f:
-                json.dump(export_data, f, indent=4)
-        elif file_ext == "txt":
-            with open(path, "w") as f:
-                for k, v in export_data.items():
-                    f.write(f"{k}: {v}\n")
-        else:
-            with open(path, "w") as f:
-                f.write(json.dumps(export_data))
-
-        print(f"\n✅ Exported {resource_key.replace('_',' ')} to:")
-        print(f"   {path}")
-    except Exception as e:
-        print(f"❌ Error writing file: {e}")
-
-def show_world_debt_payment_menu(wallet):
-    print("\n🌎 World Debt Payment Plan 🌎")
-    print(f"Your Wallet ID: {wallet['wallet_id']}")
-    print(f"Your Node ID: {wallet['node_id']}")
-    print(f"Debt Date: {WORLD_DEBT_DATE}")
-    print("-" * 40)
-
-    total_egp = calculate_total_egp(wallet)
-    paid = wallet.get("world_debt_paid_egp", Decimal("0"))
-    remaining = INITIAL_WORLD_DEBT_EGP - paid
-
-    print(f"💰 Your Total EGP Value: {format_large_number(total_egp)} EGP")
-    print(f"🌍 Your Debt Paid:       {format_large_number(paid)} EGP")
-    print(f"🌍 Remaining Global Debt: {format_large_number(remaining)} EGP")
-    print("-" * 40)
-
-    print("Would you like to contribute EGP to the World Debt Wallet?")
-    print("This will symbolically reduce global debt and log your node as a contributor.")
-    choice = input("Type YES to proceed, or press Enter to cancel: ").strip()
-
-    if choice != "YES":
-        print("🛑 Cancelled.")
-        return
-
-    print("💡 Enter amount like 10.0 or 42.50 — no commas, no currency symbol.")
-    try:
-        amt_str = input("Amount to contribute: ").strip()
-        if "EGP" in amt_str or "," in amt_str or "$" in amt_str:
-            print("⚠️ Please enter a clean number like 10.0 — no currency symbol or commas.")
-            return
-        amt = Decimal(amt_str)
-    except:
-        print("❌ Invalid number format.")
-        return
-
-    available = calculate_total_egp(wallet)
-    if amt > available:
-        print(f"⚠️ Not enough EGP-backed balance. Max: {format_large_number(available)} EGP")
-        return
-
-    proportion = amt / available if available > 0 else Decimal("0")
-    wallet['capsule_value_mb'] -= wallet['capsule_value_mb'] * proportion
-    wallet['cache_value_mb'] -= wallet['cache_value_mb'] * proportion
-    wallet['real_kwh'] -= wallet['real_kwh'] * proportion
-    wallet['bandwidth_MBps'] -= wallet['bandwidth_MBps'] * proportion
-    wallet['torrent_value_mb'] -= wallet['torrent_value_mb'] * proportion
-    wallet['world_debt_paid_egp'] += amt
-
-    debt_wallet = load_wallet(WORLD_DEBT_WALLET_ID)
-    if debt_wallet:
-        debt_wallet['capsule_value_mb'] += amt / MB_EGP_RATE if MB_EGP_RATE > 0 else Decimal("0")
-        debt_wallet['torrent_value_mb'] += amt / MB_EGP_RATE if MB_EGP_RATE > 0 else Decimal("0")
-        save_wallet(debt_wallet)
-
-    save_wallet(wallet)
-    print(f"✅ Contributed {format_large_number(amt)} EGP to World Debt Wallet.")
-    print("🌍 Your node has been logged as a symbolic contributor to planetary debt reduction.")
-
-def wallet_transaction_menu(wallet):
-    while True:
-        wallet = load_wallet(wallet['wallet_id'])
-        if not wallet:
-            break
-
-        show_rig_dashboard(wallet)
-
-        print("\n--- Wallet Actions ---")
-        print("  1. Send Capsule MB")
-        print("  2. Send Cache MB")
-        print("  3. Send kWh")
-        print("  4. Send Bandwidth")
-        print("  5. Send EGP Value")
-        print("  6. Send Torrent MB")
-        print("  ----------------------------------------")
-        print("  7. Donate Capsule MB to Creator (Gain Hash Power)")
-        print("  8. Donate Cache MB to Creator (Gain Hash Power)")
-        print("  9. Donate kWh to Creator (Gain Hash Power)")
-        print(" 10. Donate Bandwidth to Creator (Gain Hash Power)")
-        print(" 11. Donate Torrent MB to Creator (Gain Hash Power)")
-        print("  ----------------------------------------")
-        print(" 12. View Receive Info (Wallet/Node IDs)")
-        print(" 13. Download Resource to File")
-        print(" 14. Everything About the Rig (Download Info)")
-        print(" 15. World Debt Payment Plan 🌎")
-        print(" 16. Back to Main Menu")
-        print(" 17. Access Internet Terminal (Node-Linked)")
-        print("  ----------------------------------------")
-
-        option = input("Enter option: ").strip()
-
-        if option == "1":
-            send_resource(wallet, "capsule_value_mb")
-        elif option == "2":
-            send_resource(wallet, "cache_value_mb")
-        elif option == "3":
-            send_resource(wallet, "real_kwh")
-        elif option == "4":
-            send_resource(wallet, "bandwidth_MBps")
-        elif option == "5":
-            send_resource(wallet, "egp_value")
-        elif option == "6":
-            send_resource(wallet, "torrent_value_mb")
-        elif option == "7":
-            donate_for_hash(wallet, "capsule_value_mb")
-        elif option == "8":
-            donate_for_hash(wallet, "cache_value_mb")
-        elif option == "9":
-            donate_for_hash(wallet, "real_kwh")
-        elif option == "10":
-            donate_for_hash(wallet, "bandwidth_MBps")
-        elif option == "11":
-            donate_for_hash(wallet, "torrent_value_mb")
-        elif option == "12":
-            show_receive_info(wallet)
-        elif option == "13":
-            enhanced_download_resource_menu(wallet)
-        elif option == "14":
-            show_rig_download_info(wallet)
-        elif option == "15":
-            if wallet['wallet_id'] in [DONATION_WALLET_ID, WORLD_DEBT_WALLET_ID]:
-                print("🛑 Cannot access the World Debt Payment Plan menu from a system wallet.")
-            else:
-                show_world_debt_payment_menu(wallet)
-        elif option == "16":
-            break
-        elif option == "17":
-            print(f"🌐 Launching Internet Terminal for Node: {wallet['node_id']}")
-            run_internet_terminal(wallet)
-        else:
-            print("⚠️ Invalid option.")
-
-# -------------------------
-# Start / Menu
-# -------------------------
-def start_mining(mining_type):
-    wallet = select_wallet_for_mining()
-    if wallet:
-        if 'blocks_mined' not in wallet:
-            wallet['blocks_mined'] = Decimal("0")
-            wallet['last_block_time'] = time.time()
-            save_wallet(wallet)
-        print(f"Starting {mining_type.upper()} Mining for wallet {wallet['wallet_id']}...")
-        unified_mining_loop(wallet, mining_type)
-
-def view_wallets_rigs_menu():
-    wallet = select_wallet_or_rig()
-    if wallet:
-        wallet_transaction_menu(wallet)
-
-def main_menu():
-    _initialize_special_wallets()
-    world_debt_node_value_generation()
-
-    while True:
-        print("\n=== Manierism Megabytes Mining Menu (Manierism Electrism) ===")
-        print("1. Start UV Mining (Select Rig)")
-        print("2. Start Wi-Fi Mining (Select Rig)")
-        print("3. Start SHA Capsule Mining (Select Rig)")
-        print("4. Start Cache Mining (Select Rig)")
-        print("5. Play Blackjack (Bet Files)🃏")
-        print("6. Create New Rig / Wallet")
-        print("7. View Wallets & Rigs / Wallet Actions")
-        print("8. Exit")
-        choice = input("Enter option (1-8): ").strip()
-
-        world_debt_node_value_generation()
-
-        if choice == "1":
-            start_mining("UV")
-        elif choice == "2":
-            start_mining("wifi")
-        elif choice == "3":
-            start_mining("sha")
-        elif choice == "4":
-            start_mining("cache")
-        elif choice == "5":
-            rig_id = input("Enter Rig ID (Wallet Name) to use for betting: ").strip()
-            wallet_to_use = load_wallet(rig_id) or load_wallet(f"{rig_id}")
-            if not wallet_to_use:
-                print(f"⚠️ Wallet/Rig '{rig_id}' not found.")
-            else:
-                blackjack_game(wallet_to_use)
-        elif choice == "6":
-            rig_id = input("Enter Rig ID or Wallet Name: ").strip()
-            wallet_id = input("Enter Wallet ID: ").strip()
-            new_wallet = create_wallet(wallet_id, rig_id)
-            if new_wallet:
-                print(f"✅ Created new wallet/rig: {rig_id} ({wallet_id}) with Node ID: {new_wallet['node_id']}")
-        elif choice == "7":
-            view_wallets_rigs_menu()
-        elif choice == "8":
-            print("Exiting... 👋 See you later F&F ❤️")
-            break
-        else:
-            print("⚠️ Invalid selection.")
+# --- Runtime Launch ---
 
 if __name__ == "__main__":
-    main_menu()
\ No newline at end of file
+    # python sun_egp.py --supervise WALLET_ID[:UV|wifi|sha|cache] ...
+    rig.main()